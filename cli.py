@@ -7,7 +7,10 @@ import sys
 from typing import List
 
 from config.config_manager import ConfigManager
+from config.constants import TRANSLATION_CACHE_FILE
+from utils.file_utils import iter_yml_files
 from utils.logging_utils import setup_logging, ApplicationLogger, create_session_log_file
+from utils.translation_cache import TranslationCache
 from core.translation_workflow import TranslationWorkflow
 
 
@@ -17,13 +20,17 @@ class CLIApp:
     def __init__(self, config_file: str):
         self.config_manager = ConfigManager(config_file)
         log_file = create_session_log_file()
-        setup_logging(log_file=log_file)
-        self.logger = ApplicationLogger()
+        setup_logging()
+        self.logger = ApplicationLogger(
+            log_file=log_file,
+            level=self.config_manager.get_setting("log_level", "debug")
+        )
+        self.config_manager.flush_error_callback = lambda message: self.log_message(message, "error")
         # 禁用评审以避免交互
         self.config_manager.set_setting("auto_review_mode", False)
 
-    def log_message(self, message: str, level: str = "info") -> None:
-        self.logger.log_message(message, level)
+    def log_message(self, message: str, level: str = "info", *args) -> None:
+        self.logger.log_message(message, level, *args)
 
     # TranslationWorkflow 会在评审模式下调用以下方法
     def review_translation(self, key_name: str, original_text: str, ai_translation: str, completion_callback) -> None:
@@ -40,17 +47,29 @@ def discover_yml_files(path: str) -> List[str]:
     if os.path.isfile(path):
         return [path]
 
-    files = []
-    for root, _, filenames in os.walk(path):
-        for name in filenames:
-            if name.lower().endswith(".yml"):
-                files.append(os.path.join(root, name))
-    return files
+    return [file_path for file_path in iter_yml_files(path) if file_path.lower().endswith(".yml")]
+
+
+def clear_translation_cache(config_file: str) -> None:
+    """Clear the translation cache stored next to the config file."""
+    cache = TranslationCache(os.path.join(os.path.dirname(config_file), TRANSLATION_CACHE_FILE))
+    try:
+        cache.clear()
+    finally:
+        cache.close()
 
 
 def run_cli(args: argparse.Namespace) -> int:
+    if args.clear_cache:
+        clear_translation_cache(args.config)
     app = CLIApp(args.config)
+    try:
+        return _run_translation(app, args)
+    finally:
+        app.logger.close()
+
 
+def _run_translation(app: CLIApp, args: argparse.Namespace) -> int:
     source_lang = args.source or app.config_manager.get_setting("source_language")
     target_lang = args.target or app.config_manager.get_setting("target_language")
     style = args.style or app.config_manager.get_setting("game_mod_style")
@@ -86,6 +105,7 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--style", help="Game or mod style prompt")
     parser.add_argument("--model", help="Model name")
     parser.add_argument("--config", default="translator_config.json", help="Config file path")
+    parser.add_argument("--clear-cache", action="store_true", help="Clear the translation cache before translating")
     return parser.parse_args()
 
 
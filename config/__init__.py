@@ -10,4 +10,4 @@
 from .config_manager import ConfigManager
 from .constants import *
 
-__all__ = ['ConfigManager', 'DEFAULT_API_KEY_PLACEHOLDER', 'GEMINI_API_LOCK', 'MODEL_TPM', 'MODEL_RPM']
+__all__ = ['ConfigManager', 'DEFAULT_API_KEY_PLACEHOLDER', 'GEMINI_API_LOCK', 'MODEL_TPM', 'MODEL_RPM', 'tpm_for', 'rpm_for']
@@ -4,10 +4,51 @@
 负责应用程序配置的读取、保存和管理
 """
 
+import atexit
 import json
 import os
-from typing import Any, Dict, List, Optional
-from .constants import DEFAULT_API_KEY_PLACEHOLDER, DEFAULT_PLACEHOLDER_PATTERNS
+import threading
+import time
+import weakref
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from .constants import (
+    BATCH_MAX_ENTRIES, CONFIG_FLUSH_INTERVAL, DEFAULT_API_DELAY, DEFAULT_API_KEY_PLACEHOLDER,
+    DEFAULT_PLACEHOLDER_PATTERNS, LEGACY_PLACEHOLDER_PATTERNS
+)
+
+# 尝试导入orjson以加速配置写入
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+
+def _dump_config_bytes(config: Dict[str, Any]) -> bytes:
+    """
+    将配置序列化为UTF-8编码的JSON
+
+    Args:
+        config: 配置字典
+
+    Returns:
+        JSON字节串
+    """
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(config, option=orjson.OPT_INDENT_2)
+        except TypeError:
+            # orjson不支持的类型（如非字符串键）回退到标准库
+            pass
+    return json.dumps(config, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def _flush_at_exit(manager_ref: "weakref.ref") -> None:
+    """程序退出时写出尚未保存的配置"""
+    manager = manager_ref()
+    if manager is not None:
+        manager.flush()
 
 
 class ConfigManager:
@@ -30,16 +71,38 @@ class ConfigManager:
             "api_keys": [DEFAULT_API_KEY_PLACEHOLDER],
             "api_call_delay": 3.0,
             "max_concurrent_tasks": 3,
+            "batch_max_entries": BATCH_MAX_ENTRIES,
             "auto_review_mode": True,
             "delayed_review": True,
             "auto_apply_when_placeholders_match": True,
             "key_rotation_strategy": "round_robin",
             "placeholder_patterns": DEFAULT_PLACEHOLDER_PATTERNS,
-            "use_translation_memory": True
+            "use_translation_memory": True,
+            "model_rpm": {},  # 按模型覆盖内置的RPM限额，如 {"models/gemini-2.0-flash": 15}
+            "model_tpm": {},  # 按模型覆盖内置的TPM限额
+            "log_level": "debug"
 
         }
+        # API密钥缓存及其版本号，密钥变更时失效
+        self._api_keys_cache: Optional[Tuple[str, ...]] = None
+        self._api_key_index: Optional[Dict[str, int]] = None  # 配置中密钥到列表位置的映射
+        self._api_call_delay: Optional[float] = None  # 已解析的API调用延迟
+        self._keys_version = 0
+        self._settings_version = 0  # 任一配置项变更时递增，供热路径判断缓存的设置是否过期
+
+        # 延迟写盘状态：set_setting只标记脏数据，由定时器合并写入
+        self._save_lock = threading.RLock()
+        self._dirty = False
+        self._last_save = 0.0
+        self._flush_timer: Optional[threading.Timer] = None
+        self.last_save_error: Optional[str] = None  # 最近一次写盘失败的错误信息
+        # 定时器线程中写盘失败时调用，参数为错误信息；为None时只打印
+        self.flush_error_callback: Optional[Callable[[str], None]] = None
+        atexit.register(_flush_at_exit, weakref.ref(self))
+
         self.config = self.load_config()
         self._migrate_legacy_api_key()
+        self._migrate_legacy_placeholder_patterns()
 
     def load_config(self) -> Dict[str, Any]:
         """
@@ -73,18 +136,61 @@ class ConfigManager:
         Returns:
             是否保存成功
         """
-        try:
-            # 确保目录存在（只有当路径包含目录时才创建）
-            config_dir = os.path.dirname(self.config_file_path)
-            if config_dir:  # 如果有目录部分
-                os.makedirs(config_dir, exist_ok=True)
+        with self._save_lock:
+            try:
+                # 确保目录存在（只有当路径包含目录时才创建）
+                config_dir = os.path.dirname(self.config_file_path)
+                if config_dir:  # 如果有目录部分
+                    os.makedirs(config_dir, exist_ok=True)
 
-            with open(self.config_file_path, 'w', encoding='utf-8') as f:
-                json.dump(self.config, f, indent=4, ensure_ascii=False)
-            return True
-        except Exception as e:
-            print(f"保存配置时发生错误: {e}")
-            return False
+                # 先写临时文件再替换，避免写入中断时留下不完整的配置文件
+                temp_path = f"{self.config_file_path}.tmp"
+                with open(temp_path, 'wb') as f:
+                    f.write(_dump_config_bytes(self.config))
+                os.replace(temp_path, self.config_file_path)
+                self._dirty = False
+                self._last_save = time.monotonic()
+                self.last_save_error = None
+                return True
+            except Exception as e:
+                self.last_save_error = f"保存配置时发生错误: {e}"
+                print(self.last_save_error)
+                return False
+
+    def flush(self) -> bool:
+        """
+        立即写出尚未保存的配置
+
+        Returns:
+            是否保存成功（没有待保存的更改时返回True）
+        """
+        with self._save_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if not self._dirty:
+                return True
+            return self.save_config()
+
+    def _schedule_flush(self) -> None:
+        """标记配置已修改，并安排在写盘间隔到达后合并保存（调用方需持有锁）"""
+        self._dirty = True
+        if self._flush_timer is None:
+            delay = max(0.0, CONFIG_FLUSH_INTERVAL - (time.monotonic() - self._last_save))
+            self._flush_timer = threading.Timer(delay, self._flush_from_timer)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def _flush_from_timer(self) -> None:
+        """定时器线程中写出配置，失败时通过flush_error_callback报告（更改保留，下次修改时重试）"""
+        if self.flush():
+            return
+        callback = self.flush_error_callback
+        if callback is not None:
+            try:
+                callback(self.last_save_error or "保存配置失败")
+            except Exception as e:
+                print(f"配置写盘失败回调执行失败: {e}")
 
     def get_setting(self, key: str, default_override: Optional[Any] = None) -> Any:
         """
@@ -103,33 +209,131 @@ class ConfigManager:
     
     def set_setting(self, key: str, value: Any) -> bool:
         """
-        设置配置项并立即保存
+        设置配置项
+
+        配置不会立即写盘，而是在CONFIG_FLUSH_INTERVAL内合并为一次保存；
+        需要立即持久化并确认结果时调用flush()。后台写盘失败时通过
+        flush_error_callback报告，错误信息保存在last_save_error中。
         
         Args:
             key: 配置键
             value: 配置值
             
         Returns:
-            是否设置成功
+            总是返回True，表示更改已被接受（不代表已写盘）
         """
-        self.config[key] = value
-        return self.save_config()
+        with self._save_lock:
+            self.config[key] = value
+            self._settings_version += 1
+            if key == "api_keys":
+                self._invalidate_api_keys()
+            elif key == "api_call_delay":
+                self._api_call_delay = None
+            self._schedule_flush()
+        return True
         
-    def get_api_keys(self) -> List[str]:
+    def update_settings(self, settings: Dict[str, Any]) -> bool:
+        """
+        批量设置配置项，只保存一次
+
+        Args:
+            settings: 配置键值对
+
+        Returns:
+            是否保存成功
+        """
+        with self._save_lock:
+            self.config.update(settings)
+            self._settings_version += 1
+            if "api_keys" in settings:
+                self._invalidate_api_keys()
+            if "api_call_delay" in settings:
+                self._api_call_delay = None
+            self._dirty = True
+            return self.flush()
+
+    @property
+    def keys_version(self) -> int:
+        """API密钥版本号，每次密钥变更时递增"""
+        return self._keys_version
+
+    @property
+    def settings_version(self) -> int:
+        """配置版本号，每次配置项变更时递增"""
+        return self._settings_version
+
+    def _invalidate_caches(self) -> None:
+        """整体替换配置后使所有派生缓存失效"""
+        self._invalidate_api_keys()
+        self._api_call_delay = None
+        self._settings_version += 1
+
+    def get_api_call_delay(self) -> float:
+        """
+        获取API调用延迟（秒）
+
+        解析结果会被缓存，直到该设置被修改；无法解析时返回默认值。
+
+        Returns:
+            API调用延迟
+        """
+        delay = self._api_call_delay
+        if delay is None:
+            try:
+                delay = float(self.get_setting("api_call_delay", DEFAULT_API_DELAY))
+            except (TypeError, ValueError):
+                delay = DEFAULT_API_DELAY
+            self._api_call_delay = delay
+        return delay
+
+    def _invalidate_api_keys(self) -> None:
+        """使API密钥缓存失效"""
+        self._api_keys_cache = None
+        self._api_key_index = None
+        self._keys_version += 1
+
+    def get_api_keys(self) -> Tuple[str, ...]:
         """
         获取所有有效的API密钥
+
+        结果会被缓存，直到密钥被修改。
         
         Returns:
-            有效API密钥列表
+            有效API密钥元组
         """
+        if self._api_keys_cache is not None:
+            return self._api_keys_cache
+
         keys = self.get_setting("api_keys", [DEFAULT_API_KEY_PLACEHOLDER])
         if not isinstance(keys, list):
             keys = [keys] if keys else []
         
         # 过滤掉空密钥和占位符密钥
-        valid_keys = [k for k in keys if k and k != DEFAULT_API_KEY_PLACEHOLDER]
-        return valid_keys
+        self._api_keys_cache = tuple(k for k in keys if k and k != DEFAULT_API_KEY_PLACEHOLDER)
+        return self._api_keys_cache
     
+    def _get_api_key_list(self) -> Tuple[List[str], Dict[str, int]]:
+        """
+        获取配置中的密钥列表及其位置索引
+
+        列表保持密钥顺序，索引用于O(1)的成员判断和定位；
+        索引会被缓存，直到密钥被修改。
+
+        Returns:
+            (密钥列表, 密钥到位置的映射) 的元组
+        """
+        keys = self.get_setting("api_keys", [])
+        if not isinstance(keys, list):
+            keys = [keys] if keys else []
+            self._api_key_index = None
+
+        if self._api_key_index is None:
+            index: Dict[str, int] = {}
+            for i, key in enumerate(keys):
+                index.setdefault(key, i)
+            self._api_key_index = index
+        return keys, self._api_key_index
+
     def add_api_key(self, new_key: str) -> bool:
         """
         添加新的API密钥
@@ -143,12 +347,10 @@ class ConfigManager:
         if not new_key or new_key == DEFAULT_API_KEY_PLACEHOLDER:
             return False
             
-        keys = self.get_setting("api_keys", [])
-        if not isinstance(keys, list):
-            keys = [keys] if keys else []
+        keys, index = self._get_api_key_list()
             
         # 避免重复添加
-        if new_key not in keys:
+        if new_key not in index:
             keys.append(new_key)
             return self.set_setting("api_keys", keys)
         return False
@@ -163,12 +365,10 @@ class ConfigManager:
         Returns:
             是否移除成功
         """
-        keys = self.get_setting("api_keys", [])
-        if not isinstance(keys, list):
-            keys = [keys] if keys else []
+        keys, index = self._get_api_key_list()
             
-        if key_to_remove in keys:
-            keys.remove(key_to_remove)
+        if key_to_remove in index:
+            del keys[index[key_to_remove]]
             # 如果移除后列表为空，添加一个占位符
             if not keys:
                 keys = [DEFAULT_API_KEY_PLACEHOLDER]
@@ -189,13 +389,10 @@ class ConfigManager:
         if not new_key or new_key == DEFAULT_API_KEY_PLACEHOLDER:
             return False
             
-        keys = self.get_setting("api_keys", [])
-        if not isinstance(keys, list):
-            keys = [keys] if keys else []
+        keys, index = self._get_api_key_list()
             
-        if old_key in keys:
-            index = keys.index(old_key)
-            keys[index] = new_key
+        if old_key in index:
+            keys[index[old_key]] = new_key
             return self.set_setting("api_keys", keys)
         return False
 
@@ -226,6 +423,17 @@ class ConfigManager:
             self.config["api_keys"] = [self.config["api_keys"]]
             self.save_config()
 
+    def _migrate_legacy_placeholder_patterns(self) -> None:
+        """将旧版默认的惰性匹配占位符模式替换为等价的否定字符类写法"""
+        patterns = self.config.get("placeholder_patterns")
+        if not isinstance(patterns, list):
+            return
+
+        migrated = [LEGACY_PLACEHOLDER_PATTERNS.get(p, p) for p in patterns]
+        if migrated != patterns:
+            self.config["placeholder_patterns"] = migrated
+            self.save_config()
+
     def validate_config(self) -> List[str]:
         """
         验证配置的有效性
@@ -260,6 +468,7 @@ class ConfigManager:
             是否重置成功
         """
         self.config = self.defaults.copy()
+        self._invalidate_caches()
         return self.save_config()
 
     def export_config(self, export_path: str) -> bool:
@@ -273,8 +482,8 @@ class ConfigManager:
             是否导出成功
         """
         try:
-            with open(export_path, 'w', encoding='utf-8') as f:
-                json.dump(self.config, f, indent=4, ensure_ascii=False)
+            with open(export_path, 'wb') as f:
+                f.write(_dump_config_bytes(self.config))
             return True
         except Exception as e:
             print(f"导出配置时发生错误: {e}")
@@ -297,10 +506,12 @@ class ConfigManager:
             # 验证导入的配置
             temp_config = self.config
             self.config = imported_config
+            self._invalidate_caches()
             errors = self.validate_config()
             
             if errors:
                 self.config = temp_config
+                self._invalidate_caches()
                 print(f"导入的配置无效: {'; '.join(errors)}")
                 return False
             
@@ -5,32 +5,108 @@
 """
 
 import threading
+from functools import lru_cache
+from typing import Dict, Optional
 
 # 全局API锁
 GEMINI_API_LOCK = threading.RLock()
 
 # 每分钟令牌数(TPM)定义
 MODEL_TPM = {
+    "models/gemini-1.5-flash-latest": 1000000,
+    "models/gemini-1.5-pro-latest": 32000,
     "models/gemini-2.0-flash-lite": 1000000,
     "models/gemini-2.0-flash": 1000000,
 }
 
 # 每分钟请求数(RPM)定义
 MODEL_RPM = {
+    "models/gemini-1.5-flash-latest": 15,
+    "models/gemini-1.5-pro-latest": 2,
     "models/gemini-2.0-flash-lite": 30,
     "models/gemini-2.0-flash": 15,
 }
 
+# 未列出的模型（如新发布或改名的模型）按已知模型中最严格的限额节流，
+# 可通过配置项model_rpm/model_tpm放宽
+DEFAULT_MODEL_TPM = min(MODEL_TPM.values())
+DEFAULT_MODEL_RPM = min(MODEL_RPM.values())
+
+
+@lru_cache(maxsize=None)
+def _normalize_model_name(model_name: str) -> str:
+    """将模型名称统一为小写且带models/前缀的形式"""
+    name = model_name.strip().lower()
+    return name if name.startswith("models/") else f"models/{name}"
+
+
+def _limit_for(
+    model_name: str, limits: Dict[str, int], overrides: Optional[Dict[str, int]], default: int
+) -> int:
+    """按规范化后的模型名称查找限额，配置中的值优先于内置表，都未列出时使用默认值"""
+    name = _normalize_model_name(model_name)
+    for override_name, value in (overrides or {}).items():
+        if _normalize_model_name(override_name) == name:
+            return int(value)
+    return limits.get(name, default)
+
+
+def tpm_for(model_name: str, overrides: Optional[Dict[str, int]] = None) -> int:
+    """
+    获取模型的每分钟令牌数限额
+
+    Args:
+        model_name: 模型名称，可带或不带models/前缀，不区分大小写
+        overrides: 配置中的模型TPM限额，优先于MODEL_TPM
+
+    Returns:
+        TPM限额，未列出的模型返回DEFAULT_MODEL_TPM
+    """
+    return _limit_for(model_name, MODEL_TPM, overrides, DEFAULT_MODEL_TPM)
+
+
+def rpm_for(model_name: str, overrides: Optional[Dict[str, int]] = None) -> int:
+    """
+    获取模型的每分钟请求数限额
+
+    Args:
+        model_name: 模型名称，可带或不带models/前缀，不区分大小写
+        overrides: 配置中的模型RPM限额，优先于MODEL_RPM
+
+    Returns:
+        RPM限额，未列出的模型返回DEFAULT_MODEL_RPM
+    """
+    return _limit_for(model_name, MODEL_RPM, overrides, DEFAULT_MODEL_RPM)
+
+
 # 配置文件相关常量
 CONFIG_FILE = "translator_config.json"
+TRANSLATION_CACHE_FILE = "tm.sqlite"  # 翻译缓存数据库文件名（与配置文件位于同一目录）
+CONFIG_FLUSH_INTERVAL = 0.5  # 配置文件两次写盘之间的最小间隔（秒）
+CONFIG_WRITE_DEBOUNCE_MS = 300  # 设置项变更后延迟写盘的时间（毫秒）
+LOG_FLUSH_INTERVAL_MS = 100  # 日志区域批量刷新的间隔（毫秒）
+PROGRESS_FLUSH_INTERVAL_MS = 50  # 翻译期间进度条的刷新间隔（毫秒）
+LOG_BUFFER_SIZE = 4096  # 两次刷新之间最多缓冲的日志行数，超出时丢弃最旧的行
+LOG_MAX_LINES = 5000  # 日志区域最多保留的行数，超出时删除最旧的行
+PLACEHOLDER_TEXT_CACHE_SIZE = 1024  # 评审对话框缓存的占位符列表文本数
+MODEL_CACHE_FILE = "models_cache.json"  # 模型列表磁盘缓存
+MODEL_CACHE_TTL = 24 * 3600  # 磁盘缓存的有效期（秒），过期后先沿用旧列表并在后台刷新
+GEMINI_API_ENDPOINT = "generativelanguage.googleapis.com"
 DEFAULT_API_KEY_PLACEHOLDER = "YOUR_GEMINI_API_KEY"
+# 使用否定字符类代替惰性匹配，匹配结果相同但每一步无需回溯尝试结束符
 DEFAULT_PLACEHOLDER_PATTERNS = [
-    r'(\$.*?\$)',
-    r'(\[.*?\])',
+    r'(\$[^$\n]*\$)',
+    r'(\[[^\]\n]*\])',
     r'(@\w+!)',
     r'(#\w+(?:;\w+)*.*?#!|\S*#!)'
 ]
 
+# 旧版默认占位符模式到当前写法的映射，加载配置时自动替换
+LEGACY_PLACEHOLDER_PATTERNS = {
+    r'(\$.*?\$)': r'(\$[^$\n]*\$)',
+    r'(\[.*?\])': r'(\[[^\]\n]*\])',
+}
+
 # 支持的语言列表
 SUPPORTED_LANGUAGES = {
     "english": "英语",
@@ -71,6 +147,7 @@ LOG_LEVELS = {
 DEFAULT_WINDOW_SIZE = "1200x800"
 MIN_WINDOW_SIZE = (800, 600)
 PROGRESS_UPDATE_INTERVAL = 100  # 毫秒
+MAX_REVIEW_RESULTS = 10000  # 内存中保留的评审结果上限
 
 # 翻译相关常量
 MAX_RETRIES = 3
@@ -79,7 +156,44 @@ DEFAULT_API_DELAY = 3.0
 MAX_API_DELAY = 10.0
 DEFAULT_CONCURRENT_TASKS = 3
 MAX_CONCURRENT_TASKS = 10
+BATCH_MAX_ENTRIES = 20  # 单次请求合并翻译的最大条目数，设为1时禁用合并
+BATCH_MAX_ENTRY_CHARS = 200  # 参与合并翻译的条目最大长度（字符）
+BATCH_TOKEN_BUDGET = 2000  # 单次合并请求的输入token预算
+BATCH_CHARS_PER_TOKEN = 3  # 估算token数时每个token对应的字符数
+BATCH_ENTRY_MISSING = "batch_entry_missing"  # 合并翻译响应中缺失的条目，由调用方单独重新入队
+TRANSLATION_EXTRACTION_FAILED = "translation_extraction_failed"  # 响应中没有$$...$$包裹的译文，结果为原文
+AIMD_LATENCY_TARGET = 20.0  # 平均请求延迟不超过该值（秒）时才增大并发
+AIMD_LATENCY_WINDOW = 20  # 计算平均延迟的最近请求数
+TASK_BUFFER_MIN = 32  # 已提交但尚未产出结果的任务数下限
+TASK_BUFFER_PER_WORKER = 8  # 每个工作线程可缓冲的任务数
+TASK_BUFFER_PRESSURE_RATIO = 0.8  # 缓冲区占用达到该比例时视为生产者受压
+TASK_SUBMIT_BATCH_SIZE = 256  # 工作流程批量提交翻译任务的条数
+DEDUP_CACHE_SIZE = 50000  # 内存中保留的最近译文数，用于重复原文去重
+WORKER_SCALE_INTERVAL = 30.0  # 按延迟和队列深度增减工作线程的检查间隔（秒）
+WORKER_POOL_MAX = 32  # 自动扩容后的工作线程数上限
+WORKER_POOL_PER_KEY = 4  # 每个API密钥最多对应的工作线程数
+WORKER_LATENCY_SAMPLES = 200  # 计算p95延迟保留的最近请求数
+TASK_MAX_RETRIES = 5  # 任务处理出现异常时最多重新入队的次数，超过后作为失败结果返回
+TASK_RETRY_MAX_DELAY = 60.0  # 任务重试的指数退避时间上限（秒）
+TASK_RETRY_POLL_INTERVAL = 1.0  # 队首任务未到重试时间时工作线程的最长等待时间（秒）
+NO_KEY_RETRY_DELAY = 5.0  # 没有可用API密钥时任务推迟的时间（秒）
+
+# 错误分类
+FATAL_KEY_ERRORS = frozenset({"API_KEY_INVALID", "API_KEY_MISSING", "Malformed"})  # 密钥无效，不重试
+RATE_LIMIT_ERRORS = frozenset({"Rate limit exceeded", "429", "quota exceeded"})  # 速率限制，稍后可重试
+NON_RETRYABLE_ERRORS = FATAL_KEY_ERRORS | {"CONFIG_FAILURE"}
+
+# HTTP传输相关常量
+GEMINI_TRANSPORT = "rest"  # 使用基于requests的REST传输以便共享连接池
+HTTP_POOL_SIZE = 50
+GEMINI_REQUEST_TIMEOUT = 120.0  # 单次生成请求的超时时间（秒）
+HTTP_RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
 
 # 文件处理常量
 SUPPORTED_FILE_EXTENSIONS = ['.yml', '.yaml']
 ENCODING = 'utf-8-sig'
+SCAN_SKIP_DIRS = frozenset({'.git', '.svn', '.hg', '__pycache__', 'node_modules'})
+SCAN_BATCH_SIZE = 256  # 后台扫描每批回传给UI的文件数
+SCAN_MAX_WORKERS = 16  # 并行解析文件头的线程数
+YML_LOAD_MAX_WORKERS = 8  # 并行加载YML文件内容的线程数
+PREVIEW_PAGE_SIZE = 200  # 预览窗口每次加载的行数
@@ -86,8 +86,8 @@ def sample_config():
         "max_concurrent_tasks": 3,
         "api_call_delay": 1.0,
         "placeholder_patterns": [
-            "(\\$.*?\\$)",
-            "(\\[.*?\\])",
+            "(\\$[^$\\n]*\\$)",
+            "(\\[[^\\]\\n]*\\])",
             "(@\\w+!)",
             "(#\\w+(?:;\\w+)*.*?#!|\\S*#!)"
         ],
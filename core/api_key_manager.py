@@ -6,8 +6,14 @@ API密钥管理器
 
 import time
 import threading
-from typing import Dict, List, Set, Optional, Any
+from collections import deque
+from typing import Dict, List, Set, Optional, Any, Tuple
 from config.config_manager import ConfigManager
+from config.constants import FATAL_KEY_ERRORS, RATE_LIMIT_ERRORS, rpm_for, tpm_for
+from utils.rate_limit import SlidingWindowQuota, TokenBucket
+
+TOKEN_HISTORY_SIZE = 10  # 每个密钥保留的最近token使用记录数
+_KEY_DISABLING_ERRORS = FATAL_KEY_ERRORS | RATE_LIMIT_ERRORS
 
 
 class APIKeyManager:
@@ -21,18 +27,26 @@ class APIKeyManager:
             config_manager: 配置管理器实例
         """
         self.config_manager = config_manager
-        self.keys: List[str] = []  # 有效的API密钥列表
+        self.keys: List[str] = []  # 有效的API密钥列表（保持顺序，用于轮询）
+        self.key_set: Set[str] = set()  # 有效的API密钥集合（用于成员判断）
         self.key_stats: Dict[str, Dict[str, Any]] = {}  # 每个密钥的使用统计
         self.current_index = 0  # 当前使用的密钥索引
         self.failed_keys: Set[str] = set()  # 失败的密钥集合
+        self.cool_down_until: Dict[str, float] = {}  # 密钥冷却结束时间（time.monotonic）
         self.key_locks: Dict[str, threading.RLock] = {}  # 每个密钥的锁
+        # 每个(密钥, 模型)对应的60秒滑动窗口RPM/TPM配额
+        self.quota_windows: Dict[Tuple[str, str], SlidingWindowQuota] = {}
+        # 每个密钥两次请求之间的最小间隔（API调用延迟），密钥之间互不影响
+        self.request_delay: Optional[float] = None  # 为None时使用配置值
+        self.key_spacing: Dict[str, TokenBucket] = {}
         self.global_lock = threading.RLock()  # 全局锁
         self.reload_keys()
     
     def reload_keys(self) -> None:
         """从配置中重新加载API密钥"""
         with self.global_lock:
-            self.keys = self.config_manager.get_api_keys()
+            self.keys = list(self.config_manager.get_api_keys())
+            self.key_set = set(self.keys)
             
             # 初始化新密钥的统计信息和锁
             for key in self.keys:
@@ -42,19 +56,26 @@ class APIKeyManager:
                         "success_count": 0,  # 成功次数
                         "failure_count": 0,  # 失败次数
                         "last_used": 0,  # 上次使用时间
-                        "token_usage": [],  # 最近的token使用量
+                        "token_usage": deque(maxlen=TOKEN_HISTORY_SIZE),  # 最近的token使用量
+                        "token_sum": 0,  # token_usage中的token总和
                         "avg_tokens": 0,  # 平均token使用量
                     }
                 if key not in self.key_locks:
                     self.key_locks[key] = threading.RLock()
             
             # 清理不再存在的密钥的统计信息和锁
-            keys_to_remove = [k for k in self.key_stats if k not in self.keys]
+            keys_to_remove = [k for k in self.key_stats if k not in self.key_set]
             for k in keys_to_remove:
                 if k in self.key_stats:
                     del self.key_stats[k]
                 if k in self.key_locks:
                     del self.key_locks[k]
+            for window_key in [wk for wk in self.quota_windows if wk[0] not in self.key_set]:
+                del self.quota_windows[window_key]
+            for k in [k for k in self.cool_down_until if k not in self.key_set]:
+                del self.cool_down_until[k]
+            for k in [k for k in self.key_spacing if k not in self.key_set]:
+                del self.key_spacing[k]
             
             # 重置失败密钥集合，给所有密钥一个新的机会
             self.failed_keys = set()
@@ -80,8 +101,13 @@ class APIKeyManager:
             if len(self.failed_keys) >= len(self.keys):
                 self.failed_keys = set()
             
-            # 过滤掉已知失败的密钥
+            # 过滤掉已知失败的密钥和冷却中的密钥
             available_keys = [k for k in self.keys if k not in self.failed_keys]
+            if self.cool_down_until:
+                now = time.monotonic()
+                for k in [k for k, until in self.cool_down_until.items() if until <= now]:
+                    del self.cool_down_until[k]
+                available_keys = [k for k in available_keys if k not in self.cool_down_until]
             if not available_keys:
                 return None
                 
@@ -114,6 +140,120 @@ class APIKeyManager:
             
             return key
     
+    def cool_down(self, key: str, seconds: float) -> None:
+        """
+        让密钥在指定时间内不被get_next_key选中
+
+        Args:
+            key: API密钥
+            seconds: 冷却秒数
+        """
+        if key not in self.key_set or seconds <= 0:
+            return
+        with self.global_lock:
+            until = time.monotonic() + seconds
+            self.cool_down_until[key] = max(self.cool_down_until.get(key, 0.0), until)
+
+    def set_request_delay(self, delay: Optional[float]) -> None:
+        """
+        设置每个密钥两次请求之间的最小间隔
+
+        Args:
+            delay: 间隔秒数，为None时使用配置的API调用延迟
+        """
+        with self.global_lock:
+            self.request_delay = delay
+            self.key_spacing.clear()
+
+    def _get_key_spacing(self, key: str) -> Optional[TokenBucket]:
+        """
+        获取(或创建)密钥的请求间隔令牌桶
+
+        Args:
+            key: API密钥
+
+        Returns:
+            按API调用延迟补充令牌、容量为1的令牌桶；延迟不大于0时返回None
+        """
+        spacing = self.key_spacing.get(key)
+        if spacing is None:
+            with self.global_lock:
+                delay = self.request_delay
+                if delay is None:
+                    delay = self.config_manager.get_api_call_delay()
+                if delay <= 0:
+                    return None
+                spacing = self.key_spacing.get(key)
+                if spacing is None:
+                    spacing = TokenBucket.from_delay(delay)
+                    self.key_spacing[key] = spacing
+        return spacing
+
+    def _get_quota_window(self, key: str, model_name: str) -> SlidingWindowQuota:
+        """
+        获取(或创建)密钥在指定模型下的滑动窗口配额
+
+        限额取配置项model_rpm/model_tpm，其次为内置表；都未列出的模型
+        按最严格的默认限额节流。
+
+        Args:
+            key: API密钥
+            model_name: 模型名称
+
+        Returns:
+            滑动窗口配额
+        """
+        window_key = (key, model_name)
+        if window_key not in self.quota_windows:
+            with self.global_lock:
+                if window_key not in self.quota_windows:
+                    rpm = rpm_for(model_name, self.config_manager.get_setting("model_rpm", {}))
+                    tpm = tpm_for(model_name, self.config_manager.get_setting("model_tpm", {}))
+                    self.quota_windows[window_key] = SlidingWindowQuota(rpm, tpm)
+        return self.quota_windows[window_key]
+
+    def wait_if_throttled(
+        self, key: str, model_name: str, stop_event: Optional[threading.Event] = None
+    ) -> Tuple[float, int]:
+        """
+        在调用API前按密钥的请求间隔和模型的RPM/TPM限额等待，并为密钥预留配额
+
+        请求间隔按密钥分别计算，密钥越多总吞吐量越高；RPM/TPM只在最近60秒内的
+        请求数或token数达到限额时休眠，直到最早一条记录移出窗口。
+        token预留量取该密钥最近请求的平均token数。
+
+        Args:
+            key: API密钥
+            model_name: 模型名称
+            stop_event: 停止事件，被设置时立即返回
+
+        Returns:
+            (实际等待的秒数, 预留的token数)
+        """
+        spacing = self._get_key_spacing(key)
+        spacing_wait = spacing.acquire(stop_event=stop_event) if spacing is not None else 0.0
+        if stop_event is not None and stop_event.is_set():
+            return spacing_wait, 0
+
+        quota = self._get_quota_window(key, model_name)
+        stats = self.key_stats.get(key)
+        est_tokens = int(stats["avg_tokens"]) if stats else 0
+        return spacing_wait + quota.acquire(est_tokens, stop_event), est_tokens
+
+    def record(self, key: str, model_name: str, reserved_tokens: int, actual_tokens: int) -> None:
+        """
+        响应返回后按实际token用量修正滑动窗口
+
+        Args:
+            key: API密钥
+            model_name: 模型名称
+            reserved_tokens: wait_if_throttled预留的token数
+            actual_tokens: 实际消耗的token数
+        """
+        quota = self.quota_windows.get((key, model_name))
+        if quota is not None:
+            quota.adjust(actual_tokens - reserved_tokens)
+
     def mark_key_success(self, key: str, token_count: Optional[int] = None) -> None:
         """
         标记密钥使用成功
@@ -128,15 +268,16 @@ class APIKeyManager:
                 
                 # 更新token使用统计
                 if token_count:
-                    # 保留最近10次的token使用量
-                    token_history = self.key_stats[key]["token_usage"]
+                    # 保留最近TOKEN_HISTORY_SIZE次的token使用量，并增量维护总和
+                    stats = self.key_stats[key]
+                    token_history = stats["token_usage"]
+                    if len(token_history) == token_history.maxlen:
+                        stats["token_sum"] -= token_history[0]
                     token_history.append(token_count)
-                    if len(token_history) > 10:
-                        token_history = token_history[-10:]
-                    self.key_stats[key]["token_usage"] = token_history
+                    stats["token_sum"] += token_count
                     
                     # 更新平均token使用量
-                    self.key_stats[key]["avg_tokens"] = sum(token_history) / len(token_history)
+                    stats["avg_tokens"] = stats["token_sum"] / len(token_history)
                 
                 # 如果密钥之前失败过，现在成功了，从失败集合中移除
                 with self.global_lock:
@@ -155,13 +296,9 @@ class APIKeyManager:
             with self.key_locks[key]:
                 self.key_stats[key]["failure_count"] += 1
                 
-                # 根据错误类型决定是否将密钥标记为失败
-                with self.global_lock:
-                    if error_type in ["API_KEY_INVALID", "API_KEY_MISSING", "Malformed"]:
-                        # 密钥无效，添加到失败集合
-                        self.failed_keys.add(key)
-                    elif error_type in ["Rate limit exceeded", "429", "quota exceeded"]:
-                        # 速率限制错误，暂时添加到失败集合，但可以在一段时间后重试
+                # 密钥无效或触发速率限制时添加到失败集合（速率限制的密钥可在之后重置）
+                if error_type in _KEY_DISABLING_ERRORS:
+                    with self.global_lock:
                         self.failed_keys.add(key)
     
     def get_key_stats(self) -> Dict[str, Dict[str, Any]]:
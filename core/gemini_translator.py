@@ -7,17 +7,169 @@ Gemini翻译器
 import re
 import time
 from collections import deque
-from typing import Optional, Tuple, List, Any
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
 
-from config.constants import GEMINI_API_LOCK, DEFAULT_API_KEY_PLACEHOLDER, MAX_RETRIES, BACKOFF_TIMES
+from config.constants import (
+    GEMINI_API_LOCK, DEFAULT_API_KEY_PLACEHOLDER, MAX_RETRIES, BACKOFF_TIMES, GEMINI_TRANSPORT,
+    GEMINI_REQUEST_TIMEOUT, FATAL_KEY_ERRORS, NON_RETRYABLE_ERRORS, RATE_LIMIT_ERRORS, BATCH_ENTRY_MISSING,
+    TRANSLATION_EXTRACTION_FAILED
+)
+from utils.genai_loader import GEMINI_AVAILABLE, load_genai
+from utils.http_session import attach_pooled_adapter
 
-# 尝试导入Gemini库
-try:
-    import google.generativeai as genai
-    GEMINI_AVAILABLE = True
-except ImportError:
-    GEMINI_AVAILABLE = False
-    genai = None
+# 每个API密钥对应一个固定的生成服务客户端；创建后即与全局配置无关，
+# 因此只有创建客户端时才需要持有GEMINI_API_LOCK
+_KEY_CLIENTS: Dict[str, Any] = {}
+
+# GenerativeModel没有公开的客户端参数，只能覆盖其私有属性_client；
+# 仅对已验证的google-generativeai版本（低于该版本）启用
+_CLIENT_OVERRIDE_MAX_VERSION = (1, 0)
+_SDK_VERSION_RE = re.compile(r"(\d+)\.(\d+)")
+
+# 最终译文被$$...$$包裹
+_FINAL_TRANSLATION_RE = re.compile(r"\$\$\s*(.*?)\s*\$\$", re.DOTALL)
+
+# 在异常信息中一次扫描识别错误类别
+_FATAL_KEY_RE = re.compile("|".join(map(re.escape, sorted(FATAL_KEY_ERRORS))))
+_RATE_LIMIT_RE = re.compile("|".join(map(re.escape, sorted(RATE_LIMIT_ERRORS))))
+
+# 限流错误中携带的重试等待时间，如 "Please retry in 27.5s"
+# 或 RetryInfo 的 "retry_delay { seconds: 27 }"
+_RETRY_DELAY_RE = re.compile(r"retry in ([\d.]+)\s*s|retry_delay\s*\{\s*seconds:\s*(\d+)", re.IGNORECASE)
+
+# 合并翻译响应中单个条目的格式: <<<N>>>$$译文$$<<</N>>>
+_BATCH_ENTRY_RE = re.compile(r'<<<(\d+)>>>\s*\$\$(.*?)\$\$\s*<<</\1>>>', re.DOTALL)
+
+
+def _bind_key_client(genai: Any, model: Any, client: Any) -> bool:
+    """
+    将GenerativeModel绑定到指定密钥的客户端
+
+    SDK版本不在已验证范围内或模型没有_client属性时不做修改。
+
+    Args:
+        genai: google.generativeai模块
+        model: 新创建的GenerativeModel实例
+        client: 该密钥专属的生成服务客户端
+
+    Returns:
+        是否绑定成功
+    """
+    match = _SDK_VERSION_RE.match(str(getattr(genai, "__version__", "")))
+    if match is None or (int(match.group(1)), int(match.group(2))) >= _CLIENT_OVERRIDE_MAX_VERSION:
+        return False
+    if not hasattr(model, "_client"):
+        return False
+    model._client = client
+    return True
+
+
+class _SerializedModel:
+    """无法按密钥绑定客户端时使用：每次请求都在全局锁内配置密钥并创建模型，请求串行发出"""
+
+    __slots__ = ("genai", "api_key", "model_name")
+
+    def __init__(self, genai: Any, api_key: str, model_name: str):
+        self.genai = genai
+        self.api_key = api_key
+        self.model_name = model_name
+
+    def generate_content(self, *args: Any, **kwargs: Any) -> Any:
+        with GEMINI_API_LOCK:
+            self.genai.configure(api_key=self.api_key, transport=GEMINI_TRANSPORT)
+            return self.genai.GenerativeModel(self.model_name).generate_content(*args, **kwargs)
+
+
+class ApiResult(NamedTuple):
+    """单次API调用的结果"""
+    text: Optional[str]  # 响应文本，失败时为None
+    tokens: Optional[int] = None  # token使用量，无法获取时为None
+    error: Optional[str] = None  # 错误类型，成功时为None
+    retry_after: Optional[float] = None  # 服务端要求的重试等待秒数，未提供时为None
+
+
+def _parse_retry_after(error: Exception) -> Optional[float]:
+    """
+    从限流异常中解析服务端要求的重试等待时间
+
+    优先读取HTTP响应的Retry-After头，其次从错误信息中的RetryInfo解析。
+
+    Args:
+        error: API调用异常
+
+    Returns:
+        等待秒数，无法解析时返回None
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if headers:
+        try:
+            return float(headers.get("retry-after"))
+        except (TypeError, ValueError):
+            pass
+
+    match = _RETRY_DELAY_RE.search(str(error))
+    if match:
+        return float(match.group(1) or match.group(2))
+    return None
+
+
+# 翻译提示词模板，{text}处为原文
+_CHINESE_PROMPT_TEMPLATE = """角色定位:
+你是一位专业的双语翻译专家，精通 {src} 与 {tgt} 互译。你特别擅长根据原文的风格进行翻译，并完整保留所有特殊占位符。
+{style_info}
+任务:
+请对以下提供的"原文"({src})文本执行三步翻译法，将其翻译为{tgt}。
+
+原文 ({src}):
+{text}
+
+翻译流程与输出格式要求:
+请严格按照以下步骤和格式提供完整的翻译结果。不要添加任何额外的说明、确认或对话性文字。
+
+第一步：直译 ({tgt})
+[此处输出对上述"原文"的完整、准确的{tgt}直译，严格保留所有格式和特殊占位符，如 [...]、$variable$、@icon!、#formatting#! 等。]
+
+第二步：直译中的问题与改进建议
+[此处输出针对第一步直译内容的具体问题分析和改进建议。]
+
+第三步：意译 ({tgt}) - 最终交付成果
+$$
+[此处输出基于直译和改进建议优化后的最终{tgt}意译。此部分必须严格使用$$符号包裹，并且是整个输出中唯一被$$包裹的部分。确保所有原文的特殊占位符在此意译版本中被精确无误地保留。]
+$$
+"""
+
+_GENERIC_PROMPT_TEMPLATE = """As a professional bilingual translation expert, proficient in {src} and {tgt}, your task is to translate the following text.
+Game/Mod Style: {style}
+You MUST preserve all placeholders like [...], $...$, @...! and #...! exactly as they appear in the original text.
+
+Original Text ({src}):
+{text}
+
+Provide ONLY the final translated text in {tgt}, wrapped strictly in double dollar signs ($$). Do not include any other explanatory text, conversational phrases, or the original text again.
+Example: $$Translated text here, with all original [placeholders] and $variables$ preserved.$$
+"""
+
+
+def uses_chinese_prompt(source_lang_name: str, target_lang_name: str) -> bool:
+    """
+    判断语言对是否使用中文三步翻译提示词（英语与简体中文互译）
+
+    Args:
+        source_lang_name: 源语言名称
+        target_lang_name: 目标语言名称
+
+    Returns:
+        是否使用中文提示词
+    """
+    return {source_lang_name.lower(), target_lang_name.lower()} == {"english", "simp_chinese"}
+
+
+def _rate_info(result: ApiResult) -> Optional[Dict[str, float]]:
+    """将API结果中的限流信息转换为返回给调用方的字典"""
+    if result.retry_after is None:
+        return None
+    return {"retry_after": result.retry_after}
 
 
 class GeminiTranslator:
@@ -34,6 +186,12 @@ class GeminiTranslator:
         self.app_ref = app_ref
         self.translator_id = translator_id
         self.current_api_key: Optional[str] = None
+        self.current_client: Any = None
+        # 按(API密钥, 模型名称)缓存已绑定客户端的GenerativeModel实例
+        self._model_cache: Dict[Tuple[str, str], Any] = {}
+        # 按(源语言, 目标语言, 风格)缓存的提示词前缀和后缀；
+        # 实例由多个工作线程共享，单次字典读写是原子的，无需加锁
+        self._prompt_parts: Dict[Tuple[str, str, str], Tuple[str, str]] = {}
         # 记录最近10次 token_count (滑动窗口)
         self.token_window = deque(maxlen=10)
         self.failed_translations: List[Tuple[str, str]] = []
@@ -64,13 +222,23 @@ class GeminiTranslator:
             return False
             
         try:
-            with GEMINI_API_LOCK:
-                genai.configure(api_key=api_key_to_use)
+            client = _KEY_CLIENTS.get(api_key_to_use)
+            if client is None:
+                genai, genai_client = load_genai()
+                with GEMINI_API_LOCK:
+                    client = _KEY_CLIENTS.get(api_key_to_use)
+                    if client is None:
+                        # genai.configure修改的是进程级配置，取出客户端后即固定到该密钥
+                        genai.configure(api_key=api_key_to_use, transport=GEMINI_TRANSPORT)
+                        client = genai_client.get_default_generative_client()
+                        attach_pooled_adapter(client)
+                        _KEY_CLIENTS[api_key_to_use] = client
+                self.app_ref.log_message(
+                    f"翻译器 {self.translator_id}: Gemini API配置成功，密钥: ...{api_key_to_use[-4:]}", 
+                    "info"
+                )
             self.current_api_key = api_key_to_use
-            self.app_ref.log_message(
-                f"翻译器 {self.translator_id}: Gemini API配置成功，密钥: ...{api_key_to_use[-4:]}", 
-                "info"
-            )
+            self.current_client = client
             return True
         except Exception as e:
             self.app_ref.log_message(
@@ -78,6 +246,7 @@ class GeminiTranslator:
                 "error"
             )
             self.current_api_key = None
+            self.current_client = None
             return False
 
     def _build_prompt(
@@ -89,6 +258,9 @@ class GeminiTranslator:
     ) -> str:
         """
         构建翻译提示词
+
+        模板中除原文外的部分按(源语言, 目标语言, 风格)缓存，
+        每次调用只需拼接原文。
         
         Args:
             text_to_translate: 要翻译的文本
@@ -99,51 +271,67 @@ class GeminiTranslator:
         Returns:
             构建好的提示词
         """
-        style_info = f"游戏/Mod风格提示: {game_mod_style}\n" if game_mod_style else ""
-        
-        use_chinese_specific_prompt = (
-            (target_lang_name.lower() == "simp_chinese" and source_lang_name.lower() == "english") or
-            (source_lang_name.lower() == "simp_chinese" and target_lang_name.lower() == "english")
-        )
-
-        if use_chinese_specific_prompt:
-            prompt = f"""角色定位:
-你是一位专业的双语翻译专家，精通 {source_lang_name} 与 {target_lang_name} 互译。你特别擅长根据原文的风格进行翻译，并完整保留所有特殊占位符。
-{style_info}
-任务:
-请对以下提供的"原文"({source_lang_name})文本执行三步翻译法，将其翻译为{target_lang_name}。
-
-原文 ({source_lang_name}):
-{text_to_translate}
-
-翻译流程与输出格式要求:
-请严格按照以下步骤和格式提供完整的翻译结果。不要添加任何额外的说明、确认或对话性文字。
+        parts_key = (source_lang_name, target_lang_name, game_mod_style)
+        parts = self._prompt_parts.get(parts_key)
+        if parts is None:
+            use_chinese_specific_prompt = uses_chinese_prompt(source_lang_name, target_lang_name)
+            template = _CHINESE_PROMPT_TEMPLATE if use_chinese_specific_prompt else _GENERIC_PROMPT_TEMPLATE
+            values = {
+                "src": source_lang_name,
+                "tgt": target_lang_name,
+                "style": game_mod_style if game_mod_style else "General",
+                "style_info": f"游戏/Mod风格提示: {game_mod_style}\n" if game_mod_style else "",
+            }
+            prefix_template, suffix_template = template.split("{text}")
+            parts = (prefix_template.format_map(values), suffix_template.format_map(values))
+            self._prompt_parts[parts_key] = parts
+
+        prefix, suffix = parts
+        return prefix + text_to_translate + suffix
+
+    def _get_model(self, api_key: str, model_name: str) -> Any:
+        """
+        获取绑定到指定密钥客户端的GenerativeModel实例
 
-第一步：直译 ({target_lang_name})
-[此处输出对上述"原文"的完整、准确的{target_lang_name}直译，严格保留所有格式和特殊占位符，如 [...]、$variable$、@icon!、#formatting#! 等。]
+        命中缓存时直接返回；未命中时配置客户端并在全局锁内创建模型。
+        SDK不支持按密钥绑定客户端时返回在全局锁内串行发出请求的替代模型。
 
-第二步：直译中的问题与改进建议
-[此处输出针对第一步直译内容的具体问题分析和改进建议。]
+        Args:
+            api_key: API密钥
+            model_name: 模型名称
 
-第三步：意译 ({target_lang_name}) - 最终交付成果
-$$
-[此处输出基于直译和改进建议优化后的最终{target_lang_name}意译。此部分必须严格使用$$符号包裹，并且是整个输出中唯一被$$包裹的部分。确保所有原文的特殊占位符在此意译版本中被精确无误地保留。]
-$$
-"""
-        else:
-            prompt = f"""As a professional bilingual translation expert, proficient in {source_lang_name} and {target_lang_name}, your task is to translate the following text.
-Game/Mod Style: {game_mod_style if game_mod_style else "General"}
-You MUST preserve all placeholders like [...], $...$, @...! and #...! exactly as they appear in the original text.
+        Returns:
+            GenerativeModel实例，配置失败时返回None
+        """
+        cache_key = (api_key, model_name)
+        model = self._model_cache.get(cache_key)
+        if model is not None:
+            self.current_api_key = api_key
+            return model
 
-Original Text ({source_lang_name}):
-{text_to_translate}
+        self.app_ref.log_message(
+            f"翻译器 {self.translator_id}: 未找到密钥 ...{api_key[-4:]} 的模型 {model_name}，创建中...",
+            "debug"
+        )
+        if not self._configure_gemini(api_key):
+            return None
 
-Provide ONLY the final translated text in {target_lang_name}, wrapped strictly in double dollar signs ($$). Do not include any other explanatory text, conversational phrases, or the original text again.
-Example: $$Translated text here, with all original [placeholders] and $variables$ preserved.$$
-"""
-        return prompt
+        genai, _ = load_genai()
+        with GEMINI_API_LOCK:
+            model = genai.GenerativeModel(model_name)
+            # 从按密钥的客户端表中取客户端，current_client可能已被其他线程改为另一个密钥
+            bound = _bind_key_client(genai, model, _KEY_CLIENTS[api_key])
+        if not bound:
+            self.app_ref.log_message(
+                f"翻译器 {self.translator_id}: google-generativeai {getattr(genai, '__version__', '?')} "
+                "不支持按密钥绑定客户端，请求将串行发出",
+                "warn"
+            )
+            model = _SerializedModel(genai, api_key, model_name)
+        self._model_cache[cache_key] = model
+        return model
 
-    def _call_actual_api(self, prompt_text: str, model_name: str, api_key_for_this_call: str) -> Tuple[Optional[str], Any]:
+    def _call_actual_api(self, prompt_text: str, model_name: str, api_key_for_this_call: str) -> ApiResult:
         """
         调用实际的Gemini API
         
@@ -153,7 +341,7 @@ Example: $$Translated text here, with all original [placeholders] and $variables
             api_key_for_this_call: 本次调用使用的API密钥
             
         Returns:
-            (响应文本, token数量或错误类型) 的元组
+            API调用结果
         """
         if not GEMINI_AVAILABLE:
             # 返回符合格式要求的模拟响应
@@ -162,73 +350,71 @@ Example: $$Translated text here, with all original [placeholders] and $variables
                 f"翻译器 {self.translator_id}: 使用模拟模式进行翻译（API库不可用）", 
                 "warn"
             )
-            return simulated_text, 0
+            return ApiResult(simulated_text, 0)
 
-        with GEMINI_API_LOCK:
-            if self.current_api_key is None or self.current_api_key != api_key_for_this_call:
+        model = self._get_model(api_key_for_this_call, model_name)
+        if model is None:
+            self.app_ref.log_message(
+                f"翻译器 {self.translator_id}: Gemini API配置失败", 
+                "error"
+            )
+            return ApiResult(None, error="CONFIG_FAILURE")
+
+        try:
+            self.app_ref.log_message(
+                "翻译器 %s: 调用Gemini API，模型: %s，密钥: ...%s", "debug",
+                self.translator_id, model_name, api_key_for_this_call[-4:]
+            )
+
+            # 模型绑定的是该密钥专属的客户端（串行替代模型自行加锁），请求期间无需持有全局锁；
+            # 请求经共享连接池的requests会话发出，等待响应时阻塞在socket读取上并释放GIL
+            response = model.generate_content(
+                prompt_text, request_options={'timeout': GEMINI_REQUEST_TIMEOUT}
+            )
+
+            if not response.parts:
+                if response.prompt_feedback and response.prompt_feedback.block_reason:
+                    block_reason_msg = f"内容被API阻止。原因: {response.prompt_feedback.block_reason}."
+                    if response.prompt_feedback.safety_ratings:
+                        block_reason_msg += f" 安全评级: {response.prompt_feedback.safety_ratings}"
+                    self.app_ref.log_message(block_reason_msg, "error")
+                    return ApiResult(None, error="API_CALL_FAILED_NO_TEXT")
+                self.app_ref.log_message("Gemini API返回空响应", "warn")
+                return ApiResult(None, error="API_CALL_FAILED_NO_TEXT")
+
+            # 获取token使用信息
+            token_count = None
+            usage_metadata = getattr(response, 'usage_metadata', None)
+
+            if usage_metadata:
+                token_count = getattr(usage_metadata, 'total_token_count', None)
+                prompt_tokens = getattr(usage_metadata, 'prompt_token_count', None)
+                candidates_tokens = getattr(usage_metadata, 'candidates_token_count', None)
                 self.app_ref.log_message(
-                    f"翻译器 {self.translator_id}: API密钥不匹配或未配置，重新配置中...", 
+                    f"Token使用详情 - 总计: {token_count}, 提示: {prompt_tokens}, 响应: {candidates_tokens}",
                     "debug"
                 )
-                if not self._configure_gemini(api_key_for_this_call):
-                    self.app_ref.log_message(
-                        f"翻译器 {self.translator_id}: Gemini API配置失败", 
-                        "error"
-                    )
-                    return None, "CONFIG_FAILURE"
-
-            try:
+            else:
+                token_count = getattr(response, 'token_count', None)
+                if token_count is None:
+                    self.app_ref.log_message("无法从API响应中获取token使用信息", "warn")
+
+            return ApiResult(response.text, token_count)
+
+        except Exception as e:
+            self.app_ref.log_message(f"翻译器 {self.translator_id}: Gemini API调用错误: {e}", "error")
+
+            error_str = str(e)
+            if _FATAL_KEY_RE.search(error_str):
                 self.app_ref.log_message(
-                    f"翻译器 {self.translator_id}: 调用Gemini API，模型: {model_name}，密钥: ...{api_key_for_this_call[-4:]}", 
-                    "info"
+                    f"翻译器 {self.translator_id}: API密钥可能无效或格式错误", 
+                    "error"
                 )
-                
-                model = genai.GenerativeModel(model_name)
-                response = model.generate_content(prompt_text, request_options={'timeout': 120})
-                
-                if not response.parts:
-                    if response.prompt_feedback and response.prompt_feedback.block_reason:
-                        block_reason_msg = f"内容被API阻止。原因: {response.prompt_feedback.block_reason}."
-                        if response.prompt_feedback.safety_ratings:
-                            block_reason_msg += f" 安全评级: {response.prompt_feedback.safety_ratings}"
-                        self.app_ref.log_message(block_reason_msg, "error")
-                        return None, "API_CALL_FAILED_NO_TEXT"
-                    self.app_ref.log_message("Gemini API返回空响应", "warn")
-                    return None, "API_CALL_FAILED_NO_TEXT"
-
-                # 获取token使用信息
-                token_count = None
-                usage_metadata = getattr(response, 'usage_metadata', None)
-                
-                if usage_metadata:
-                    token_count = getattr(usage_metadata, 'total_token_count', None)
-                    prompt_tokens = getattr(usage_metadata, 'prompt_token_count', None)
-                    candidates_tokens = getattr(usage_metadata, 'candidates_token_count', None)
-                    self.app_ref.log_message(
-                        f"Token使用详情 - 总计: {token_count}, 提示: {prompt_tokens}, 响应: {candidates_tokens}",
-                        "debug"
-                    )
-                else:
-                    token_count = getattr(response, 'token_count', None)
-                    if token_count is None:
-                        self.app_ref.log_message("无法从API响应中获取token使用信息", "warn")
-                
-                return response.text, token_count
-                
-            except Exception as e:
-                self.app_ref.log_message(f"翻译器 {self.translator_id}: Gemini API调用错误: {e}", "error")
-                
-                error_str = str(e)
-                if any(keyword in error_str for keyword in ["API_KEY_INVALID", "API_KEY_MISSING", "Malformed"]):
-                    self.app_ref.log_message(
-                        f"翻译器 {self.translator_id}: API密钥可能无效或格式错误", 
-                        "error"
-                    )
-                    return None, "API_KEY_INVALID"
-                elif any(keyword in error_str for keyword in ["Rate limit exceeded", "429", "quota exceeded"]):
-                    return None, "Rate limit exceeded"
-                
-                return None, error_str
+                return ApiResult(None, error="API_KEY_INVALID")
+            elif _RATE_LIMIT_RE.search(error_str):
+                return ApiResult(None, error="Rate limit exceeded", retry_after=_parse_retry_after(e))
+
+            return ApiResult(None, error=error_str)
 
     def extract_final_translation(self, api_response_text: str) -> Optional[str]:
         """
@@ -243,8 +429,9 @@ Example: $$Translated text here, with all original [placeholders] and $variables
         if api_response_text is None:
             return None
             
-        # 使用正则表达式提取$$...$$之间的内容
-        match = re.search(r"\$\$\s*(.*?)\s*\$\$", api_response_text, re.DOTALL)
+        # 先做字面量查找，不含$$的响应无需进入正则引擎
+        start = api_response_text.find("$$")
+        match = _FINAL_TRANSLATION_RE.search(api_response_text, start) if start != -1 else None
         if match:
             return match.group(1).strip()
         
@@ -253,16 +440,14 @@ Example: $$Translated text here, with all original [placeholders] and $variables
             f"翻译器 {self.translator_id}: 无法从响应中提取最终翻译 (使用 $$...$$)", 
             "warn"
         )
+        # 整段响应作为一条日志记录，未启用调试级别时不会格式化
         self.app_ref.log_message(
-            f"翻译器 {self.translator_id}: 完整的API响应文本如下:", 
-            "debug"
+            "翻译器 %s: 完整的API响应文本如下:\n"
+            "-------------------- API Response Start --------------------\n"
+            "%s\n"
+            "-------------------- API Response End ----------------------",
+            "debug", self.translator_id, api_response_text
         )
-        self.app_ref.log_message("-------------------- API Response Start --------------------", "debug")
-        
-        # 分块记录响应内容，避免单条日志过长
-        for i in range(0, len(api_response_text), 500):
-            self.app_ref.log_message(api_response_text[i:i+500], "debug")
-        self.app_ref.log_message("-------------------- API Response End ----------------------", "debug")
         
         return None
 
@@ -274,7 +459,7 @@ Example: $$Translated text here, with all original [placeholders] and $variables
         game_mod_style: str,
         model_name: str,
         api_key_to_use: str
-    ) -> Tuple[str, int, Optional[str]]:
+    ) -> Tuple[str, int, Optional[str], Optional[Dict[str, float]]]:
         """
         翻译文本
 
@@ -287,14 +472,16 @@ Example: $$Translated text here, with all original [placeholders] and $variables
             api_key_to_use: 使用的API密钥
 
         Returns:
-            (翻译结果, token数量, 错误类型) 的元组
+            (翻译结果, token数量, 错误类型, 限流信息) 的元组；
+            服务端要求稍后重试时限流信息为 {'retry_after': 秒数}，否则为None；
+            无法从响应中提取译文时返回原文，错误类型为TRANSLATION_EXTRACTION_FAILED
         """
         if not text_to_translate.strip():
             self.app_ref.log_message(
                 f"翻译器 {self.translator_id}: 输入文本为空，直接返回空翻译",
                 "info"
             )
-            return "", 0, None
+            return "", 0, None, None
 
         prompt = self._build_prompt(text_to_translate, source_lang_name, target_lang_name, game_mod_style)
         self.app_ref.log_message(
@@ -302,45 +489,78 @@ Example: $$Translated text here, with all original [placeholders] and $variables
             "debug"
         )
 
-        # 添加重试机制
+        result = self._call_with_retries(prompt, model_name, api_key_to_use)
+
+        if result.error is None:  # API调用成功
+            final_translation = self.extract_final_translation(result.text)
+
+            # 更新滑动窗口中的token计数
+            if result.tokens is not None and result.tokens >= 0:
+                self.token_window.append(result.tokens)
+                self.app_ref.log_message(
+                    "翻译器 %s: API调用token使用量: %s tokens，文本长度: %s 字符", "debug",
+                    self.translator_id, result.tokens, len(text_to_translate)
+                )
+            else:
+                self.app_ref.log_message(
+                    f"翻译器 {self.translator_id}: 警告: 无法获取本次API调用的token使用量",
+                    "warn"
+                )
+
+            if not final_translation:
+                # 无法提取译文时返回原文并报告错误，避免被当作成功的译文缓存或应用
+                self.failed_translations.append((text_to_translate, TRANSLATION_EXTRACTION_FAILED))
+                return text_to_translate, result.tokens, TRANSLATION_EXTRACTION_FAILED, None
+
+            return final_translation, result.tokens, None, None
+
+        # 所有重试失败后或遇到致命错误
+        self.failed_translations.append((text_to_translate, result.error))
+        return text_to_translate, 0, result.error, _rate_info(result)
+
+    def _call_with_retries(self, prompt: str, model_name: str, api_key_to_use: str) -> ApiResult:
+        """
+        调用API，失败时按退避时间重试
+
+        Args:
+            prompt: 提示词文本
+            model_name: 模型名称
+            api_key_to_use: 使用的API密钥
+
+        Returns:
+            最后一次API调用的结果
+        """
         last_error_type = "UNKNOWN_ERROR"
 
         for attempt in range(1, MAX_RETRIES + 1):
-            raw_text, token_count_or_error = self._call_actual_api(prompt, model_name, api_key_to_use)
-
-            if raw_text is not None:  # API调用成功
-                final_translation = self.extract_final_translation(raw_text)
-
-                # 更新滑动窗口中的token计数
-                if isinstance(token_count_or_error, int) and token_count_or_error >= 0:
-                    self.token_window.append(token_count_or_error)
-                    self.app_ref.log_message(
-                        f"翻译器 {self.translator_id}: API调用token使用量: {token_count_or_error} tokens，文本长度: {len(text_to_translate)} 字符",
-                        "info"
-                    )
-                else:
-                    self.app_ref.log_message(
-                        f"翻译器 {self.translator_id}: 警告: 无法获取本次API调用的token使用量",
-                        "warn"
-                    )
-
-                return final_translation or text_to_translate, token_count_or_error, None
+            result = self._call_actual_api(prompt, model_name, api_key_to_use)
+
+            if result.error is None:  # API调用成功
+                return result
 
             # API调用失败
-            last_error_type = token_count_or_error if isinstance(token_count_or_error, str) else "API_CALL_FAILED_UNKNOWN"
+            last_error_type = result.error
             self.app_ref.log_message(
                 f"翻译器 {self.translator_id}: API调用尝试 {attempt}/{MAX_RETRIES} 失败。错误: {last_error_type}",
                 "warn"
             )
 
             # 对于致命错误，不进行重试
-            if last_error_type in ["API_KEY_INVALID", "API_KEY_MISSING", "Malformed", "CONFIG_FAILURE"]:
+            if last_error_type in NON_RETRYABLE_ERRORS:
                 self.app_ref.log_message(
                     f"翻译器 {self.translator_id}: 致命错误 ({last_error_type})，不进行重试",
                     "error"
                 )
                 break
 
+            # 服务端给出了重试等待时间，交由调用方让该密钥冷却并改用其他密钥
+            if result.retry_after is not None:
+                self.app_ref.log_message(
+                    f"翻译器 {self.translator_id}: 服务端要求 {result.retry_after} 秒后重试，不在当前密钥上重试",
+                    "warn"
+                )
+                return result
+
             # 如果还有重试机会，等待后重试
             if attempt < MAX_RETRIES:
                 delay = BACKOFF_TIMES[attempt - 1]
@@ -355,9 +575,99 @@ Example: $$Translated text here, with all original [placeholders] and $variables
                     "error"
                 )
 
-        # 所有重试失败后或遇到致命错误
-        self.failed_translations.append((text_to_translate, last_error_type))
-        return text_to_translate, 0, last_error_type
+        return ApiResult(None, error=last_error_type)
+
+    def _build_batch_prompt(
+        self,
+        texts: List[str],
+        source_lang_name: str,
+        target_lang_name: str,
+        game_mod_style: str
+    ) -> str:
+        """
+        构建合并翻译多个条目的提示词
+
+        每个条目占一行编号，调用方只合并不含换行符的单行文本。
+
+        Args:
+            texts: 要翻译的文本列表
+            source_lang_name: 源语言名称
+            target_lang_name: 目标语言名称
+            game_mod_style: 游戏/Mod风格提示
+
+        Returns:
+            构建好的提示词
+        """
+        numbered = "\n".join(f"{i}. {text}" for i, text in enumerate(texts, 1))
+        return f"""As a professional bilingual translation expert, proficient in {source_lang_name} and {target_lang_name}, your task is to translate each numbered line below.
+Game/Mod Style: {game_mod_style if game_mod_style else "General"}
+You MUST preserve all placeholders like [...], $...$, @...! and #...! exactly as they appear in the original text.
+
+Original Lines ({source_lang_name}):
+{numbered}
+
+For every numbered line N, output exactly one entry in the form <<<N>>>$$translation$$<<</N>>> containing ONLY the final translation in {target_lang_name}. Output all {len(texts)} entries in order and nothing else.
+Example: <<<1>>>$$Translated text here, with all original [placeholders] and $variables$ preserved.$$<<</1>>>
+"""
+
+    def translate_batch(
+        self,
+        texts: List[str],
+        source_lang_name: str,
+        target_lang_name: str,
+        game_mod_style: str,
+        model_name: str,
+        api_key_to_use: str
+    ) -> Tuple[List[str], int, List[Optional[str]], Optional[Dict[str, float]]]:
+        """
+        在一次API请求中翻译多个单行短文本
+
+        响应中缺失或为空的条目返回原文并标记为BATCH_ENTRY_MISSING，
+        由调用方重新入队单独翻译，以便仍经过限速和配额控制。
+
+        Args:
+            texts: 要翻译的文本列表
+            source_lang_name: 源语言名称
+            target_lang_name: 目标语言名称
+            game_mod_style: 游戏/Mod风格提示
+            model_name: 使用的模型名称
+            api_key_to_use: 使用的API密钥
+
+        Returns:
+            (翻译结果列表, token总数, 各条目的错误类型列表, 限流信息) 的元组
+        """
+        prompt = self._build_batch_prompt(texts, source_lang_name, target_lang_name, game_mod_style)
+        self.app_ref.log_message(
+            f"翻译器 {self.translator_id}: 合并翻译 {len(texts)} 个条目 (使用密钥 ...{api_key_to_use[-4:]})",
+            "debug"
+        )
+
+        result = self._call_with_retries(prompt, model_name, api_key_to_use)
+        if result.error is not None:
+            self.failed_translations.extend((text, result.error) for text in texts)
+            return list(texts), 0, [result.error] * len(texts), _rate_info(result)
+
+        total_tokens = result.tokens or 0
+        if total_tokens > 0:
+            self.token_window.append(total_tokens)
+
+        parsed: Dict[int, str] = {}
+        for match in _BATCH_ENTRY_RE.finditer(result.text):
+            translation = match.group(2).strip()
+            if translation:
+                parsed[int(match.group(1))] = translation
+
+        translations = [parsed.get(index, text) for index, text in enumerate(texts, 1)]
+        errors = [None if index in parsed else BATCH_ENTRY_MISSING for index in range(1, len(texts) + 1)]
+
+        missing = len(texts) - len(parsed)
+        if missing:
+            self.app_ref.log_message(
+                f"翻译器 {self.translator_id}: 合并翻译响应缺少 {missing}/{len(texts)} 个条目，将单独翻译",
+                "warn"
+            )
+
+        return translations, total_tokens, errors, None
 
     def get_statistics(self) -> dict:
         """
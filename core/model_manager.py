@@ -4,33 +4,34 @@ AI模型管理器
 负责获取和管理可用的AI模型列表
 """
 
+import hashlib
+import json
+import os
 import threading
 import time
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from config.config_manager import ConfigManager
-
-# 尝试导入Gemini库
-try:
-    import google.generativeai as genai
-    GEMINI_AVAILABLE = True
-except ImportError:
-    GEMINI_AVAILABLE = False
-    genai = None
+from config.constants import GEMINI_API_ENDPOINT, GEMINI_TRANSPORT, MODEL_CACHE_FILE, MODEL_CACHE_TTL
+from utils.genai_loader import GEMINI_AVAILABLE, load_genai
+from utils.http_session import attach_pooled_adapter
 
 
 class ModelManager:
     """AI模型管理器，负责获取和缓存可用模型列表"""
     
-    def __init__(self, config_manager: ConfigManager, app_ref: Any = None):
+    def __init__(self, config_manager: ConfigManager, app_ref: Any = None,
+                 cache_file: Optional[str] = MODEL_CACHE_FILE):
         """
         初始化模型管理器
         
         Args:
             config_manager: 配置管理器
             app_ref: 应用程序引用（用于日志记录）
+            cache_file: 模型列表磁盘缓存路径，为None时不使用磁盘缓存
         """
         self.config_manager = config_manager
         self.app_ref = app_ref
+        self.cache_file = cache_file
         self.lock = threading.RLock()
         
         # 默认模型列表
@@ -43,7 +44,7 @@ class ModelManager:
         
         # 缓存的模型列表
         self.cached_models: List[str] = []
-        self.cache_timestamp: float = 0
+        self.cache_timestamp: float = 0  # 缓存时间（time.monotonic），不受系统时钟调整影响
         self.cache_duration: float = 300  # 5分钟缓存
         
         # 获取状态
@@ -64,14 +65,21 @@ class ModelManager:
             # 检查缓存是否有效
             if not force_refresh and self._is_cache_valid():
                 return self.cached_models if self.cached_models else self.default_models
+
+            # 签名（端点+密钥指纹）未变时直接使用磁盘缓存，免去启动时的网络请求
+            if not force_refresh:
+                disk_models = self._use_disk_cache()
+                if disk_models:
+                    return disk_models
             
             # 尝试从API获取模型列表
             api_models = self._fetch_models_from_api()
             
             if api_models:
                 self.cached_models = api_models
-                self.cache_timestamp = time.time()
+                self.cache_timestamp = time.monotonic()
                 self.last_fetch_error = None
+                self._save_disk_cache(api_models)
                 self._log_message(f"成功获取 {len(api_models)} 个可用模型", "info")
                 return api_models
             else:
@@ -79,14 +87,135 @@ class ModelManager:
                 self._log_message("使用默认模型列表", "warn")
                 return self.default_models
     
+    def get_cached_models(self) -> List[str]:
+        """
+        只从内存或磁盘缓存获取模型列表，不发起网络请求，可在UI线程调用
+
+        Returns:
+            缓存的模型列表，没有缓存时返回默认列表
+        """
+        with self.lock:
+            if self.cached_models:
+                return self.cached_models
+            return self._use_disk_cache() or self.default_models
+
+    def has_valid_api_keys(self) -> bool:
+        """
+        是否有可用于获取模型列表的API密钥
+
+        Returns:
+            是否有有效密钥
+        """
+        return bool(self._get_valid_api_keys())
+
+    def _use_disk_cache(self) -> Optional[List[str]]:
+        """
+        载入磁盘缓存作为当前模型列表（调用方需持有锁）
+
+        缓存过期时仍先返回旧列表，由后台线程刷新。
+
+        Returns:
+            磁盘缓存的模型列表，没有可用缓存时返回None
+        """
+        disk_cache = self._load_disk_cache()
+        if not disk_cache:
+            return None
+
+        disk_models, fetched_at = disk_cache
+        self.cached_models = disk_models
+        self.cache_timestamp = time.monotonic()
+        if time.time() - fetched_at >= MODEL_CACHE_TTL:
+            self._log_message("磁盘模型缓存已过期，后台刷新", "debug")
+            self.refresh_models_async()
+        return disk_models
+
     def _is_cache_valid(self) -> bool:
         """检查缓存是否有效"""
         if not self.cached_models:
             return False
         
-        current_time = time.time()
+        current_time = time.monotonic()
         return (current_time - self.cache_timestamp) < self.cache_duration
     
+    def _get_valid_api_keys(self) -> List[str]:
+        """获取有效的API密钥列表"""
+        api_keys = self.config_manager.get_api_keys()
+        return [key for key in api_keys if key != "YOUR_GEMINI_API_KEY" and key.strip()]
+
+    def _get_cache_signature(self) -> Optional[str]:
+        """
+        计算磁盘缓存签名
+
+        Returns:
+            由API端点和首个有效密钥指纹组成的签名，没有有效密钥时返回None
+        """
+        valid_keys = self._get_valid_api_keys()
+        if not valid_keys:
+            return None
+
+        raw = f"{GEMINI_API_ENDPOINT}|{GEMINI_TRANSPORT}|{valid_keys[0]}"
+        return hashlib.blake2b(raw.encode('utf-8'), digest_size=16).hexdigest()
+
+    def _load_disk_cache(self) -> Optional[Tuple[List[str], float]]:
+        """
+        从磁盘加载模型列表缓存
+
+        Returns:
+            签名匹配时返回(缓存的模型列表, 获取时间戳)，否则返回None
+        """
+        if not self.cache_file:
+            return None
+
+        signature = self._get_cache_signature()
+        if signature is None:
+            return None
+
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if not isinstance(data, dict) or data.get("signature") != signature:
+            return None
+
+        models = data.get("models")
+        if not isinstance(models, list) or not models:
+            return None
+
+        fetched_at = data.get("fetched_at")
+        if not isinstance(fetched_at, (int, float)):
+            fetched_at = 0.0
+
+        self._log_message(f"从磁盘缓存加载 {len(models)} 个可用模型", "debug")
+        return models, fetched_at
+
+    def _save_disk_cache(self, models: List[str]):
+        """
+        将模型列表写入磁盘缓存
+
+        Args:
+            models: 模型列表
+        """
+        if not self.cache_file:
+            return
+
+        signature = self._get_cache_signature()
+        if signature is None:
+            return
+
+        data = {"signature": signature, "models": models, "fetched_at": time.time()}
+        temp_path = f"{self.cache_file}.tmp"
+        try:
+            cache_dir = os.path.dirname(self.cache_file)
+            if cache_dir:
+                os.makedirs(cache_dir, exist_ok=True)
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(temp_path, self.cache_file)
+        except OSError as e:
+            self._log_message(f"写入模型缓存失败: {e}", "warn")
+
     def _fetch_models_from_api(self) -> Optional[List[str]]:
         """
         从API获取模型列表
@@ -99,8 +228,7 @@ class ModelManager:
             return None
         
         # 检查是否有有效的API密钥
-        api_keys = self.config_manager.get_api_keys()
-        valid_keys = [key for key in api_keys if key != "YOUR_GEMINI_API_KEY" and key.strip()]
+        valid_keys = self._get_valid_api_keys()
         
         if not valid_keys:
             self._log_message("没有有效的API密钥，无法获取模型列表", "warn")
@@ -116,7 +244,9 @@ class ModelManager:
         try:
             # 使用第一个有效的API密钥
             api_key = valid_keys[0]
-            genai.configure(api_key=api_key)
+            genai, genai_client = load_genai()
+            genai.configure(api_key=api_key, transport=GEMINI_TRANSPORT)
+            attach_pooled_adapter(genai_client.get_default_model_client())
             
             self._log_message("正在从Gemini API获取可用模型列表...", "info")
             
@@ -254,6 +384,11 @@ class ModelManager:
         with self.lock:
             self.cached_models = []
             self.cache_timestamp = 0
+            if self.cache_file:
+                try:
+                    os.remove(self.cache_file)
+                except OSError:
+                    pass
             self._log_message("模型缓存已清除", "info")
     
     def get_cache_status(self) -> Dict[str, Any]:
@@ -262,7 +397,7 @@ class ModelManager:
             return {
                 "cached_models_count": len(self.cached_models),
                 "cache_valid": self._is_cache_valid(),
-                "cache_age": time.time() - self.cache_timestamp if self.cache_timestamp > 0 else 0,
+                "cache_age": time.monotonic() - self.cache_timestamp if self.cache_timestamp > 0 else 0,
                 "is_fetching": self.is_fetching,
                 "last_error": self.last_fetch_error
             }
@@ -1,18 +1,53 @@
 """
 并行翻译器
 
-管理多个翻译器实例的并行翻译任务
+管理多个工作线程共享一个翻译器的并行翻译任务
 """
 
+import itertools
 import queue
+import random
+import re
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 import threading
 import time
 import traceback
-from typing import Dict, List, Optional, Any, Callable
+from typing import Dict, List, Optional, Any, Callable, Tuple
 
 from config.config_manager import ConfigManager
+from config.constants import (
+    AIMD_LATENCY_TARGET, AIMD_LATENCY_WINDOW, BATCH_CHARS_PER_TOKEN, BATCH_ENTRY_MISSING, BATCH_MAX_ENTRIES,
+    BATCH_MAX_ENTRY_CHARS, BATCH_TOKEN_BUDGET, DEDUP_CACHE_SIZE, HTTP_RETRY_STATUS_CODES, TASK_BUFFER_MIN,
+    TASK_BUFFER_PER_WORKER, TASK_BUFFER_PRESSURE_RATIO, TASK_MAX_RETRIES, TASK_RETRY_MAX_DELAY,
+    TASK_RETRY_POLL_INTERVAL, NO_KEY_RETRY_DELAY, WORKER_LATENCY_SAMPLES, WORKER_POOL_MAX,
+    WORKER_POOL_PER_KEY, WORKER_SCALE_INTERVAL
+)
+from utils.rate_limit import AIMDLimiter
+from utils.translation_cache import TranslationCache
 from .api_key_manager import APIKeyManager
-from .gemini_translator import GeminiTranslator
+from .gemini_translator import GeminiTranslator, uses_chinese_prompt
+
+# 放入队列唤醒阻塞中的工作线程并使其退出；入队时排在所有任务之前
+_STOP_SENTINEL = None
+
+# 表示服务端过载的错误：限流、5xx和超时，出现时收缩并发
+_OVERLOAD_ERROR_RE = re.compile(
+    r"Rate limit|\b(?:%s)\b|timed? ?out|deadline" % "|".join(map(str, HTTP_RETRY_STATUS_CODES)),
+    re.IGNORECASE
+)
+
+
+class _LazyTraceback:
+    """作为日志格式化参数，仅在日志级别启用、被转为字符串时才格式化异常堆栈"""
+
+    __slots__ = ("exc",)
+
+    def __init__(self, exc: BaseException):
+        self.exc = exc
+
+    def __str__(self) -> str:
+        return "".join(traceback.format_exception(type(self.exc), self.exc, self.exc.__traceback__))
 
 
 class ParallelTranslator:
@@ -29,33 +64,51 @@ class ParallelTranslator:
         self.app_ref = app_ref
         self.config_manager = config_manager
         self.api_key_manager = APIKeyManager(config_manager)
-        self.translators: Dict[str, GeminiTranslator] = {}  # 翻译器字典
-        self.translation_queue = queue.Queue()  # 待翻译文本队列
-        self.result_queue = queue.Queue()  # 翻译结果队列
+        # 密钥随每次调用传入，所有工作线程共享同一个翻译器及其模型和提示词缓存
+        self.translator = GeminiTranslator(app_ref, translator_id="shared")
+        # 待翻译任务队列，元素为(可处理时间, 序号, 任务)：按time.monotonic时间先后出队，
+        # 同一时间按入队顺序；重试的任务推迟到退避结束后才可处理
+        self.translation_queue = queue.PriorityQueue()
+        self._task_seq = itertools.count()
+        # 已提交但尚未产出结果的任务数上限，add_translation_task在缓冲区满时阻塞
+        self.task_capacity = TASK_BUFFER_MIN
+        self._task_slots = threading.Semaphore(self.task_capacity)
+        self._resident_tasks = 0
+        # 按(源语言, 目标语言, 模型, 风格, 原文)去重：最近译文的LRU缓存，以及正在翻译的原文对应的重复任务
+        self._recent_translations: "OrderedDict[Tuple[str, ...], str]" = OrderedDict()
+        self._inflight_duplicates: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+        self.result_queue = queue.SimpleQueue()  # 翻译结果队列
         self.pending_reviews: Dict[str, Any] = {}  # 待评审的翻译
-        self.workers: List[threading.Thread] = []  # 工作线程列表
+        self.executor: Optional[ThreadPoolExecutor] = None  # 运行工作线程的线程池
+        self.workers: List[Future] = []  # 各工作线程对应的Future
         self.stop_flag = threading.Event()  # 停止标志
         self.lock = threading.RLock()  # 全局锁
-        self.init_translators()
-        
-    def init_translators(self) -> None:
-        """初始化翻译器实例"""
-        with self.lock:
-            # 清空现有翻译器
-            self.translators.clear()
-            self.app_ref.log_message("并行翻译器：正在清理旧的翻译器实例...", "debug")
+        self.concurrency: Optional[AIMDLimiter] = None  # 按请求结果自适应的并发限制器
+        # 按延迟和队列深度增减工作线程：自上次检查以来的延迟样本、队列深度、是否出现过载
+        # 以及是否有工作线程在请求间隔或配额上等待
+        self.max_workers = 0  # 工作线程数上限
+        self._scale_lock = threading.Lock()
+        self._latency_samples = deque(maxlen=WORKER_LATENCY_SAMPLES)
+        self._depth_sum = 0
+        self._depth_count = 0
+        self._overloaded = False
+        self._throttled = False
+        self._next_scale_check = 0.0
+        self.translation_cache: Optional[TranslationCache] = None  # 持久化翻译缓存
+        # 运行代数，每次stop_workers递增；任务和工作线程记录所属的代，
+        # 已停止的运行中仍在调用API的线程返回后不会再改动新一轮的队列、结果和缓冲区计数
+        self._generation = 0
 
-            # 获取并行工作线程数
-            num_workers = self.config_manager.get_setting("max_concurrent_tasks", 3)
+    def set_translation_cache(self, translation_cache: Optional[TranslationCache]) -> None:
+        """
+        设置翻译缓存，工作线程在调用API前先查询缓存
+
+        Args:
+            translation_cache: 翻译缓存，为None时禁用
+        """
+        with self.lock:
+            self.translation_cache = translation_cache
 
-            for i in range(num_workers):
-                translator_id = f"parallel_translator-{i+1}"
-                self.translators[translator_id] = GeminiTranslator(
-                    self.app_ref,
-                    translator_id=translator_id
-                )
-                self.app_ref.log_message(f"并行翻译器：已初始化翻译器 {translator_id}", "info")
-    
     def start_workers(self, num_workers: Optional[int] = None) -> None:
         """
         启动工作线程
@@ -75,18 +128,34 @@ class ParallelTranslator:
             
             # 清空标志
             self.stop_flag.clear()
+
+            # 工作线程数从配置值开始，最多按密钥数扩容；并发上限随之自适应调整
+            key_count = max(1, len(self.api_key_manager.get_all_keys()))
+            self.max_workers = max(num_workers, min(WORKER_POOL_MAX, WORKER_POOL_PER_KEY * key_count))
+            self.concurrency = AIMDLimiter(
+                self.max_workers, latency_target=AIMD_LATENCY_TARGET, window=AIMD_LATENCY_WINDOW,
+                initial_limit=num_workers
+            )
             
-            # 创建新的工作线程
-            self.workers = []
-            for i in range(num_workers):
-                worker = threading.Thread(
-                    target=self._worker_thread,
-                    args=(i,),
-                    daemon=True
-                )
-                self.workers.append(worker)
-                worker.start()
-                self.app_ref.log_message(f"启动工作线程 {i+1}/{num_workers}", "info")
+            # 每个工作线程至少能缓冲两批合并翻译的任务
+            max_entries = int(self.config_manager.get_setting("batch_max_entries", BATCH_MAX_ENTRIES))
+            self._reset_task_slots(
+                max(TASK_BUFFER_MIN, num_workers * max(TASK_BUFFER_PER_WORKER, 2 * max_entries))
+            )
+
+            # 在线程池中启动工作线程，线程池按扩容上限创建
+            self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="translator")
+            self.workers = [
+                self.executor.submit(self._worker_thread, i, self._generation) for i in range(num_workers)
+            ]
+            with self._scale_lock:
+                self._latency_samples.clear()
+                self._depth_sum = 0
+                self._depth_count = 0
+                self._overloaded = False
+                self._throttled = False
+            self._next_scale_check = time.monotonic() + WORKER_SCALE_INTERVAL
+            self.app_ref.log_message(f"启动 {num_workers} 个工作线程", "info")
     
     def stop_workers(self) -> None:
         """停止所有工作线程"""
@@ -94,124 +163,671 @@ class ParallelTranslator:
             if not self.workers:
                 return
                 
-            # 设置停止标志
+            # 设置停止标志，并为每个工作线程放入一个停止标记以唤醒阻塞在队列上的线程
             self.stop_flag.set()
+            for _ in self.workers:
+                self._put_stop_sentinel()
             
-            # 等待所有工作线程结束
-            for i, worker in enumerate(self.workers):
-                if worker.is_alive():
-                    self.app_ref.log_message(f"等待工作线程 {i+1} 结束...", "info")
-                    worker.join(1.0)  # 等待最多1秒
-            
-            # 清空工作线程列表
+            # 最多等待1秒，正在调用API的线程会在请求返回后自行退出
+            self.app_ref.log_message("等待工作线程结束...", "info")
+            wait(self.workers, timeout=1.0)
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
             self.workers = []
             
-            # 清空队列
-            while not self.translation_queue.empty():
-                try:
-                    self.translation_queue.get_nowait()
-                except queue.Empty:
-                    break
+            # 进入新的一代：仍在调用API的旧线程返回后，其任务的重试、结果和名额释放都被丢弃。
+            # 直接换用新队列丢弃剩余任务和停止标记，无需逐个取出；丢弃的任务不会产出结果，
+            # 因此重置缓冲区计数和等待中的重复任务
+            self._generation += 1
+            self.translation_queue = queue.PriorityQueue()
+            self._reset_task_slots(self.task_capacity)
+            self._inflight_duplicates.clear()
+
+    def _enqueue(self, task: Dict[str, Any], delay: float = 0.0) -> None:
+        """
+        将任务放入待翻译队列，已停止的运行中的任务直接丢弃
+
+        Args:
+            task: 翻译任务
+            delay: 推迟处理的秒数
+        """
+        with self.lock:
+            if not self._is_stale(task):
+                self.translation_queue.put((time.monotonic() + delay, next(self._task_seq), task))
+
+    def _requeue_entries(self, entries: List[Tuple[float, int, Any]], task: Dict[str, Any]) -> None:
+        """
+        将取出的队列项原样放回队列，保留其在队列中的位置
+
+        Args:
+            entries: 队列项列表
+            task: 取出这些队列项时正在处理的任务，其所属的运行已停止时丢弃这些队列项
+        """
+        with self.lock:
+            if not self._is_stale(task):
+                for entry in entries:
+                    self.translation_queue.put(entry)
+
+    def _is_stale(self, task: Dict[str, Any]) -> bool:
+        """
+        判断任务是否属于已停止的运行（调用方需持有锁）
+
+        Args:
+            task: 翻译任务，未记录代数的任务视为属于当前运行
+
+        Returns:
+            是否属于已停止的运行
+        """
+        return task.get("generation", self._generation) != self._generation
+
+    def _put_stop_sentinel(self) -> None:
+        """放入一个停止标记，取到它的工作线程退出"""
+        self.translation_queue.put((float("-inf"), next(self._task_seq), _STOP_SENTINEL))
+
+    def _retry_later(self, tasks: List[Dict[str, Any]], error_type: str) -> None:
+        """
+        处理出错的任务按指数退避（带随机抖动）推迟后重新入队
+
+        任务携带重试次数，超过TASK_MAX_RETRIES后不再重试，作为失败结果返回。
+
+        Args:
+            tasks: 出错的任务
+            error_type: 错误信息
+        """
+        for task in tasks:
+            retries = task.get("retry_count", 0) + 1
+            if retries > TASK_MAX_RETRIES:
+                self.app_ref.log_message(
+                    "并行翻译器: 任务 %s 已重试 %s 次仍失败，放弃: %s", "error",
+                    task["entry_id"], TASK_MAX_RETRIES, error_type
+                )
+                self._emit_result(task, task["text"], 0, error_type)
+                continue
+            task["retry_count"] = retries
+            self._enqueue(task, min(TASK_RETRY_MAX_DELAY, 2 ** retries) + random.uniform(0, 1))
+
+    def _reset_task_slots(self, capacity: int) -> None:
+        """
+        按容量重建任务缓冲区计数（调用方需持有锁）
+
+        Args:
+            capacity: 缓冲区可容纳的任务数
+        """
+        self.task_capacity = capacity
+        self._task_slots = threading.Semaphore(capacity)
+        self._resident_tasks = 0
     
-    def _worker_thread(self, worker_id: int) -> None:
+    def _worker_thread(self, worker_id: int, generation: int) -> None:
         """
         工作线程函数
         
         Args:
             worker_id: 工作线程ID
+            generation: 启动时的运行代数，运行停止后线程不再取新任务
         """
         self.app_ref.log_message(f"工作线程 {worker_id} 开始运行", "debug")
+        translator = self.translator
+
+        # 每个任务都要用到的设置缓存在线程本地，仅在配置版本变化时重新读取
+        settings_version = None
+        max_entries = BATCH_MAX_ENTRIES
+        key_strategy = None
+
+        while generation == self._generation and not self.stop_flag.is_set():
+            stop, task = self._take_ready_task()
+            if stop:
+                break
+            if task is None:
+                continue
+
+            if self.config_manager.settings_version != settings_version:
+                settings_version = self.config_manager.settings_version
+                max_entries = int(self.config_manager.get_setting("batch_max_entries", BATCH_MAX_ENTRIES))
+                key_strategy = self.config_manager.get_setting("key_rotation_strategy", "round_robin")
+
+            if not self._process_task(translator, task, worker_id, max_entries, key_strategy):
+                break
         
-        # 为每个工作线程获取一个独立的翻译器实例
-        translator_instance_id = f"parallel_translator-{worker_id+1}"
-        translator = self.translators.get(translator_instance_id)
-        if not translator:
+        self.app_ref.log_message(f"工作线程 {worker_id} 结束运行", "debug")
+
+    def _take_ready_task(self) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        """
+        阻塞等待并取出一个可立即处理的任务，停止时由停止标记唤醒
+
+        Returns:
+            (是否取到停止标记, 翻译任务) 的元组；
+            队首任务尚未到重试时间时放回队列、稍等后任务为None
+        """
+        entry = self.translation_queue.get()
+        ready_at, _, task = entry
+        if task is _STOP_SENTINEL:
+            return True, None
+
+        # 队首任务尚未到重试时间，说明没有可立即处理的任务：放回后稍等
+        wait_time = ready_at - time.monotonic()
+        if wait_time > 0:
+            self._requeue_entries([entry], task)
+            self.stop_flag.wait(min(wait_time, TASK_RETRY_POLL_INTERVAL))
+            return False, None
+        return False, task
+
+    def _process_task(
+        self,
+        translator: GeminiTranslator,
+        task: Dict[str, Any],
+        worker_id: int,
+        max_entries: int,
+        key_strategy: Optional[str]
+    ) -> bool:
+        """
+        处理一个任务：查询缓存、合并同类短条目、获取密钥并节流后翻译
+
+        出现异常时任务（连同合并的任务）按退避时间推迟后放回队列，其他任务不受影响。
+
+        Args:
+            translator: 翻译器实例
+            task: 翻译任务
+            worker_id: 工作线程ID
+            max_entries: 每批最多合并的条目数
+            key_strategy: 密钥轮换策略
+
+        Returns:
+            工作线程是否继续运行，等待期间被停止时返回False
+        """
+        batch: List[Tuple[Dict[str, Any], Optional[str]]] = []
+        api_key = None
+        try:
+            # 查询翻译缓存，命中时跳过API调用
+            hit, cache_key = self._lookup_cache(task, worker_id)
+            if hit:
+                return True
+
+            # 短条目尝试与队列中的同类条目合并为一次请求
+            batch = self._collect_batch(task, cache_key, worker_id, max_entries)
+
+            # 获取API密钥
+            api_key = self.api_key_manager.get_next_key(key_strategy)
+            if not api_key:
+                self.app_ref.log_message(
+                    f"工作线程 {worker_id}: 无可用API密钥，将任务推迟后放回队列并等待。", 
+                    "error"
+                )
+                for batch_task, _ in batch:
+                    self._enqueue(batch_task, NO_KEY_RETRY_DELAY)
+                return not self.stop_flag.wait(NO_KEY_RETRY_DELAY)
+
             self.app_ref.log_message(
-                f"工作线程 {worker_id}: 严重错误 - 未找到翻译器实例 {translator_instance_id}。线程将退出。", 
-                "error"
+                "工作线程 %s 使用API密钥 ...%s 翻译: %.30s...", "debug",
+                worker_id, api_key[-4:], task.get('text', '')
             )
+
+            reserved_tokens = self._wait_for_quota(api_key, task["model_name"], worker_id)
+            if self.stop_flag.is_set():
+                return False
+
+            if len(batch) > 1:
+                self._translate_batch(translator, batch, api_key, reserved_tokens)
+            else:
+                self._translate_single(translator, task, cache_key, api_key, reserved_tokens)
+
+        except Exception as e:
+            self.app_ref.log_message("工作线程 %s 发生异常: %s", "error", worker_id, e)
+            self.concurrency.on_error()
+            self.app_ref.log_message("异常详情: %s", "debug", _LazyTraceback(e))
+
+            self._retry_later([batch_task for batch_task, _ in batch] or [task], str(e))
+
+            # 如果API密钥已分配，标记为失败
+            if api_key:
+                self.api_key_manager.mark_key_failure(api_key, str(e))
+        return True
+
+    def _wait_for_quota(self, api_key: str, model_name: str, worker_id: int) -> int:
+        """
+        按该密钥的请求间隔和所选模型下最近60秒的RPM/TPM用量节流
+
+        Args:
+            api_key: API密钥
+            model_name: 模型名称
+            worker_id: 工作线程ID
+
+        Returns:
+            为本次请求预留的token数
+        """
+        quota_wait, reserved_tokens = self.api_key_manager.wait_if_throttled(
+            api_key, model_name, self.stop_flag
+        )
+        if quota_wait > 0:
+            with self._scale_lock:
+                self._throttled = True
+            self.app_ref.log_message(
+                "工作线程 %s: 密钥 ...%s 配额等待 %.2f 秒", "debug",
+                worker_id, api_key[-4:], quota_wait
+            )
+        return reserved_tokens
+
+    def _translate_single(
+        self,
+        translator: GeminiTranslator,
+        task: Dict[str, Any],
+        cache_key: Optional[str],
+        api_key: str,
+        reserved_tokens: int
+    ) -> None:
+        """
+        单独翻译一个任务并放入结果队列
+
+        Args:
+            translator: 翻译器实例
+            task: 翻译任务
+            cache_key: 任务的缓存键，未启用缓存时为None
+            api_key: 使用的API密钥
+            reserved_tokens: 已为本次请求预留的token数
+        """
+        self.concurrency.acquire()
+        started = time.monotonic()
+        try:
+            translated_text, token_count, error_type, rate_info = translator.translate(
+                task["text"],
+                task["source_lang"],
+                task["target_lang"],
+                task["game_mod_style"],
+                task["model_name"],
+                api_key_to_use=api_key
+            )
+        finally:
+            self.concurrency.release()
+        self._record_outcome(time.monotonic() - started, error_type)
+
+        used_tokens = token_count if isinstance(token_count, int) else 0
+        self.api_key_manager.record(api_key, task["model_name"], reserved_tokens, used_tokens)
+
+        # 服务端给出了重试等待时间：让该密钥冷却，任务立即放回队列由其他密钥处理
+        if error_type is not None and rate_info:
+            self._defer_for_retry(api_key, rate_info["retry_after"], [task])
             return
 
-        while not self.stop_flag.is_set():
-            task = None
-            api_key = None
+        # 更新API密钥统计
+        if error_type is None and translated_text is not None:
+            self.api_key_manager.mark_key_success(api_key, used_tokens)
+            if cache_key is not None and self._is_extracted_translation(task, translated_text, error_type):
+                self.translation_cache.set(cache_key, translated_text)
+        else:
+            self.api_key_manager.mark_key_failure(api_key, error_type or "translation_failed_or_unchanged")
+
+        # 将结果放入结果队列
+        self._emit_result(task, translated_text, token_count, error_type)
+
+    def _lookup_cache(self, task: Dict[str, Any], worker_id: int) -> Tuple[bool, Optional[str]]:
+        """
+        查询翻译缓存，命中时直接放入结果队列
+
+        Args:
+            task: 翻译任务
+            worker_id: 工作线程ID
+
+        Returns:
+            (是否命中, 缓存键) 的元组，未启用缓存时缓存键为None
+        """
+        if self.translation_cache is None:
+            return False, None
+
+        cache_key = TranslationCache.make_key(
+            task["source_lang"], task["target_lang"], task["model_name"],
+            task.get("game_mod_style", ""), task["text"]
+        )
+        cached_text = self.translation_cache.get(cache_key)
+        if cached_text is None:
+            return False, cache_key
+
+        self.app_ref.log_message(
+            "工作线程 %s: 缓存命中: %.30s...", "debug", worker_id, task.get('text', '')
+        )
+        self._emit_result(task, cached_text, 0, None)
+        return True, cache_key
+
+    @staticmethod
+    def _is_extracted_translation(
+        task: Dict[str, Any], translated_text: Optional[str], error_type: Optional[str]
+    ) -> bool:
+        """
+        判断结果是否为从响应中提取出的真实译文，只有真实译文才写入缓存
+
+        提取失败时翻译器返回原文，空译文或与原文相同的结果不能代表一次成功的翻译。
+
+        Args:
+            task: 翻译任务
+            translated_text: 翻译结果
+            error_type: 错误类型
+
+        Returns:
+            是否为可缓存的译文
+        """
+        return error_type is None and bool(translated_text) and translated_text != task["text"]
+
+    @staticmethod
+    def _is_batchable(task: Dict[str, Any]) -> bool:
+        """
+        判断任务能否参与合并翻译
+
+        合并提示词按行编号，多行文本会与编号混淆；英语与简体中文互译使用三步翻译提示词，
+        合并后会丢失该流程；合并响应中缺失过的条目改为单独翻译。
+
+        Args:
+            task: 翻译任务
+
+        Returns:
+            是否可以合并翻译
+        """
+        text = task["text"]
+        return (
+            len(text) <= BATCH_MAX_ENTRY_CHARS and bool(text.strip()) and "\n" not in text
+            and not task.get("no_batch")
+            and not uses_chinese_prompt(task["source_lang"], task["target_lang"])
+        )
+
+    def _collect_batch(
+        self,
+        task: Dict[str, Any],
+        cache_key: Optional[str],
+        worker_id: int,
+        max_entries: int
+    ) -> List[Tuple[Dict[str, Any], Optional[str]]]:
+        """
+        从队列中取出可与当前任务合并翻译的短条目
+
+        只合并语言、模型和风格相同、且可合并翻译的短文本，并按输入token预算限制数量；
+        遇到第一个不可合并的任务即停止并将其放回队列，每次最多多取出一个任务。
+
+        Args:
+            task: 当前任务
+            cache_key: 当前任务的缓存键
+            worker_id: 工作线程ID
+            max_entries: 每批最多合并的条目数
+
+        Returns:
+            (任务, 缓存键) 列表，第一个元素为当前任务
+        """
+        batch = [(task, cache_key)]
+        if max_entries <= 1 or not self._is_batchable(task):
+            return batch
+
+        group = (task["source_lang"], task["target_lang"], task["model_name"], task["game_mod_style"])
+        budget = BATCH_TOKEN_BUDGET - len(task["text"]) // BATCH_CHARS_PER_TOKEN
+        now = time.monotonic()
+        deferred = []
+        while len(batch) < max_entries and budget > 0:
             try:
-                try:
-                    task = self.translation_queue.get(timeout=1.0)
-                except queue.Empty:
-                    continue
+                entry = self.translation_queue.get_nowait()
+            except queue.Empty:
+                break
+            ready_at, _, candidate = entry
+            if candidate is _STOP_SENTINEL or ready_at > now:
+                # 停止标记留给其他工作线程，未到重试时间的任务留在队列中
+                deferred.append(entry)
+                break
+
+            text = candidate["text"]
+            candidate_group = (
+                candidate["source_lang"], candidate["target_lang"],
+                candidate["model_name"], candidate["game_mod_style"]
+            )
+            if candidate_group != group or not self._is_batchable(candidate):
+                deferred.append(entry)
+                break
+
+            hit, candidate_key = self._lookup_cache(candidate, worker_id)
+            if hit:
+                continue
+
+            batch.append((candidate, candidate_key))
+            budget -= len(text) // BATCH_CHARS_PER_TOKEN + 1
+
+        # 放回原队列项，保留其在队列中的位置
+        self._requeue_entries(deferred, task)
+        return batch
+
+    def _translate_batch(
+        self,
+        translator: GeminiTranslator,
+        batch: List[Tuple[Dict[str, Any], Optional[str]]],
+        api_key: str,
+        reserved_tokens: int
+    ) -> None:
+        """
+        合并翻译一批任务并逐条放入结果队列
+
+        Args:
+            translator: 翻译器实例
+            batch: (任务, 缓存键) 列表
+            api_key: 使用的API密钥
+            reserved_tokens: 已为本次请求预留的token数
+        """
+        first = batch[0][0]
+        self.concurrency.acquire()
+        started = time.monotonic()
+        try:
+            translations, token_count, errors, rate_info = translator.translate_batch(
+                [batch_task["text"] for batch_task, _ in batch],
+                first["source_lang"],
+                first["target_lang"],
+                first["game_mod_style"],
+                first["model_name"],
+                api_key_to_use=api_key
+            )
+        finally:
+            self.concurrency.release()
+        # 响应中缺失的条目不算请求失败
+        request_errors = [error for error in errors if error is not None and error != BATCH_ENTRY_MISSING]
+        self._record_outcome(time.monotonic() - started, request_errors[0] if request_errors else None)
+
+        self.api_key_manager.record(api_key, first["model_name"], reserved_tokens, token_count)
+
+        if len(request_errors) == len(errors):
+            if not rate_info:
+                self.api_key_manager.mark_key_failure(api_key, request_errors[0])
+        else:
+            self.api_key_manager.mark_key_success(api_key, token_count)
+
+        # 服务端给出了重试等待时间时，失败的条目放回队列而不是作为结果返回；
+        # 响应中缺失的条目改为单独翻译后重新入队
+        deferred = []
+        missing = []
+        per_entry_tokens = token_count // len(batch)
+        for (batch_task, cache_key), translated_text, error_type in zip(batch, translations, errors):
+            if error_type == BATCH_ENTRY_MISSING:
+                batch_task["no_batch"] = True
+                missing.append(batch_task)
+                continue
+            if error_type is not None and rate_info:
+                deferred.append(batch_task)
+                continue
+            if cache_key is not None and self._is_extracted_translation(batch_task, translated_text, error_type):
+                self.translation_cache.set(cache_key, translated_text)
+            self._emit_result(batch_task, translated_text, per_entry_tokens, error_type)
+        if deferred:
+            self._defer_for_retry(api_key, rate_info["retry_after"], deferred)
+        for batch_task in missing:
+            self._enqueue(batch_task)
 
-                # 获取API密钥
-                api_key = self.api_key_manager.get_next_key()
-                if not api_key:
+    def _defer_for_retry(self, api_key: str, retry_after: float, tasks: List[Dict[str, Any]]) -> None:
+        """
+        按服务端要求让密钥冷却，并把任务放回队列
+
+        Args:
+            api_key: 触发限流的API密钥
+            retry_after: 服务端要求的等待秒数
+            tasks: 需要重新翻译的任务
+        """
+        self.api_key_manager.cool_down(api_key, retry_after)
+        self.app_ref.log_message(
+            "并行翻译器: 密钥 ...%s 冷却 %.1f 秒，%s 个任务放回队列", "warn",
+            api_key[-4:], retry_after, len(tasks)
+        )
+        for task in tasks:
+            self._enqueue(task)
+
+    def _record_outcome(self, latency: float, error_type: Optional[str]) -> None:
+        """
+        根据请求结果调整并发上限
+
+        成功时记录延迟（平均延迟达标时加性增大），
+        限流、5xx或超时时乘性减小；其他错误不影响并发。
+
+        Args:
+            latency: 请求耗时（秒）
+            error_type: 错误类型，成功时为None
+        """
+        overloaded = False
+        if error_type is None:
+            self.concurrency.on_success(latency)
+        elif _OVERLOAD_ERROR_RE.search(error_type):
+            overloaded = True
+            self.concurrency.on_error()
+            self.app_ref.log_message(
+                "并行翻译器: 检测到过载错误 (%s)，并发上限降为 %s", "debug",
+                error_type, self.concurrency.limit
+            )
+
+        with self._scale_lock:
+            if error_type is None:
+                self._latency_samples.append(latency)
+            self._overloaded = self._overloaded or overloaded
+            self._depth_sum += self.translation_queue.qsize()
+            self._depth_count += 1
+        if time.monotonic() >= self._next_scale_check:
+            self._scale_workers()
+
+    def _scale_workers(self) -> None:
+        """
+        定期按运行数据增减一个工作线程
+
+        检查间隔内出现过载错误时让一个工作线程处理完当前任务后退出（至少保留一个）；
+        否则在p95延迟低于目标且平均队列深度超过工作线程数两倍时增加一个工作线程。
+        有工作线程在请求间隔/配额上等待或并发已达上限时，增加线程也无法提高吞吐量，不扩容。
+        """
+        with self.lock:
+            now = time.monotonic()
+            if self.executor is None or self.stop_flag.is_set() or now < self._next_scale_check:
+                return
+            self._next_scale_check = now + WORKER_SCALE_INTERVAL
+
+            with self._scale_lock:
+                latencies = sorted(self._latency_samples)
+                avg_depth = self._depth_sum / self._depth_count if self._depth_count else 0.0
+                overloaded = self._overloaded
+                throttled = self._throttled
+                self._latency_samples.clear()
+                self._depth_sum = 0
+                self._depth_count = 0
+                self._overloaded = False
+                self._throttled = False
+
+            self.workers = [w for w in self.workers if not w.done()]
+            active = len(self.workers)
+            if overloaded:
+                if active > 1:
+                    # 停止标记使取到它的工作线程在处理完当前任务后退出
+                    self._put_stop_sentinel()
                     self.app_ref.log_message(
-                        f"工作线程 {worker_id}: 无可用API密钥，将任务放回队列并等待。", 
-                        "error"
+                        "并行翻译器: 出现过载错误，工作线程数减为 %s", "info", active - 1
                     )
-                    self.translation_queue.put(task)
-                    time.sleep(5.0) 
-                    continue
-                
-                self.app_ref.log_message(
-                    f"工作线程 {worker_id} 使用API密钥 ...{api_key[-4:]} 翻译: {task.get('text', '')[:30]}...", 
-                    "debug"
-                )
-                
-                # 应用基础延迟
-                base_delay = float(self.config_manager.get_setting("api_call_delay", 3.0))
+                return
+
+            if not latencies or active >= self.max_workers:
+                return
+            if throttled or self.concurrency.in_flight >= self.concurrency.limit:
+                return
+            p95_latency = latencies[int(0.95 * (len(latencies) - 1))]
+            if p95_latency < AIMD_LATENCY_TARGET and avg_depth > 2 * active:
+                self.workers.append(self.executor.submit(self._worker_thread, active, self._generation))
                 self.app_ref.log_message(
-                    f"工作线程 {worker_id}: 应用基础延迟 {base_delay:.1f} 秒 (来自配置)", 
-                    "debug"
-                )
-                time.sleep(base_delay)
-
-                # 执行翻译
-                translated_text, token_count, error_type = translator.translate(
-                    task["text"],
-                    task["source_lang"],
-                    task["target_lang"],
-                    task["game_mod_style"],
-                    task["model_name"],
-                    api_key_to_use=api_key
+                    "并行翻译器: p95延迟 %.1f 秒，平均队列深度 %.0f，工作线程数增为 %s", "info",
+                    p95_latency, avg_depth, active + 1
                 )
-                
-                # 更新API密钥统计
-                if error_type is None and translated_text is not None:
-                    self.api_key_manager.mark_key_success(
-                        api_key, 
-                        token_count if isinstance(token_count, int) else 0
-                    )
-                else:
-                    actual_error_type = error_type if error_type else "translation_failed_or_unchanged"
-                    self.api_key_manager.mark_key_failure(api_key, actual_error_type)
-                
-                # 将结果放入结果队列
-                self.result_queue.put({
-                    "entry_id": task["entry_id"],
-                    "original_text": task["text"],
-                    "translated_text": translated_text,
-                    "token_count": token_count,
-                    "api_error_type": error_type,
-                    "original_line_content": task.get("original_line_content"),
-                    "source_lang": task["source_lang"]
-                })
-                
-            except Exception as e:
-                self.app_ref.log_message(f"工作线程 {worker_id} 发生异常: {e}", "error")
-                self.app_ref.log_message(f"异常详情: {traceback.format_exc()}", "debug")
-                
-                # 如果任务已获取，将其放回队列
-                if task:
-                    self.translation_queue.put(task)
-                
-                # 如果API密钥已分配，标记为失败
-                if 'api_key' in locals() and api_key:
-                    error_type_for_key_manager = str(e)
-                    self.api_key_manager.mark_key_failure(api_key, error_type_for_key_manager)
-                
-                time.sleep(2.0)
-        
-        self.app_ref.log_message(f"工作线程 {worker_id} 结束运行", "debug")
+
+    def _emit_result(
+        self,
+        task: Dict[str, Any],
+        translated_text: Optional[str],
+        token_count: Any,
+        error_type: Optional[str]
+    ) -> None:
+        """
+        将结果放入结果队列，并释放该任务占用的缓冲区名额
+
+        等待同一原文的重复任务一并产出相同的结果；真实提取出的译文记入去重缓存。
+        任务所属的运行已停止时丢弃结果，不释放新一轮的名额。
+
+        Args:
+            task: 翻译任务
+            translated_text: 翻译结果
+            token_count: token数量
+            error_type: 错误类型
+        """
+        dedup_key = self._dedup_key(task)
+        with self.lock:
+            if self._is_stale(task):
+                return
+            self.result_queue.put(self._build_result(task, translated_text, token_count, error_type))
+            if self._resident_tasks > 0:
+                self._resident_tasks -= 1
+                self._task_slots.release()
+
+            duplicates = self._inflight_duplicates.pop(dedup_key, ())
+            if self._is_extracted_translation(task, translated_text, error_type):
+                self._recent_translations[dedup_key] = translated_text
+                self._recent_translations.move_to_end(dedup_key)
+                if len(self._recent_translations) > DEDUP_CACHE_SIZE:
+                    self._recent_translations.popitem(last=False)
+
+        for duplicate in duplicates:
+            self.result_queue.put(self._build_result(duplicate, translated_text, 0, error_type))
+
+    @staticmethod
+    def _dedup_key(task: Dict[str, Any]) -> Tuple[str, ...]:
+        """
+        生成任务的去重键
+
+        Args:
+            task: 翻译任务
+
+        Returns:
+            (源语言, 目标语言, 模型, 风格, 原文) 元组
+        """
+        return (
+            task["source_lang"], task["target_lang"], task["model_name"],
+            task["game_mod_style"], task["text"]
+        )
+
+    @staticmethod
+    def _build_result(
+        task: Dict[str, Any],
+        translated_text: Optional[str],
+        token_count: Any,
+        error_type: Optional[str]
+    ) -> Dict[str, Any]:
+        """
+        根据翻译任务构建结果字典
+
+        Args:
+            task: 翻译任务
+            translated_text: 翻译结果
+            token_count: token数量
+            error_type: 错误类型
+
+        Returns:
+            翻译结果字典
+        """
+        return {
+            "entry_id": task["entry_id"],
+            "original_text": task["text"],
+            "translated_text": translated_text,
+            "token_count": token_count,
+            "api_error_type": error_type,
+            "original_line_content": task.get("original_line_content"),
+            "source_lang": task["source_lang"]
+        }
 
     def add_translation_task(
         self, 
@@ -222,9 +838,13 @@ class ParallelTranslator:
         game_mod_style: str, 
         model_name: str, 
         original_line_content: Optional[str] = None
-    ) -> None:
+    ) -> bool:
         """
         添加翻译任务到队列
+
+        已提交但尚未产出结果的任务达到缓冲区上限时阻塞，直到工作线程产出结果，
+        使读取文件的生产者与翻译速度同步。最近翻译过的原文直接产出结果；
+        与正在翻译的任务原文相同时不再入队，等待该任务的结果。
         
         Args:
             entry_id: 条目ID
@@ -234,6 +854,9 @@ class ParallelTranslator:
             game_mod_style: 游戏/Mod风格
             model_name: 模型名称
             original_line_content: 原始行内容
+
+        Returns:
+            是否已接受该任务，等待期间工作线程被停止时返回False
         """
         task_data = {
             "entry_id": entry_id,
@@ -244,7 +867,82 @@ class ParallelTranslator:
             "model_name": model_name,
             "original_line_content": original_line_content
         }
-        self.translation_queue.put(task_data)
+        return self.add_translation_tasks([task_data]) == 1
+
+    def add_translation_tasks(self, tasks: List[Dict[str, Any]]) -> int:
+        """
+        批量添加翻译任务到队列
+
+        整批任务只获取一次锁完成去重，缓冲区名额也按批获取，
+        语义与逐个调用add_translation_task相同。
+
+        Args:
+            tasks: 任务字典列表，键与add_translation_task的参数相同；字典由队列接管，调用方不应再修改
+
+        Returns:
+            按顺序被接受的任务数，小于len(tasks)表示等待期间工作线程被停止
+        """
+        generation, fresh = self._deduplicate_tasks(tasks)
+
+        position = 0
+        while position < len(fresh):
+            while not self._task_slots.acquire(timeout=5.0):
+                if self.stop_flag.is_set():
+                    with self.lock:
+                        for _, _, dedup_key in fresh[position:]:
+                            self._inflight_duplicates.pop(dedup_key, None)
+                    return fresh[position][0]
+                self.app_ref.log_message(
+                    "并行翻译器: 任务缓冲区已满 (%s)，等待工作线程处理...", "debug", self.task_capacity
+                )
+            # 已获得一个名额，再无阻塞地取尽当前空闲的名额
+            granted = 1
+            while position + granted < len(fresh) and self._task_slots.acquire(blocking=False):
+                granted += 1
+            with self.lock:
+                if self._generation != generation:
+                    # 等待名额期间运行已停止，名额来自已被替换的缓冲区计数
+                    return fresh[position][0]
+                self._resident_tasks += granted
+
+            for _, task_data, _ in fresh[position:position + granted]:
+                self._enqueue(task_data)
+            position += granted
+
+        return len(tasks)
+
+    def _deduplicate_tasks(
+        self, tasks: List[Dict[str, Any]]
+    ) -> Tuple[int, List[Tuple[int, Dict[str, Any], Tuple[str, ...]]]]:
+        """
+        为任务记录当前运行代数并在批内和正在翻译的任务间去重
+
+        最近翻译过的原文直接产出结果，与正在翻译的任务原文相同的任务等待其结果。
+
+        Args:
+            tasks: 任务字典列表
+
+        Returns:
+            (当前运行代数, 需要入队的 (在批内的位置, 任务, 去重键) 列表) 的元组
+        """
+        fresh = []
+        with self.lock:
+            generation = self._generation
+            for index, task_data in enumerate(tasks):
+                task_data["generation"] = generation
+                dedup_key = self._dedup_key(task_data)
+                cached_text = self._recent_translations.get(dedup_key)
+                if cached_text is not None:
+                    self._recent_translations.move_to_end(dedup_key)
+                    self.result_queue.put(self._build_result(task_data, cached_text, 0, None))
+                    continue
+                duplicates = self._inflight_duplicates.get(dedup_key)
+                if duplicates is not None:
+                    duplicates.append(task_data)
+                    continue
+                self._inflight_duplicates[dedup_key] = []
+                fresh.append((index, task_data, dedup_key))
+        return generation, fresh
 
     def get_translation_result(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
         """
@@ -262,9 +960,13 @@ class ParallelTranslator:
             return None
 
     def get_queue_size(self) -> int:
-        """获取待翻译队列大小"""
+        """获取待翻译队列大小（并发存取时为近似值）"""
         return self.translation_queue.qsize()
 
+    def is_producer_pressured(self) -> bool:
+        """检查任务缓冲区是否接近上限，可用于在界面上提示正在缓冲"""
+        return self._resident_tasks >= TASK_BUFFER_PRESSURE_RATIO * self.task_capacity
+
     def is_queue_empty(self) -> bool:
         """检查待翻译队列是否为空"""
         return self.translation_queue.empty()
@@ -282,8 +984,8 @@ class ParallelTranslator:
             entry_id: 条目ID
             review_data: 评审数据
         """
-        with self.lock:
-            self.pending_reviews[entry_id] = review_data
+        # 单次字典赋值、读取和pop在GIL下是原子的，无需持有锁
+        self.pending_reviews[entry_id] = review_data
 
     def get_pending_review(self, entry_id: str) -> Optional[Any]:
         """
@@ -295,8 +997,7 @@ class ParallelTranslator:
         Returns:
             评审数据，如果不存在则返回None
         """
-        with self.lock:
-            return self.pending_reviews.get(entry_id)
+        return self.pending_reviews.get(entry_id)
 
     def remove_pending_review(self, entry_id: str) -> None:
         """
@@ -305,9 +1006,7 @@ class ParallelTranslator:
         Args:
             entry_id: 条目ID
         """
-        with self.lock:
-            if entry_id in self.pending_reviews:
-                del self.pending_reviews[entry_id]
+        self.pending_reviews.pop(entry_id, None)
 
     def get_statistics(self) -> Dict[str, Any]:
         """
@@ -317,24 +1016,20 @@ class ParallelTranslator:
             统计信息字典
         """
         with self.lock:
-            translator_stats = {}
-            for translator_id, translator in self.translators.items():
-                translator_stats[translator_id] = translator.get_statistics()
-            
             return {
-                "active_workers": len([w for w in self.workers if w.is_alive()]),
+                "active_workers": len([w for w in self.workers if not w.done()]),
                 "total_workers": len(self.workers),
+                "concurrency_limit": self.concurrency.limit if self.concurrency else 0,
                 "queue_size": self.get_queue_size(),
                 "pending_reviews": len(self.pending_reviews),
                 "api_key_stats": self.api_key_manager.get_key_performance_summary(),
-                "translator_stats": translator_stats
+                "translator_stats": self.translator.get_statistics()
             }
 
     def reset_statistics(self) -> None:
         """重置所有统计信息"""
         with self.lock:
-            for translator in self.translators.values():
-                translator.reset_statistics()
+            self.translator.reset_statistics()
             self.pending_reviews.clear()
 
     def handle_review_result(self, key_name: str, review_result: dict) -> None:
@@ -362,7 +1057,9 @@ class ParallelTranslator:
         target_lang: str,
         game_style: str,
         model_name: str,
-        progress_callback: Optional[Callable[[int, int], None]] = None
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        request_delay: Optional[float] = None,
+        translation_cache: Optional[TranslationCache] = None
     ) -> bool:
         """
         翻译文件列表（高级接口）
@@ -373,6 +1070,9 @@ class ParallelTranslator:
             target_lang: 目标语言
             game_style: 游戏风格
             model_name: 模型名称
+            progress_callback: 进度回调函数
+            request_delay: 每个API密钥两次请求之间的间隔（秒），为None时使用配置值
+            translation_cache: 翻译缓存，为None或关闭翻译记忆时不使用缓存
 
         Returns:
             是否成功完成翻译
@@ -384,6 +1084,9 @@ class ParallelTranslator:
         workflow = TranslationWorkflow(self.app_ref, self.config_manager)
         if progress_callback:
             workflow.set_progress_callback(progress_callback)
+        workflow.parallel_translator.api_key_manager.set_request_delay(request_delay)
+        if translation_cache is not None and workflow.use_translation_memory:
+            workflow.parallel_translator.set_translation_cache(translation_cache)
 
         # 执行翻译
         return workflow.execute_translation(
@@ -6,12 +6,16 @@
 
 import os
 import threading
+import time
+from contextlib import closing
 from typing import List, Dict, Optional, Callable, Any, Tuple
 
 from config.config_manager import ConfigManager
+from config.constants import TASK_SUBMIT_BATCH_SIZE
 from parsers.yml_parser import YMLParser
 from utils.file_utils import FileProcessor
 from utils.translation_memory import TranslationMemory
+from utils.validation import extract_placeholders
 from .parallel_translator import ParallelTranslator
 
 
@@ -162,7 +166,7 @@ class TranslationWorkflow:
 
             if self.use_translation_memory:
                 for res in translation_results.values():
-                    if res.get('translated_text'):
+                    if res.get('api_error_type') is None and res.get('translated_text'):
                         self.translation_memory.add(
                             res['original_text'],
                             res['translated_text'],
@@ -203,62 +207,138 @@ class TranslationWorkflow:
         """添加翻译任务"""
         total_entries = 0
         self.cached_results: Dict[str, Dict] = {}
+        # 攒够一批再提交，减少逐个入队时的加锁次数
+        pending_tasks: List[Dict[str, Any]] = []
+        submit_stopped = False
+        task_fields = {
+            "source_lang": source_lang,
+            "target_lang": target_lang,
+            "game_mod_style": game_style,
+            "model_name": model_name,
+        }
         
-        for file_path in file_paths:
-            if self.stop_flag.is_set():
-                break
-                
-            try:
-                detected_lang, entries = self.yml_parser.load_file(file_path)
+        # 文件在后台按输入顺序预读，读到一个文件即开始入队；停止后不再读取后续文件
+        with closing(self.yml_parser.iter_load_files(file_paths, stop_event=self.stop_flag)) as loaded_files:
+            for file_path, (detected_lang, entries) in zip(file_paths, loaded_files):
+                if self.stop_flag.is_set() or submit_stopped:
+                    break
                 if detected_lang != source_lang:
                     continue
                 
-                for entry in entries:
-                    if not entry['value'].strip():
-                        continue
-
-                    entry_id = f"{file_path}:{entry['key']}"
-                    cached_text = None
-                    if self.use_translation_memory:
-                        cached_text = self.translation_memory.get(
-                            entry['value'], source_lang, target_lang
-                        )
-                    if cached_text:
-                        self.cached_results[entry_id] = {
-                            'entry_id': entry_id,
-                            'original_text': entry['value'],
-                            'translated_text': cached_text,
-                            'token_count': 0,
-                            'api_error_type': None,
-                            'original_line_content': entry.get('original_line_content'),
-                            'source_lang': source_lang
-                        }
-                        self.app_ref.log_message(
-                            f"缓存命中: {entry['key']} -> {cached_text[:30]}...",
-                            "debug"
-                        )
-                    else:
-                        self.parallel_translator.add_translation_task(
-                            entry_id=entry_id,
-                            text=entry['value'],
-                            source_lang=source_lang,
-                            target_lang=target_lang,
-                            game_mod_style=game_style,
-                            model_name=model_name,
-                            original_line_content=entry.get('original_line_content')
-                        )
-                    total_entries += 1
-                
-                self.app_ref.log_message(
-                    f"已添加文件 {os.path.basename(file_path)} 的 {len(entries)} 个翻译任务", 
-                    "info"
-                )
-                
-            except Exception as e:
-                self.app_ref.log_message(f"处理文件 {file_path} 时出错: {e}", "error")
-                continue
+                try:
+                    accepted, submit_stopped = self._queue_file_entries(
+                        file_path, entries, task_fields, pending_tasks
+                    )
+                    total_entries += accepted
+                    self.app_ref.log_message(
+                        f"已添加文件 {os.path.basename(file_path)} 的 {len(entries)} 个翻译任务", 
+                        "info"
+                    )
+                    
+                except Exception as e:
+                    self.app_ref.log_message(f"处理文件 {file_path} 时出错: {e}", "error")
+                    continue
+
+        if pending_tasks and not submit_stopped and not self.stop_flag.is_set():
+            total_entries += self._flush_pending_tasks(pending_tasks)[0]
         
         return total_entries
+
+    def _queue_file_entries(
+        self,
+        file_path: str,
+        entries: List[Dict[str, str]],
+        task_fields: Dict[str, str],
+        pending_tasks: List[Dict[str, Any]]
+    ) -> Tuple[int, bool]:
+        """
+        将一个文件的条目加入待提交列表，攒满一批时提交
+
+        Args:
+            file_path: 文件路径
+            entries: 文件中解析出的条目
+            task_fields: 所有任务共用的语言、风格和模型字段
+            pending_tasks: 待提交的任务列表
+
+        Returns:
+            (命中翻译记忆的条目数加本次提交被接受的任务数, 是否因工作线程停止而中止) 的元组
+        """
+        total_accepted = 0
+        for entry in entries:
+            if not entry['value'].strip():
+                continue
+
+            entry_id = f"{file_path}:{entry['key']}"
+            if self._use_memory_result(
+                entry_id, entry, task_fields["source_lang"], task_fields["target_lang"]
+            ):
+                total_accepted += 1
+                continue
+
+            pending_tasks.append({
+                "entry_id": entry_id,
+                "text": entry['value'],
+                **task_fields,
+                "original_line_content": entry.get('original_line_content')
+            })
+            if len(pending_tasks) >= TASK_SUBMIT_BATCH_SIZE:
+                accepted, stopped = self._flush_pending_tasks(pending_tasks)
+                total_accepted += accepted
+                if stopped:
+                    # 等待缓冲区时工作线程已停止
+                    return total_accepted, True
+        return total_accepted, False
+
+    def _use_memory_result(
+        self, entry_id: str, entry: Dict[str, Any], source_lang: str, target_lang: str
+    ) -> bool:
+        """
+        查询翻译记忆，命中时直接记为翻译结果
+
+        Args:
+            entry_id: 条目ID
+            entry: 解析出的条目
+            source_lang: 源语言
+            target_lang: 目标语言
+
+        Returns:
+            是否命中翻译记忆
+        """
+        if not self.use_translation_memory:
+            return False
+        cached_text = self.translation_memory.get(entry['value'], source_lang, target_lang)
+        if not cached_text:
+            return False
+
+        self.cached_results[entry_id] = {
+            'entry_id': entry_id,
+            'original_text': entry['value'],
+            'translated_text': cached_text,
+            'token_count': 0,
+            'api_error_type': None,
+            'original_line_content': entry.get('original_line_content'),
+            'source_lang': source_lang
+        }
+        self.app_ref.log_message(
+            f"缓存命中: {entry['key']} -> {cached_text[:30]}...",
+            "debug"
+        )
+        return True
+
+    def _flush_pending_tasks(self, pending_tasks: List[Dict[str, Any]]) -> Tuple[int, bool]:
+        """
+        批量提交攒下的翻译任务并清空列表
+
+        Args:
+            pending_tasks: 待提交的任务列表
+
+        Returns:
+            (被接受的任务数, 是否因工作线程停止而未全部接受) 的元组
+        """
+        accepted = self.parallel_translator.add_translation_tasks(pending_tasks)
+        stopped = accepted < len(pending_tasks)
+        pending_tasks.clear()
+        return accepted, stopped
     
     def _collect_translation_results(self, total_entries: int, initial_results: Optional[Dict[str, Dict]] = None) -> Dict[str, Dict]:
         """收集翻译结果"""
@@ -330,7 +410,6 @@ class TranslationWorkflow:
             key_name = entry_id.split(':')[-1] if ':' in entry_id else entry_id
 
             # 检查是否启用自动应用功能
-            from utils.validation import extract_placeholders
             auto_apply_when_placeholders_match = self.app_ref.config_manager.get_setting("auto_apply_when_placeholders_match", True)
 
             if auto_apply_when_placeholders_match:
@@ -394,7 +473,6 @@ class TranslationWorkflow:
             self.app_ref.log_message(f"找到 {len(review_candidates)} 个需要评审的翻译", "info")
 
             # 检查是否启用自动应用功能
-            from utils.validation import extract_placeholders
             auto_apply_when_placeholders_match = self.app_ref.config_manager.get_setting("auto_apply_when_placeholders_match", True)
 
             # 分离需要人工评审和可以自动应用的翻译
@@ -461,7 +539,6 @@ class TranslationWorkflow:
 
                 # 等待评审完成（简单的等待机制）
                 # 在实际应用中，可能需要更复杂的同步机制
-                import time
                 time.sleep(0.1)  # 给UI时间处理评审对话框
 
             self.app_ref.log_message("延迟评审完成", "info")
@@ -10,6 +10,11 @@ import ttkbootstrap as ttkb
 from ttkbootstrap.constants import BOTH, LEFT, RIGHT, W, X
 from typing import Set, Optional, Callable, Any
 
+try:
+    from ttkbootstrap.tooltip import ToolTip
+except ImportError:  # 旧版ttkbootstrap没有tooltip模块
+    ToolTip = None
+
 
 class ReviewDialog(tk.Toplevel):
     """翻译评审对话框"""
@@ -23,10 +28,15 @@ class ReviewDialog(tk.Toplevel):
         original_placeholders: Set[str], 
         translated_placeholders: Set[str], 
         key_name: str, 
-        completion_callback: Optional[Callable] = None
+        completion_callback: Optional[Callable] = None,
+        missing_in_ai: Optional[Set[str]] = None,
+        added_in_ai: Optional[Set[str]] = None
     ):
         """
         初始化评审对话框
+
+        控件只在此处创建一次；对话框关闭时隐藏而不销毁，
+        之后的评审通过reset更新内容后再次显示。
         
         Args:
             parent_app_instance: 父应用程序实例
@@ -37,6 +47,8 @@ class ReviewDialog(tk.Toplevel):
             translated_placeholders: 翻译占位符集合
             key_name: 键名
             completion_callback: 完成回调函数
+            missing_in_ai: 原文中有但翻译中缺失的占位符，为None时根据两个集合计算
+            added_in_ai: 翻译中多出的占位符，为None时根据两个集合计算
         """
         super().__init__(root_window)
         
@@ -45,17 +57,17 @@ class ReviewDialog(tk.Toplevel):
         
         # 设置窗口属性
         self.transient(root_window)
-        self.grab_set()
         self.app = parent_app_instance 
         self.original_text_arg = original_text 
-        self.result: Optional[str] = None 
+        self.ai_translation_arg = ai_translation
+        self.result: Optional[dict] = None 
         self.key_name_arg = key_name
         self.completion_callback = completion_callback
+        self.active = False  # 是否正在显示一条评审
 
         # 调整窗口属性
         self.protocol("WM_DELETE_WINDOW", self._on_cancel)
         self.app.log_message(f"ReviewDialog initializing for key: {key_name}", "debug")
-        self.title(f"评审翻译: {key_name}")
         
         # 设置图标图像(如果有)
         try:
@@ -71,23 +83,83 @@ class ReviewDialog(tk.Toplevel):
             self.style.configure('ReviewDialog.TButton', font=('Default', 10))
         
         # 创建UI
-        self._create_ui(original_text, ai_translation, original_placeholders, translated_placeholders, key_name)
+        self._create_ui()
         
-        # 设置窗口位置和大小
+        # 设置窗口位置和大小（之后复用时保留用户调整过的位置和大小）
         self._setup_window_geometry()
         
-        # 显示窗口
-        self._show_window()
+        # 填充内容并显示窗口
+        self.reset(
+            original_text, ai_translation, original_placeholders,
+            translated_placeholders, key_name, completion_callback,
+            missing_in_ai, added_in_ai
+        )
 
-    def _create_ui(
-        self, 
-        original_text: str, 
-        ai_translation: str, 
-        original_placeholders: Set[str], 
-        translated_placeholders: Set[str], 
-        key_name: str
+    def reset(
+        self,
+        original_text: str,
+        ai_translation: str,
+        original_placeholders: Set[str],
+        translated_placeholders: Set[str],
+        key_name: str,
+        completion_callback: Optional[Callable] = None,
+        missing_in_ai: Optional[Set[str]] = None,
+        added_in_ai: Optional[Set[str]] = None
     ) -> None:
-        """创建用户界面"""
+        """
+        用新的评审内容更新已创建的控件并显示对话框
+
+        Args:
+            original_text: 原文
+            ai_translation: AI翻译结果
+            original_placeholders: 原文占位符集合
+            translated_placeholders: 翻译占位符集合
+            key_name: 键名
+            completion_callback: 完成回调函数
+            missing_in_ai: 原文中有但翻译中缺失的占位符，为None时根据两个集合计算
+            added_in_ai: 翻译中多出的占位符，为None时根据两个集合计算
+        """
+        self.original_text_arg = original_text
+        self.ai_translation_arg = ai_translation
+        self.key_name_arg = key_name
+        self.completion_callback = completion_callback
+        self.result = None
+
+        self.title(f"评审翻译: {key_name}")
+        self.key_label.configure(text=f"Key: {key_name}")
+
+        self._set_text(self.original_text_widget, original_text)
+        self._set_text(self.ai_translation_widget, ai_translation if ai_translation else "AI translation was empty.")
+        self._set_text(self.edited_text_widget, ai_translation if ai_translation else "", readonly=False)
+        self.edited_text_widget.edit_reset()
+
+        self._update_placeholder_analysis(
+            original_placeholders, translated_placeholders, missing_in_ai, added_in_ai
+        )
+
+        self._show_window()
+        # 对话框会被复用，上次显示时可能被拖出屏幕或调整得过大
+        self.update_idletasks()
+        self.ensure_on_screen()
+
+    @staticmethod
+    def _set_text(widget: scrolledtext.ScrolledText, text: str, readonly: bool = True) -> None:
+        """
+        替换文本控件的内容
+
+        Args:
+            widget: 文本控件
+            text: 新内容
+            readonly: 替换后是否设为只读
+        """
+        widget.configure(state='normal')
+        widget.delete('1.0', tk.END)
+        widget.insert('1.0', text)
+        if readonly:
+            widget.configure(state='disabled')
+
+    def _create_ui(self) -> None:
+        """创建用户界面（不含评审内容）"""
         # 创建清晰分明的卡片式布局
         main_container = ttk.Frame(self, padding=15)
         main_container.pack(expand=True, fill=tk.BOTH)
@@ -97,24 +169,24 @@ class ReviewDialog(tk.Toplevel):
         self.minsize(700, 600)
         
         # 顶部标题区域
-        self._create_header(main_container, key_name)
+        self._create_header(main_container)
         
         # 原文卡片
-        self._create_original_text_card(main_container, original_text)
+        self._create_original_text_card(main_container)
         
         # AI翻译卡片
-        self._create_ai_translation_card(main_container, ai_translation)
+        self._create_ai_translation_card(main_container)
         
         # 编辑区卡片
-        self._create_edit_card(main_container, ai_translation)
+        self._create_edit_card(main_container)
         
         # 占位符分析区
-        self._create_placeholder_analysis_card(main_container, original_placeholders, translated_placeholders)
+        self._create_placeholder_analysis_card(main_container)
         
         # 底部按钮区域
         self._create_button_area(main_container)
 
-    def _create_header(self, parent: ttk.Frame, key_name: str) -> None:
+    def _create_header(self, parent: ttk.Frame) -> None:
         """创建头部区域"""
         header_frame = ttk.Frame(parent)
         header_frame.pack(fill=tk.X, pady=(0, 15))
@@ -125,13 +197,13 @@ class ReviewDialog(tk.Toplevel):
             font=('Default', 14, 'bold')
         ).pack(side=tk.LEFT)
         
-        ttk.Label(
+        self.key_label = ttk.Label(
             header_frame, 
-            text=f"Key: {key_name}", 
             font=('Default', 10)
-        ).pack(side=tk.RIGHT)
+        )
+        self.key_label.pack(side=tk.RIGHT)
 
-    def _create_original_text_card(self, parent: ttk.Frame, original_text: str) -> None:
+    def _create_original_text_card(self, parent: ttk.Frame) -> None:
         """创建原文卡片"""
         original_card = ttk.Frame(parent, relief="solid", borderwidth=1)
         original_card.pack(fill=tk.X, pady=(0, 15), padx=2)
@@ -149,18 +221,17 @@ class ReviewDialog(tk.Toplevel):
         original_content = ttk.Frame(original_card, padding=(10, 5, 10, 10))
         original_content.pack(fill=tk.X)
         
-        original_text_widget = scrolledtext.ScrolledText(
+        self.original_text_widget = scrolledtext.ScrolledText(
             original_content, 
             height=6, 
             wrap=tk.WORD, 
             relief="flat",
+            undo=False,
             font=('Default', 10)
         )
-        original_text_widget.insert(tk.END, original_text)
-        original_text_widget.configure(state='disabled')
-        original_text_widget.pack(fill=X)
+        self.original_text_widget.pack(fill=X)
 
-    def _create_ai_translation_card(self, parent: ttk.Frame, ai_translation: str) -> None:
+    def _create_ai_translation_card(self, parent: ttk.Frame) -> None:
         """创建AI翻译卡片"""
         ai_card = ttk.Frame(parent, relief="solid", borderwidth=1)
         ai_card.pack(fill=X, pady=(0, 15), padx=2)
@@ -178,18 +249,17 @@ class ReviewDialog(tk.Toplevel):
         ai_content = ttk.Frame(ai_card, padding=(10, 5, 10, 10))
         ai_content.pack(fill=X)
         
-        ai_translation_widget = scrolledtext.ScrolledText(
+        self.ai_translation_widget = scrolledtext.ScrolledText(
             ai_content, 
             height=6, 
             wrap=tk.WORD, 
             relief="flat",
+            undo=False,
             font=('Default', 10)
         )
-        ai_translation_widget.insert(tk.END, ai_translation if ai_translation else "AI translation was empty.")
-        ai_translation_widget.configure(state='disabled')
-        ai_translation_widget.pack(fill=X)
+        self.ai_translation_widget.pack(fill=X)
 
-    def _create_edit_card(self, parent: ttk.Frame, ai_translation: str) -> None:
+    def _create_edit_card(self, parent: ttk.Frame) -> None:
         """创建编辑区卡片"""
         edit_card = ttk.Frame(parent, relief="solid", borderwidth=1)
         edit_card.pack(fill=BOTH, expand=True, pady=(0, 15), padx=2)
@@ -214,39 +284,21 @@ class ReviewDialog(tk.Toplevel):
             relief="flat",
             font=('Default', 10)
         )
-        self.edited_text_widget.insert(tk.END, ai_translation if ai_translation else "")
         self.edited_text_widget.pack(fill=BOTH, expand=True)
 
-    def _create_placeholder_analysis_card(
-        self,
-        parent: ttk.Frame,
-        original_placeholders: Set[str],
-        translated_placeholders: Set[str]
-    ) -> None:
+    def _create_placeholder_analysis_card(self, parent: ttk.Frame) -> None:
         """创建占位符分析卡片"""
         ph_card = ttk.Frame(parent, relief="solid", borderwidth=1)
         ph_card.pack(fill=X, pady=(0, 15), padx=2)
 
-        # 设置标题文本和颜色
-        ph_title = "📊 占位符分析"
-        ph_color = "#333333"
-
-        # 检查占位符问题
-        missing_in_ai = original_placeholders - translated_placeholders
-        added_in_ai = translated_placeholders - original_placeholders
-        if missing_in_ai or added_in_ai:
-            ph_title = "⚠️ 检测到占位符问题!"
-            ph_color = "#cc6600"
-
         ph_header = ttk.Frame(ph_card, padding=(10, 5))
         ph_header.pack(fill=X)
 
-        ttk.Label(
+        self.ph_title_label = ttk.Label(
             ph_header,
-            text=ph_title,
-            font=('Default', 11, 'bold'),
-            foreground=ph_color
-        ).pack(anchor=W)
+            font=('Default', 11, 'bold')
+        )
+        self.ph_title_label.pack(anchor=W)
 
         ph_content = ttk.Frame(ph_card, padding=(10, 5, 10, 10))
         ph_content.pack(fill=X)
@@ -257,37 +309,73 @@ class ReviewDialog(tk.Toplevel):
         ph_columns.columnconfigure(1, weight=1)
 
         # 原文占位符区域
-        self._create_placeholder_section(
+        self.original_ph_widget = self._create_placeholder_section(
             ph_columns,
             "原文占位符:",
-            original_placeholders,
             0, 0,
             (0, 5)
         )
 
         # AI翻译占位符区域
-        self._create_placeholder_section(
+        self.ai_ph_widget = self._create_placeholder_section(
             ph_columns,
             "AI翻译占位符:",
-            translated_placeholders,
             0, 1,
             (5, 0)
         )
 
-        # 占位符问题详细信息
+        # 占位符问题详细信息，仅在存在差异时显示
+        self._create_placeholder_diff_info(ph_content)
+
+    def _update_placeholder_analysis(
+        self,
+        original_placeholders: Set[str],
+        translated_placeholders: Set[str],
+        missing_in_ai: Optional[Set[str]] = None,
+        added_in_ai: Optional[Set[str]] = None
+    ) -> None:
+        """
+        按本次评审的占位符更新分析卡片
+
+        Args:
+            original_placeholders: 原文占位符集合
+            translated_placeholders: 翻译占位符集合
+            missing_in_ai: 翻译中缺失的占位符，为None时计算
+            added_in_ai: 翻译中多出的占位符，为None时计算
+        """
+        # 检查占位符问题（调用方已计算差集时直接使用）
+        if missing_in_ai is None:
+            missing_in_ai = original_placeholders - translated_placeholders
+        if added_in_ai is None:
+            added_in_ai = translated_placeholders - original_placeholders
+        if missing_in_ai or added_in_ai:
+            self.ph_title_label.configure(text="⚠️ 检测到占位符问题!", foreground="#cc6600")
+        else:
+            self.ph_title_label.configure(text="📊 占位符分析", foreground="#333333")
+
+        self._set_text(self.original_ph_widget, self.app.format_placeholders(original_placeholders))
+        self._set_text(self.ai_ph_widget, self.app.format_placeholders(translated_placeholders))
+
         if missing_in_ai or added_in_ai:
-            self._create_placeholder_diff_info(ph_content, missing_in_ai, added_in_ai)
+            diff_report = []
+            if missing_in_ai:
+                diff_report.append(f"⚠️ AI翻译中缺失: {', '.join(sorted(list(missing_in_ai)))}")
+            if added_in_ai:
+                diff_report.append(f"⚠️ AI翻译中多出: {', '.join(sorted(list(added_in_ai)))}")
+            self.diff_label.configure(text="详细信息: " + "; ".join(diff_report))
+            self.diff_frame.pack(fill=X, pady=(5, 0))
+        else:
+            self.diff_frame.pack_forget()
 
     def _create_placeholder_section(
         self,
         parent: ttk.Frame,
         title: str,
-        placeholders: Set[str],
         row: int,
         column: int,
         padx: tuple
-    ) -> None:
-        """创建占位符显示区域"""
+    ) -> scrolledtext.ScrolledText:
+        """创建占位符显示区域，返回显示占位符的文本控件"""
         frame = ttk.Frame(parent)
         frame.grid(row=row, column=column, sticky="nsew", padx=padx)
 
@@ -303,36 +391,23 @@ class ReviewDialog(tk.Toplevel):
             wrap=tk.WORD,
             relief="flat",
             borderwidth=1,
+            undo=False,
             font=('Consolas', 9)
         )
-        scrolled_text.insert(tk.END, "\n".join(sorted(list(placeholders))) if placeholders else "无")
-        scrolled_text.configure(state='disabled')
         scrolled_text.pack(fill=X)
+        return scrolled_text
 
-    def _create_placeholder_diff_info(
-        self,
-        parent: ttk.Frame,
-        missing_in_ai: Set[str],
-        added_in_ai: Set[str]
-    ) -> None:
-        """创建占位符差异信息"""
-        diff_frame = ttk.Frame(parent)
-        diff_frame.pack(fill=X, pady=(5, 0))
-
-        diff_report = []
-        if missing_in_ai:
-            diff_report.append(f"⚠️ AI翻译中缺失: {', '.join(sorted(list(missing_in_ai)))}")
-        if added_in_ai:
-            diff_report.append(f"⚠️ AI翻译中多出: {', '.join(sorted(list(added_in_ai)))}")
-
-        diff_label = ttk.Label(
-            diff_frame,
-            text="详细信息: " + "; ".join(diff_report),
+    def _create_placeholder_diff_info(self, parent: ttk.Frame) -> None:
+        """创建占位符差异信息（初始不显示）"""
+        self.diff_frame = ttk.Frame(parent)
+
+        self.diff_label = ttk.Label(
+            self.diff_frame,
             foreground="#cc0000",
             wraplength=750,
             font=('Default', 9)
         )
-        diff_label.pack(anchor=W)
+        self.diff_label.pack(anchor=W)
 
     def _create_button_area(self, parent: ttk.Frame) -> None:
         """创建按钮区域"""
@@ -358,8 +433,8 @@ class ReviewDialog(tk.Toplevel):
         self.bind("<Escape>", lambda e: self._on_cancel())
         self.bind("<Return>", lambda e: self._on_confirm())
 
-        # 添加按钮工具提示
-        self._add_tooltips()
+        # 工具提示不影响首次显示，空闲时再添加
+        self.after_idle(self._add_tooltips)
 
     def _create_buttons(self, parent: ttk.Frame) -> None:
         """创建按钮"""
@@ -406,41 +481,40 @@ class ReviewDialog(tk.Toplevel):
 
     def _add_tooltips(self) -> None:
         """添加按钮工具提示"""
+        if ToolTip is None:
+            return
         try:
-            from ttkbootstrap.tooltip import ToolTip
             ToolTip(self.confirm_button, text="保存您的编辑并继续下一个翻译", delay=500)
             ToolTip(self.skip_button, text="直接使用AI翻译结果", delay=500)
             ToolTip(self.use_original_button, text="保留原文不翻译", delay=500)
             ToolTip(self.cancel_button, text="取消评审", delay=500)
-        except (ImportError, AttributeError):
+        except (AttributeError, tk.TclError):
+            # 旧版ToolTip接口不兼容，或对话框在空闲回调前已被销毁
             pass
 
     def _setup_window_geometry(self) -> None:
-        """设置窗口几何属性"""
+        """
+        设置窗口几何属性
+
+        尺寸和位置只依赖屏幕大小（查询显示器，无需等待控件布局），
+        因此一次算出并只调用一次geometry，窗口映射时Tk再统一布局。
+        """
         # 获取屏幕尺寸
         screen_width = self.winfo_screenwidth()
         screen_height = self.winfo_screenheight()
 
-        # 设置更合理的初始大小（根据屏幕大小调整）
+        # 设置更合理的初始大小（根据屏幕大小调整）；不超过屏幕的75%，
+        # 居中后必然完全在屏幕内，无需再按实际窗口尺寸检查
         dialog_width = min(1024, int(screen_width * 0.75))
         dialog_height = min(800, int(screen_height * 0.75))
 
-        # 设置窗口大小
-        self.geometry(f"{dialog_width}x{dialog_height}")
-
-        # 更新窗口，确保所有UI元素都准备好了
-        self.update_idletasks()
-
         # 居中显示窗口
         x = (screen_width - dialog_width) // 2
         y = (screen_height - dialog_height) // 2
         self.geometry(f"{dialog_width}x{dialog_height}+{x}+{y}")
 
-        # 确保窗口在屏幕内
-        self.ensure_on_screen()
-
     def ensure_on_screen(self) -> None:
-        """确保窗口完全在屏幕内"""
+        """确保窗口完全在屏幕内（每次reset显示后复查窗口的位置和大小）"""
         screen_width = self.winfo_screenwidth()
         screen_height = self.winfo_screenheight()
 
@@ -473,12 +547,11 @@ class ReviewDialog(tk.Toplevel):
 
     def _show_window(self) -> None:
         """显示窗口"""
-        # 在显示窗口之前再次更新以确保所有计算完成
-        self.update_idletasks()
-
-        # 显示窗口
+        # 显示窗口，窗口可见后才能设置模态抓取
+        self.active = True
         self.deiconify()
         self.lift()
+        self.grab_set()
         self.focus_force()
         self.edited_text_widget.focus_set()
         self.app.log_message(f"ReviewDialog for key '{self.key_name_arg}' displayed.", "debug")
@@ -491,9 +564,7 @@ class ReviewDialog(tk.Toplevel):
             "translation": edited_text
         }
         self.app.log_message(f"ReviewDialog: Confirmed text for key '{self.key_name_arg}'", "debug")
-        if self.completion_callback:
-            self.completion_callback(self.key_name_arg, self.result)
-        self.destroy()
+        self._finish()
 
     def _on_use_original(self) -> None:
         """使用原文按钮回调"""
@@ -502,9 +573,7 @@ class ReviewDialog(tk.Toplevel):
             "translation": self.original_text_arg
         }
         self.app.log_message(f"ReviewDialog: Using original text for key '{self.key_name_arg}'", "debug")
-        if self.completion_callback:
-            self.completion_callback(self.key_name_arg, self.result)
-        self.destroy()
+        self._finish()
 
     def _on_skip_with_ai_text(self) -> None:
         """使用AI翻译按钮回调"""
@@ -514,9 +583,7 @@ class ReviewDialog(tk.Toplevel):
             "translation": ai_text
         }
         self.app.log_message(f"ReviewDialog: Using AI text for key '{self.key_name_arg}'", "debug")
-        if self.completion_callback:
-            self.completion_callback(self.key_name_arg, self.result)
-        self.destroy()
+        self._finish()
 
     def _on_cancel(self) -> None:
         """取消按钮回调"""
@@ -525,6 +592,18 @@ class ReviewDialog(tk.Toplevel):
             "translation": None
         }
         self.app.log_message(f"ReviewDialog: Cancelled for key '{self.key_name_arg}'", "debug")
-        if self.completion_callback:
-            self.completion_callback(self.key_name_arg, self.result)
-        self.destroy()
+        self._finish()
+
+    def _finish(self) -> None:
+        """
+        隐藏对话框以供下次评审复用，然后通知调用方
+
+        先隐藏再回调，回调中发起的下一次评审可以直接复用本对话框。
+        """
+        callback = self.completion_callback
+        self.completion_callback = None
+        self.active = False
+        self.grab_release()
+        self.withdraw()
+        if callback:
+            callback(self.key_name_arg, self.result)
@@ -7,15 +7,24 @@ Paradox Mod Translator - 主程序
 """
 
 import tkinter as tk
-from tkinter import ttk, scrolledtext, filedialog, messagebox
+from tkinter import ttk, scrolledtext, filedialog, messagebox, simpledialog
 import ttkbootstrap as ttkb
 from ttkbootstrap.constants import BOTH, LEFT, RIGHT, X, Y
+import difflib
+import functools
+import itertools
 import threading
 import time
 import os
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 
 # 导入重构后的模块
-from config.constants import CONFIG_FILE
+from config.constants import (
+    CONFIG_FILE, CONFIG_WRITE_DEBOUNCE_MS, LOG_BUFFER_SIZE, LOG_FLUSH_INTERVAL_MS, LOG_MAX_LINES,
+    MAX_REVIEW_RESULTS, PLACEHOLDER_TEXT_CACHE_SIZE, PREVIEW_PAGE_SIZE, PROGRESS_FLUSH_INTERVAL_MS,
+    SCAN_MAX_WORKERS, SUPPORTED_LANGUAGES, TRANSLATION_CACHE_FILE
+)
 from config.config_manager import ConfigManager
 from parsers.yml_parser import YMLParser
 from core.api_key_manager import APIKeyManager
@@ -23,22 +32,106 @@ from core.parallel_translator import ParallelTranslator
 from core.model_manager import ModelManager
 
 from utils.logging_utils import ApplicationLogger
-from utils.file_utils import FileProcessor
+from utils.file_utils import FileProcessor, make_relpath
+from utils.translation_cache import TranslationCache
 from utils.validation import extract_placeholders
 
 from gui.review_dialog import ReviewDialog
 
+# 评审动作 -> (日志标签, 日志级别)
+_REVIEW_ACTION_LABELS = {
+    "confirm": ("评审确认", "info"),
+    "use_ai": ("使用AI翻译", "info"),
+    "use_original": ("使用原文", "info"),
+    "cancel": ("评审取消", "warn"),
+}
+
+# 预设翻译风格: (按钮名称, 风格提示)
+_STYLE_PRESETS = (
+    ("通用游戏", "General video game localization, maintain tone of original."),
+    ("策略游戏", "Strategy game localization, formal and precise tone."),
+    ("角色扮演", "RPG localization, immersive and narrative style."),
+    ("历史题材", "Historical game localization, period-appropriate language."),
+)
+
+
+@functools.lru_cache(maxsize=128)
+def _mask_api_key(key):
+    """只显示密钥的前4位和后4位"""
+    return f"{key[:4]}...{key[-4:]}" if len(key) > 8 else key
+
+
+def _sync_listbox(listbox, old_rows, new_rows):
+    """
+    按差异更新Listbox，只删除和插入发生变化的行
+
+    Args:
+        listbox: 要更新的Listbox
+        old_rows: 当前显示的行
+        new_rows: 新的行
+    """
+    opcodes = difflib.SequenceMatcher(a=old_rows, b=new_rows, autojunk=False).get_opcodes()
+    # 从后往前应用，保证前面的索引不受影响
+    for tag, i1, i2, j1, j2 in reversed(opcodes):
+        if tag == 'equal':
+            continue
+        if i2 > i1:
+            listbox.delete(i1, i2 - 1)
+        if j2 > j1:
+            listbox.insert(i1, *new_rows[j1:j2])
+
 
 class ModTranslatorApp:
     """Paradox Mod翻译器主应用程序"""
-    
+
+    # 固定实例属性布局，省去实例__dict__；新增属性时需同步添加到此处
+    __slots__ = (
+        # 服务对象
+        'config_manager', 'logger', 'yml_parser', 'file_processor', 'api_key_manager',
+        'model_manager', 'translation_cache', 'parallel_translator', '_executor', '_executor_workers',
+        # 待写入的设置项
+        '_pending_cfg_writes', '_flush_cfg_job',
+        # 待显示的日志行
+        'log_buffer', '_flush_log_job',
+        # 主窗口与样式
+        'root', 'style',
+        # Tk变量
+        'localization_root_path', 'source_language_code', 'target_language_code',
+        'game_mod_style_prompt', 'selected_model_var', 'api_key_var', 'api_call_delay_var',
+        'max_concurrent_tasks_var', 'auto_review_mode_var', 'delayed_review_var',
+        'auto_apply_when_placeholders_match_var',
+        # 翻译状态
+        'stop_translation_flag', 'translation_in_progress', 'current_progress',
+        'overall_total_keys', '_pending_progress', '_shown_progress', '_flush_progress_job',
+        # 文件与评审状态
+        'files_for_translation', 'pending_reviews', '_scan_generation', '_api_keys_version',
+        '_api_key_rows', '_preview_widgets', '_analysis_widgets',
+        'review_results', 'review_queue', 'review_dialog', '_ph_sort_cache',
+        # 控件
+        'theme_button', 'progress_bar', 'status_label', 'files_listbox',
+        'preview_structure_button', 'analyze_structure_button', 'translate_button',
+        'stop_button', 'log_text', 'source_language_combo', 'target_language_combo',
+        'path_entry', 'browse_button', 'style_text', 'api_keys_listbox', 'add_key_button',
+        'edit_key_button', 'remove_key_button', 'model_combo', 'refresh_models_button',
+        'model_status_label', 'tasks_spinbox', 'delay_spinbox', 'auto_review_check',
+        'delayed_review_check', 'auto_apply_placeholders_check',
+        # 缓存
+        '_model_keys_tuple', '_lang_info_cache', '_lang_info_lock',
+    )
+
+    # 语言下拉框选项（不可变，供两个下拉框共享）
+    _LANG_KEYS = tuple(SUPPORTED_LANGUAGES)
+
     def __init__(self):
         """初始化应用程序"""
         # 初始化配置管理器
         self.config_manager = ConfigManager(CONFIG_FILE)
 
         # 初始化日志系统
-        self.logger = ApplicationLogger()
+        self.logger = ApplicationLogger(
+            level=self.config_manager.get_setting("log_level", "debug")
+        )
+        self.config_manager.flush_error_callback = lambda message: self.log_message(message, "error")
 
         # 初始化解析器
         self.yml_parser = YMLParser(config_manager=self.config_manager)
@@ -52,8 +145,25 @@ class ModTranslatorApp:
         # 初始化模型管理器
         self.model_manager = ModelManager(self.config_manager, self)
 
+        # 初始化翻译缓存（与配置文件位于同一目录）
+        self.translation_cache = TranslationCache(
+            os.path.join(os.path.dirname(CONFIG_FILE), TRANSLATION_CACHE_FILE)
+        )
+
         # 初始化并行翻译器
         self.parallel_translator = ParallelTranslator(self, self.config_manager)
+        self.parallel_translator.set_translation_cache(self.translation_cache)
+
+        # 密钥列表上次刷新时的版本号及当前显示的行
+        self._api_keys_version = None
+        self._api_key_rows = []
+
+        # 复用的预览/分析窗口控件，首次打开时创建
+        self._preview_widgets = None
+        self._analysis_widgets = None
+
+        # 复用的评审对话框，首次评审时创建
+        self.review_dialog = None
 
         # 创建主窗口（必须在创建tkinter变量之前）
         self._create_main_window()
@@ -61,11 +171,14 @@ class ModTranslatorApp:
         # 初始化UI变量（必须在创建主窗口之后）
         self._init_ui_variables()
 
-        # 添加日志回调（在主窗口创建后）
+        # 添加日志回调（在主窗口创建后）；各线程的日志先进入缓冲区，由定时任务批量写入日志区域
+        self.log_buffer = deque(maxlen=LOG_BUFFER_SIZE)
+        self._flush_log_job = None
         self.logger.add_log_callback(self._on_log_message)
 
         # 创建UI
         self._create_ui()
+        self._flush_log_job = self.root.after(LOG_FLUSH_INTERVAL_MS, self._flush_log_buffer)
 
         # 初始化状态
         self._init_state()
@@ -73,6 +186,13 @@ class ModTranslatorApp:
         # 加载配置
         self._load_config()
 
+        # 创建持久的翻译任务线程池（仅在并发设置改变时重建）
+        self._executor = self._create_executor()
+
+        # 防抖写盘的设置项及其定时任务
+        self._pending_cfg_writes = {}
+        self._flush_cfg_job = None
+
         self.log_message("应用程序初始化完成", "info")
 
     def _init_ui_variables(self):
@@ -94,14 +214,25 @@ class ModTranslatorApp:
         self.translation_in_progress = False
         self.current_progress = 0
         self.overall_total_keys = 0
+        # 工作线程只记录最新进度(current, total)，翻译期间由定时任务合并写入进度条
+        self._pending_progress = None
+        self._shown_progress = None
+        self._flush_progress_job = None
         
         # 文件相关变量
         self.files_for_translation = []
         self.pending_reviews = {}
-
-        # 评审相关变量
-        self.review_results = {}
-        self.review_queue = []
+        self._scan_generation = 0  # 用于丢弃过期的后台扫描结果
+        self._model_keys_tuple = None  # 缓存的模型下拉框选项
+        self._lang_info_cache = {}  # 文件路径 -> (mtime_ns, size, 语言代码, 条目数)
+        self._lang_info_lock = threading.Lock()  # 扫描线程池与UI线程同时访问语言信息缓存
+
+        # 评审相关变量（按插入顺序淘汰最旧的结果，限制内存占用）
+        self.review_results = OrderedDict()
+        # 评审对话框正在显示时到达的评审，按顺序等待显示
+        self.review_queue = deque()
+        # 占位符集合 -> 排序后的显示文本，同一组占位符常在多个条目中重复出现
+        self._ph_sort_cache = OrderedDict()
 
     def _create_main_window(self):
         """创建主窗口"""
@@ -122,6 +253,9 @@ class ModTranslatorApp:
 
     def _create_ui(self):
         """创建用户界面"""
+        # 共享窗口的Style对象
+        self.style = self.root.style
+
         # 创建主框架
         main_frame = ttk.Frame(self.root, padding=10)
         main_frame.pack(fill=BOTH, expand=True)
@@ -318,6 +452,7 @@ class ModTranslatorApp:
             log_frame, 
             height=20, 
             wrap=tk.WORD,
+            undo=False,
             font=('Consolas', 9)
         )
         self.log_text.pack(fill=BOTH, expand=True)
@@ -379,12 +514,22 @@ class ModTranslatorApp:
             self.log_message(f"加载配置时发生错误: {e}", "error")
 
     def _toggle_theme(self):
-        """切换主题"""
-        current_theme = self.root.style.theme_use()
+        """
+        切换主题
+
+        切换主题会重新设置所有控件的样式，开销较大；切换期间禁用按钮，
+        连续点击排队的事件会在按钮恢复前被丢弃，不会重复切换。
+        """
+        self.theme_button.config(state=tk.DISABLED)
+
+        current_theme = self.style.theme_use()
         new_theme = "darkly" if current_theme == "cosmo" else "cosmo"
-        self.root.style.theme_use(new_theme)
+        self.style.theme_use(new_theme)
         self.log_message(f"主题已切换为: {new_theme}", "info")
 
+        # 空闲回调在已排队的点击事件处理完之后才执行
+        self.root.after_idle(self.theme_button.config, {"state": tk.NORMAL})
+
     def _start_translation_process(self):
         """开始翻译过程"""
         if self.translation_in_progress:
@@ -405,39 +550,73 @@ class ModTranslatorApp:
             self.log_message(f"翻译失败：{message}", "error")
             return
 
+        # 在UI线程中一次性读取所有翻译参数，工作线程不再访问Tk对象
+        game_style = self.style_text.get("1.0", tk.END).strip() or self.game_mod_style_prompt.get()
+        model_name = self.selected_model_var.get()
+        api_call_delay = self.api_call_delay_var.get()
+
         self.log_message("开始翻译过程...", "info")
         self.translation_in_progress = True
         self.progress_bar['value'] = 0
         self.progress_bar.pack(side=RIGHT, padx=(0, 10))
+        self._pending_progress = None
+        self._shown_progress = None
+        self._flush_progress_job = self.root.after(PROGRESS_FLUSH_INTERVAL_MS, self._flush_progress)
         self.translate_button.config(state=tk.DISABLED)
         self.stop_button.config(state=tk.NORMAL)
 
-        # 在后台线程中执行实际翻译
-        translation_thread = threading.Thread(
-            target=self._execute_translation_workflow,
-            daemon=True
+        # 在线程池中执行实际翻译
+        self._executor.submit(
+            self._execute_translation_workflow,
+            list(self.files_for_translation),
+            source_lang,
+            target_lang,
+            game_style,
+            model_name,
+            api_call_delay
         )
-        translation_thread.start()
 
-    def _execute_translation_workflow(self):
-        """执行翻译工作流程"""
-        try:
-            # 获取翻译参数
-            source_lang = self.source_language_code.get()
-            target_lang = self.target_language_code.get()
-            game_style = self.style_text.get(1.0, tk.END).strip() or self.game_mod_style_prompt.get()
-            model_name = self.selected_model_var.get()
+    def _create_executor(self):
+        """按当前并发设置创建翻译任务线程池，并记录其线程数"""
+        self._executor_workers = self.max_concurrent_tasks_var.get() or 3
+        return ThreadPoolExecutor(
+            max_workers=self._executor_workers,
+            thread_name_prefix="trx"
+        )
+
+    def _execute_translation_workflow(
+        self,
+        source_files,
+        source_lang,
+        target_lang,
+        game_style,
+        model_name,
+        api_call_delay
+    ):
+        """
+        执行翻译工作流程（在工作线程中运行）
 
+        Args:
+            source_files: 待翻译文件列表（快照）
+            source_lang: 源语言
+            target_lang: 目标语言
+            game_style: 游戏/Mod风格提示
+            model_name: 模型名称
+            api_call_delay: API调用延迟（秒）
+        """
+        try:
             self.log_message(f"翻译设置: {source_lang} -> {target_lang}, 模型: {model_name}", "info")
 
             # 使用并行翻译器执行翻译
             success = self.parallel_translator.translate_files(
-                self.files_for_translation,
+                source_files,
                 source_lang,
                 target_lang,
                 game_style,
                 model_name,
-                progress_callback=self._update_progress
+                progress_callback=self._update_progress,
+                request_delay=api_call_delay,
+                translation_cache=self.translation_cache
             )
 
             # 在UI线程中更新结果
@@ -471,33 +650,57 @@ class ModTranslatorApp:
         self.stop_translation_flag.clear()
         self.translate_button.config(state=tk.NORMAL)
         self.stop_button.config(state=tk.DISABLED)
+        self._cancel_progress_flush()
         self.progress_bar.pack_forget()
         self.progress_bar['value'] = 0
         self.log_message("翻译过程已完成", "info")
 
     def _on_log_message(self, message: str, level: str):
-        """处理日志消息"""
+        """处理日志消息，可在任意线程调用；deque.append是原子操作，无需加锁"""
         timestamp = time.strftime("%H:%M:%S")
-        formatted_message = f"[{timestamp}] {level.upper()}: {message}\n"
-
-        # 在UI线程中更新日志
-        self.root.after(0, self._update_log_display, formatted_message)
-
-    def _update_log_display(self, message: str):
-        """更新日志显示"""
-        self.log_text.insert(tk.END, message)
-        self.log_text.see(tk.END)
+        self.log_buffer.append(f"[{timestamp}] {level.upper()}: {message}\n")
+
+    def _flush_log_buffer(self):
+        """在UI线程中将缓冲的日志一次性写入日志区域，并安排下一次刷新"""
+        buffer = self.log_buffer
+        if buffer:
+            lines = []
+            try:
+                while True:
+                    lines.append(buffer.popleft())
+            except IndexError:
+                pass
+            self.log_text.insert(tk.END, "".join(lines))
+            # 长时间翻译时限制日志区域的行数，避免文本控件无限增长
+            line_count = int(self.log_text.index("end-1c").split(".")[0])
+            if line_count > LOG_MAX_LINES:
+                self.log_text.delete("1.0", f"{line_count - LOG_MAX_LINES + 1}.0")
+            self.log_text.see(tk.END)
+        self._flush_log_job = self.root.after(LOG_FLUSH_INTERVAL_MS, self._flush_log_buffer)
 
     def _update_progress(self, current: int, total: int):
-        """更新进度条"""
-        def _cb():
-            self.progress_bar['maximum'] = total
-            self.progress_bar['value'] = current
-        self.root.after(0, _cb)
-
-    def log_message(self, message: str, level: str = "info"):
-        """记录日志消息"""
-        self.logger.log_message(message, level)
+        """记录最新进度，可在任意线程调用；元组赋值是原子操作，由_flush_progress写入进度条"""
+        self._pending_progress = (current, total)
+
+    def _flush_progress(self):
+        """在UI线程中将最新进度写入进度条（与上次相同时跳过），并安排下一次刷新"""
+        progress = self._pending_progress
+        if progress is not None and progress != self._shown_progress:
+            self._shown_progress = progress
+            current, total = progress
+            self.progress_bar.configure(maximum=total, value=current)
+        self._flush_progress_job = self.root.after(PROGRESS_FLUSH_INTERVAL_MS, self._flush_progress)
+
+    def _cancel_progress_flush(self):
+        """停止进度条的定时刷新"""
+        if self._flush_progress_job is not None:
+            self.root.after_cancel(self._flush_progress_job)
+            self._flush_progress_job = None
+        self._pending_progress = None
+
+    def log_message(self, message: str, level: str = "info", *args):
+        """记录日志消息，args仅在该级别启用时才参与格式化"""
+        self.logger.log_message(message, level, *args)
 
     def review_translation(self, key_name: str, original_text: str, ai_translation: str, completion_callback):
         """
@@ -517,8 +720,12 @@ class ModTranslatorApp:
             # 检查是否启用自动应用功能
             auto_apply_when_placeholders_match = self.config_manager.get_setting("auto_apply_when_placeholders_match", True)
 
+            # 占位符差集同时用于判断是否自动应用和评审对话框中的差异提示
+            missing_in_ai = original_placeholders - translated_placeholders
+            added_in_ai = translated_placeholders - original_placeholders
+
             # 如果启用自动应用且占位符完全匹配，则自动应用翻译结果
-            if auto_apply_when_placeholders_match and original_placeholders == translated_placeholders:
+            if auto_apply_when_placeholders_match and not missing_in_ai and not added_in_ai:
                 self.log_message(f"占位符匹配，自动应用翻译结果: {key_name}", "info")
 
                 # 直接调用完成回调，使用AI翻译结果
@@ -532,7 +739,28 @@ class ModTranslatorApp:
 
                 return
 
-            # 创建评审对话框
+            review = (key_name, original_text, ai_translation, original_placeholders,
+                      translated_placeholders, completion_callback, missing_in_ai, added_in_ai)
+            if self.review_dialog is not None and self.review_dialog.winfo_exists() and self.review_dialog.active:
+                # 对话框正在显示上一条评审，排队等待
+                self.review_queue.append(review)
+                self.log_message(f"评审已排队: {key_name}", "debug")
+                return
+
+            self._show_review(*review)
+
+        except Exception as e:
+            self.log_message(f"创建评审对话框时出错: {e}", "error")
+            # 如果评审对话框创建失败，直接使用AI翻译
+            completion_callback(key_name, {"action": "use_ai", "translation": ai_translation})
+
+    def _show_review(
+        self, key_name, original_text, ai_translation, original_placeholders,
+        translated_placeholders, completion_callback, missing_in_ai=None, added_in_ai=None
+    ):
+        """在复用的评审对话框中显示一条评审，对话框不存在时创建"""
+        dialog_callback = functools.partial(self._on_review_dialog_done, completion_callback)
+        if self.review_dialog is None or not self.review_dialog.winfo_exists():
             self.review_dialog = ReviewDialog(
                 parent_app_instance=self,
                 root_window=self.root,
@@ -541,15 +769,50 @@ class ModTranslatorApp:
                 original_placeholders=original_placeholders,
                 translated_placeholders=translated_placeholders,
                 key_name=key_name,
-                completion_callback=completion_callback
+                completion_callback=dialog_callback,
+                missing_in_ai=missing_in_ai,
+                added_in_ai=added_in_ai
+            )
+        else:
+            self.review_dialog.reset(
+                original_text, ai_translation, original_placeholders,
+                translated_placeholders, key_name, dialog_callback,
+                missing_in_ai, added_in_ai
             )
 
-            self.log_message(f"已触发评审对话框: {key_name}", "info")
+        self.log_message(f"已触发评审对话框: {key_name}", "info")
 
-        except Exception as e:
-            self.log_message(f"创建评审对话框时出错: {e}", "error")
-            # 如果评审对话框创建失败，直接使用AI翻译
-            completion_callback(key_name, {"action": "use_ai", "translation": ai_translation})
+    def format_placeholders(self, placeholders) -> str:
+        """
+        将占位符集合格式化为按行排序的文本，结果按集合内容缓存
+
+        Args:
+            placeholders: 占位符集合
+
+        Returns:
+            每行一个占位符的文本，集合为空时返回"无"
+        """
+        if not placeholders:
+            return "无"
+        key = frozenset(placeholders)
+        text = self._ph_sort_cache.get(key)
+        if text is None:
+            text = "\n".join(sorted(key))
+            self._ph_sort_cache[key] = text
+            if len(self._ph_sort_cache) > PLACEHOLDER_TEXT_CACHE_SIZE:
+                self._ph_sort_cache.popitem(last=False)
+        else:
+            self._ph_sort_cache.move_to_end(key)
+        return text
+
+    def _on_review_dialog_done(self, completion_callback, key_name: str, result: dict):
+        """评审对话框关闭后通知调用方，并显示下一条排队的评审"""
+        try:
+            if completion_callback:
+                completion_callback(key_name, result)
+        finally:
+            if self.review_queue and not self.review_dialog.active:
+                self._show_review(*self.review_queue.popleft())
 
     def handle_review_completion(self, key_name: str, result: dict):
         """
@@ -562,18 +825,16 @@ class ModTranslatorApp:
         try:
             action = result.get("action", "use_ai")
 
-            # 保存评审结果
+            # 保存评审结果，超出上限时淘汰最旧的条目
+            if key_name in self.review_results:
+                self.review_results.move_to_end(key_name)
+            elif len(self.review_results) >= MAX_REVIEW_RESULTS:
+                self.review_results.popitem(last=False)
             self.review_results[key_name] = result
 
             # 记录评审结果
-            if action == "confirm":
-                self.log_message(f"评审确认: {key_name}", "info")
-            elif action == "use_ai":
-                self.log_message(f"使用AI翻译: {key_name}", "info")
-            elif action == "use_original":
-                self.log_message(f"使用原文: {key_name}", "info")
-            elif action == "cancel":
-                self.log_message(f"评审取消: {key_name}", "warn")
+            label, level = _REVIEW_ACTION_LABELS.get(action, ("未知动作", "warn"))
+            self.log_message(f"{label}: {key_name}", level)
 
             # 通知并行翻译器评审完成
             if hasattr(self.parallel_translator, 'handle_review_result'):
@@ -590,11 +851,29 @@ class ModTranslatorApp:
                 self.stop_translation_flag.set()
                 self.parallel_translator.stop_workers()
 
-            # 保存配置
-            self.config_manager.save_config()
+            # 关闭线程池，取消尚未开始的任务
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+            if self._flush_log_job is not None:
+                self.root.after_cancel(self._flush_log_job)
+                self._flush_log_job = None
+            self._cancel_progress_flush()
+
+            # 保存配置（包括尚未写盘的设置变更）
+            if self._flush_cfg_job is not None:
+                self.root.after_cancel(self._flush_cfg_job)
+                self._flush_cfg_job = None
+            self.config_manager.update_settings(self._pending_cfg_writes)
+            self._pending_cfg_writes = {}
+
+            # 关闭翻译缓存
+            self.translation_cache.close()
 
             self.log_message("应用程序正在关闭...", "info")
 
+            # 停止日志写入线程
+            self.logger.close()
+
             # 关闭窗口
             self.root.destroy()
 
@@ -615,7 +894,7 @@ class ModTranslatorApp:
         self.source_language_combo = ttk.Combobox(
             source_frame,
             textvariable=self.source_language_code,
-            values=list(self._get_supported_languages().keys()),
+            values=self._LANG_KEYS,
             state="readonly",
             width=20
         )
@@ -629,7 +908,7 @@ class ModTranslatorApp:
         self.target_language_combo = ttk.Combobox(
             target_frame,
             textvariable=self.target_language_code,
-            values=list(self._get_supported_languages().keys()),
+            values=self._LANG_KEYS,
             state="readonly",
             width=20
         )
@@ -679,22 +958,16 @@ class ModTranslatorApp:
         preset_frame = ttk.Frame(style_frame)
         preset_frame.pack(fill=X)
 
-        presets = [
-            ("通用游戏", "General video game localization, maintain tone of original."),
-            ("策略游戏", "Strategy game localization, formal and precise tone."),
-            ("角色扮演", "RPG localization, immersive and narrative style."),
-            ("历史题材", "Historical game localization, period-appropriate language.")
-        ]
-
-        for i, (name, style) in enumerate(presets):
+        last_index = len(_STYLE_PRESETS) - 1
+        for i, (name, style) in enumerate(_STYLE_PRESETS):
             btn = ttkb.Button(
                 preset_frame,
                 text=name,
-                command=lambda s=style: self._set_style_preset(s),
+                command=functools.partial(self._set_style_preset, style),
                 style="outline.TButton",
                 width=10
             )
-            btn.pack(side=LEFT, padx=(0, 5) if i < len(presets)-1 else 0)
+            btn.pack(side=LEFT, padx=(0, 5) if i < last_index else 0)
 
     def _create_api_key_management(self, parent):
         """创建API密钥管理"""
@@ -807,6 +1080,9 @@ class ModTranslatorApp:
             width=10
         )
         self.tasks_spinbox.pack(side=LEFT, padx=(5, 0))
+        # 键盘输入在确认（回车或失去焦点）时才保存，输入中途的值不写盘
+        self.tasks_spinbox.bind("<FocusOut>", self._on_concurrency_changed)
+        self.tasks_spinbox.bind("<Return>", self._on_concurrency_changed)
 
         # API调用延迟
         delay_frame = ttk.Frame(concurrency_frame)
@@ -823,6 +1099,16 @@ class ModTranslatorApp:
             width=10
         )
         self.delay_spinbox.pack(side=LEFT, padx=(5, 0))
+        self.delay_spinbox.bind("<FocusOut>", self._on_delay_changed)
+        self.delay_spinbox.bind("<Return>", self._on_delay_changed)
+
+        # 清除翻译缓存
+        ttkb.Button(
+            concurrency_frame,
+            text="🗑 清除翻译缓存",
+            style="outline.TButton",
+            command=self._clear_translation_cache
+        ).pack(anchor="w", pady=(5, 0))
 
     def _create_review_settings(self, parent):
         """创建评审设置"""
@@ -857,23 +1143,11 @@ class ModTranslatorApp:
         self.auto_apply_placeholders_check.pack(anchor="w")
 
     # 辅助方法和事件处理
-    def _get_supported_languages(self):
-        """获取支持的语言列表"""
-        return {
-            "english": "英语",
-            "simp_chinese": "简体中文",
-            "trad_chinese": "繁体中文",
-            "japanese": "日语",
-            "korean": "韩语",
-            "french": "法语",
-            "german": "德语",
-            "spanish": "西班牙语",
-            "russian": "俄语"
-        }
-
     def _get_available_models(self):
-        """获取可用的AI模型列表"""
-        return self.model_manager.get_available_models()
+        """获取可用的AI模型列表（缓存为元组，刷新模型列表时重建；只读缓存，不阻塞UI线程）"""
+        if self._model_keys_tuple is None:
+            self._model_keys_tuple = tuple(self.model_manager.get_cached_models())
+        return self._model_keys_tuple
 
     def _on_language_changed(self, event=None):
         """语言选择改变事件"""
@@ -911,8 +1185,6 @@ class ModTranslatorApp:
 
     def _add_api_key(self):
         """添加API密钥"""
-        from tkinter import simpledialog
-
         new_key = simpledialog.askstring(
             "添加API密钥",
             "请输入新的Google Gemini API密钥:",
@@ -955,7 +1227,6 @@ class ModTranslatorApp:
 
         old_key = keys[index]
 
-        from tkinter import simpledialog
         new_key = simpledialog.askstring(
             "编辑API密钥",
             "请输入新的API密钥:",
@@ -1001,41 +1272,111 @@ class ModTranslatorApp:
                     messagebox.showerror("错误", "API密钥删除失败")
 
     def _refresh_api_keys_list(self):
-        """刷新API密钥列表显示"""
-        self.api_keys_listbox.delete(0, tk.END)
+        """刷新API密钥列表显示（密钥未变更时跳过）"""
+        version = self.config_manager.keys_version
+        if version == self._api_keys_version:
+            return
+        self._api_keys_version = version
 
-        keys = self.config_manager.get_api_keys()
-        for key in keys:
-            # 只显示密钥的前4位和后4位
-            display_key = f"{key[:4]}...{key[-4:]}" if len(key) > 8 else key
-            self.api_keys_listbox.insert(tk.END, display_key)
+        display_keys = [_mask_api_key(key) for key in self.config_manager.get_api_keys()]
+        _sync_listbox(self.api_keys_listbox, self._api_key_rows, display_keys)
+        self._api_key_rows = display_keys
 
     def _scan_yml_files(self, directory):
-        """扫描目录中的YML文件"""
-        yml_files = self.file_processor.scan_yml_files(directory)
+        """在后台线程中扫描目录中的YML文件，并分批回传到UI线程"""
+        self._scan_generation += 1
+        generation = self._scan_generation
 
-        # 更新文件列表
-        self.files_for_translation = yml_files
-        self._refresh_file_list()
+        self.files_for_translation = []
+        self.files_listbox.delete(0, tk.END)
+        self.log_message(f"正在扫描目录: {directory}", "info")
+
+        def _scan_worker():
+            try:
+                with ThreadPoolExecutor(max_workers=SCAN_MAX_WORKERS, thread_name_prefix="scan") as pool:
+                    def _on_batch(chunk):
+                        # 已有更新的扫描开始时停止遍历
+                        if generation != self._scan_generation:
+                            return False
+                        # 并行解析每个文件的语言头
+                        batch = list(zip(chunk, pool.map(self._format_file_display, chunk)))
+                        self.root.after(0, self._on_files_batch, generation, batch)
+                        return True
+
+                    self.file_processor.scan_yml_files(directory, on_batch=_on_batch)
+            except Exception as e:
+                self.log_message(f"扫描目录时发生错误: {e}", "error")
+            self.root.after(0, self._on_scan_completed, generation)
+
+        threading.Thread(target=_scan_worker, daemon=True).start()
+
+    def _on_files_batch(self, generation, batch):
+        """接收一批扫描结果并更新文件列表（UI线程）"""
+        if generation != self._scan_generation:
+            return
 
-        self.log_message(f"扫描完成，找到 {len(yml_files)} 个YML文件", "info")
+        self.files_for_translation.extend(file_path for file_path, _ in batch)
+        self.files_listbox.insert(tk.END, *(display_text for _, display_text in batch))
 
-    def _refresh_file_list(self):
-        """刷新文件列表显示"""
-        self.files_listbox.delete(0, tk.END)
+    def _on_scan_completed(self, generation):
+        """扫描完成回调（UI线程）"""
+        if generation != self._scan_generation:
+            return
 
-        for file_path in self.files_for_translation:
-            # 获取文件语言信息
-            lang_code, entry_count = self.file_processor.get_file_language_info(file_path)
-            filename = os.path.basename(file_path)
+        # 清理不再出现在文件列表中的语言信息缓存
+        current_files = set(self.files_for_translation)
+        with self._lang_info_lock:
+            for file_path in [p for p in self._lang_info_cache if p not in current_files]:
+                del self._lang_info_cache[file_path]
 
-            # 显示文件名和语言信息
-            if lang_code:
-                display_text = f"{filename} [{lang_code}, {entry_count} 条目]"
-            else:
-                display_text = f"{filename} [未知语言]"
+        self.log_message(f"扫描完成，找到 {len(self.files_for_translation)} 个YML文件", "info")
+
+    def _get_file_language_info(self, file_path):
+        """
+        获取文件的语言信息，按(mtime, size)签名缓存
+
+        可在扫描线程中调用；缓存读写持锁，文件解析在锁外进行。
+
+        Args:
+            file_path: 文件路径
+
+        Returns:
+            (语言代码, 条目数量) 的元组
+        """
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            with self._lang_info_lock:
+                self._lang_info_cache.pop(file_path, None)
+            return None, 0
+
+        with self._lang_info_lock:
+            cached = self._lang_info_cache.get(file_path)
+        if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return cached[2], cached[3]
+
+        lang_code, entry_count = self.file_processor.get_file_language_info(file_path)
+        with self._lang_info_lock:
+            self._lang_info_cache[file_path] = (st.st_mtime_ns, st.st_size, lang_code, entry_count)
+        return lang_code, entry_count
+
+    def _format_file_display(self, file_path):
+        """生成文件列表中的显示文本"""
+        lang_code, entry_count = self._get_file_language_info(file_path)
+        filename = os.path.basename(file_path)
+
+        # 显示文件名和语言信息
+        if lang_code:
+            return f"{filename} [{lang_code}, {entry_count} 条目]"
+        return f"{filename} [未知语言]"
 
-            self.files_listbox.insert(tk.END, display_text)
+    def _refresh_file_list(self):
+        """刷新文件列表显示"""
+        items = [self._format_file_display(file_path) for file_path in self.files_for_translation]
+
+        self.files_listbox.delete(0, tk.END)
+        if items:
+            self.files_listbox.insert(tk.END, *items)
 
     def _on_model_changed(self, event=None):
         """模型选择改变事件"""
@@ -1061,7 +1402,10 @@ class ModTranslatorApp:
                 else:
                     # 更新下拉列表
                     current_selection = self.selected_model_var.get()
-                    self.model_combo['values'] = models
+                    models_tuple = tuple(models)
+                    if models_tuple != self._model_keys_tuple:
+                        self._model_keys_tuple = models_tuple
+                        self.model_combo['values'] = models_tuple
 
                     # 保持当前选择（如果仍然可用）
                     if current_selection in models:
@@ -1088,7 +1432,7 @@ class ModTranslatorApp:
     def _initialize_model_status(self):
         """初始化模型状态显示"""
         try:
-            models = self.model_manager.get_available_models()
+            models = self.model_manager.get_cached_models()
             cache_status = self.model_manager.get_cache_status()
 
             if cache_status['cache_valid']:
@@ -1098,6 +1442,10 @@ class ModTranslatorApp:
 
             self.model_status_label.config(text=status_text)
             self.log_message(f"模型状态: {status_text}", "debug")
+
+            # 没有缓存时在后台获取模型列表，完成后再更新下拉列表
+            if not cache_status['cache_valid'] and self.model_manager.has_valid_api_keys():
+                self._refresh_models()
         except Exception as e:
             self.log_message(f"初始化模型状态失败: {e}", "error")
 
@@ -1138,34 +1486,91 @@ class ModTranslatorApp:
             messagebox.showwarning("警告", "请先设置有效的本地化目录")
             return
 
-        # 分析目录结构
-        language_files = self.file_processor.analyze_directory_structure(root_path)
+        self.analyze_structure_button.config(state=tk.DISABLED)
+        self.log_message("正在分析目录结构...", "info")
+
+        def _analyze_worker():
+            try:
+                # 复用按(mtime, size)缓存的语言信息，未修改的文件无需重新解析
+                language_files = self.file_processor.analyze_directory_structure(
+                    root_path, self._get_file_language_info
+                )
+            except Exception as e:
+                self.log_message(f"分析目录结构时发生错误: {e}", "error")
+                language_files = {}
+            self.root.after(0, self._on_directory_analysis_completed, root_path, language_files)
+
+        threading.Thread(target=_analyze_worker, daemon=True).start()
+
+    def _on_directory_analysis_completed(self, root_path, language_files):
+        """目录分析完成回调（UI线程）"""
+        self.analyze_structure_button.config(state=tk.NORMAL)
 
         if not language_files:
             messagebox.showinfo("信息", "在指定目录中没有找到YML文件")
             return
 
         # 创建分析结果窗口
-        self._show_structure_analysis_window(language_files)
+        self._show_structure_analysis_window(root_path, language_files)
 
     def _show_structure_preview_window(self, preview_pairs, target_lang):
-        """显示目录结构预览窗口"""
-        preview_window = tk.Toplevel(self.root)
+        """显示目录结构预览窗口（窗口只创建一次，之后仅刷新数据）"""
+        if self._preview_widgets is None or not self._preview_widgets[0].winfo_exists():
+            self._preview_widgets = self._create_structure_preview_window()
+        preview_window, title_label, tree, scrollbar = self._preview_widgets
+
         preview_window.title(f"目录结构预览 - {target_lang}")
+        title_label.config(text=f"翻译后文件将保存到以下位置 (目标语言: {target_lang})")
+
+        children = tree.get_children()
+        if children:
+            tree.delete(*children)
+
+        # 分页加载：先填充首页，滚动到底部时再加载下一页，避免一次创建所有条目
+        relpath = make_relpath(self.localization_root_path.get())
+        pending_pairs = iter(preview_pairs)
+        page_state = {"has_more": True, "loading": False}
+
+        def _load_next_page():
+            page_state["loading"] = False
+            count = 0
+            for source_file, target_file in itertools.islice(pending_pairs, PREVIEW_PAGE_SIZE):
+                tree.insert('', 'end', text=relpath(source_file), values=(relpath(target_file),))
+                count += 1
+            if count < PREVIEW_PAGE_SIZE:
+                page_state["has_more"] = False
+
+        def _on_tree_scrolled(first, last):
+            scrollbar.set(first, last)
+            if page_state["has_more"] and not page_state["loading"] and float(last) >= 1.0:
+                page_state["loading"] = True
+                tree.after_idle(_load_next_page)
+
+        tree.configure(yscrollcommand=_on_tree_scrolled)
+        _load_next_page()
+        tree.yview_moveto(0)
+
+        preview_window.deiconify()
+        preview_window.lift()
+
+    def _create_structure_preview_window(self):
+        """
+        创建目录结构预览窗口，关闭时隐藏而不销毁
+
+        Returns:
+            (窗口, 标题标签, 树形视图, 滚动条) 的元组
+        """
+        preview_window = tk.Toplevel(self.root)
         preview_window.geometry("800x600")
         preview_window.transient(self.root)
-        preview_window.grab_set()
+        preview_window.protocol("WM_DELETE_WINDOW", preview_window.withdraw)
 
         # 创建主框架
         main_frame = ttk.Frame(preview_window, padding=10)
         main_frame.pack(fill=BOTH, expand=True)
 
         # 标题
-        title_label = ttk.Label(
-            main_frame,
-            text=f"翻译后文件将保存到以下位置 (目标语言: {target_lang})",
-            font=('Default', 12, 'bold')
-        )
+        title_label = ttk.Label(main_frame, font=('Default', 12, 'bold'))
         title_label.pack(pady=(0, 10))
 
         # 创建树形视图
@@ -1180,17 +1585,9 @@ class ModTranslatorApp:
 
         # 添加滚动条
         scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=tree.yview)
-        tree.configure(yscrollcommand=scrollbar.set)
-
         tree.pack(side=LEFT, fill=BOTH, expand=True)
         scrollbar.pack(side=RIGHT, fill=Y)
 
-        # 填充数据
-        for source_file, target_file in preview_pairs:
-            source_rel = os.path.relpath(source_file, self.localization_root_path.get())
-            target_rel = os.path.relpath(target_file, self.localization_root_path.get())
-            tree.insert('', 'end', text=source_rel, values=(target_rel,))
-
         # 按钮框架
         button_frame = ttk.Frame(main_frame)
         button_frame.pack(fill=X)
@@ -1198,16 +1595,50 @@ class ModTranslatorApp:
         ttk.Button(
             button_frame,
             text="关闭",
-            command=preview_window.destroy
+            command=preview_window.withdraw
         ).pack(side=RIGHT)
 
-    def _show_structure_analysis_window(self, language_files):
-        """显示目录结构分析窗口"""
+        return preview_window, title_label, tree, scrollbar
+
+    def _show_structure_analysis_window(self, root_path, language_files):
+        """显示目录结构分析窗口（窗口只创建一次，之后仅刷新数据）"""
+        if self._analysis_widgets is None or not self._analysis_widgets[0].winfo_exists():
+            self._analysis_widgets = self._create_structure_analysis_window()
+        analysis_window, analysis_text = self._analysis_widgets
+
+        # 先拼接完整的分析结果，再一次性插入；路径相对于实际分析的目录
+        relpath = make_relpath(root_path)
+        parts = [f"发现 {len(language_files)} 种语言的文件:\n\n"]
+
+        for lang, files in language_files.items():
+            parts.append(f"📁 {lang} ({len(files)} 个文件):\n")
+            parts.extend(f"  - {relpath(file_path)}\n" for file_path in files[:5])  # 只显示前5个文件
+
+            if len(files) > 5:
+                parts.append(f"  ... 还有 {len(files) - 5} 个文件\n")
+
+            parts.append("\n")
+
+        analysis_text.config(state=tk.NORMAL)
+        analysis_text.delete("1.0", tk.END)
+        analysis_text.insert("1.0", "".join(parts))
+        analysis_text.config(state=tk.DISABLED)
+
+        analysis_window.deiconify()
+        analysis_window.lift()
+
+    def _create_structure_analysis_window(self):
+        """
+        创建目录结构分析窗口，关闭时隐藏而不销毁
+
+        Returns:
+            (窗口, 文本框) 的元组
+        """
         analysis_window = tk.Toplevel(self.root)
         analysis_window.title("目录结构分析")
         analysis_window.geometry("600x500")
         analysis_window.transient(self.root)
-        analysis_window.grab_set()
+        analysis_window.protocol("WM_DELETE_WINDOW", analysis_window.withdraw)
 
         # 创建主框架
         main_frame = ttk.Frame(analysis_window, padding=10)
@@ -1225,29 +1656,15 @@ class ModTranslatorApp:
         text_frame = ttk.Frame(main_frame)
         text_frame.pack(fill=BOTH, expand=True, pady=(0, 10))
 
+        # 只读文本无需撤销栈
         analysis_text = scrolledtext.ScrolledText(
             text_frame,
             wrap=tk.WORD,
+            undo=False,
             font=('Consolas', 10)
         )
         analysis_text.pack(fill=BOTH, expand=True)
 
-        # 填充分析结果
-        analysis_text.insert(tk.END, f"发现 {len(language_files)} 种语言的文件:\n\n")
-
-        for lang, files in language_files.items():
-            analysis_text.insert(tk.END, f"📁 {lang} ({len(files)} 个文件):\n")
-            for file_path in files[:5]:  # 只显示前5个文件
-                rel_path = os.path.relpath(file_path, self.localization_root_path.get())
-                analysis_text.insert(tk.END, f"  - {rel_path}\n")
-
-            if len(files) > 5:
-                analysis_text.insert(tk.END, f"  ... 还有 {len(files) - 5} 个文件\n")
-
-            analysis_text.insert(tk.END, "\n")
-
-        analysis_text.config(state=tk.DISABLED)
-
         # 按钮框架
         button_frame = ttk.Frame(main_frame)
         button_frame.pack(fill=X)
@@ -1255,32 +1672,78 @@ class ModTranslatorApp:
         ttk.Button(
             button_frame,
             text="关闭",
-            command=analysis_window.destroy
+            command=analysis_window.withdraw
         ).pack(side=RIGHT)
 
-    def _on_concurrency_changed(self):
-        """并发设置改变事件"""
-        tasks = self.max_concurrent_tasks_var.get()
-        self.config_manager.set_setting("max_concurrent_tasks", tasks)
-        self.log_message(f"并发任务数设置为: {tasks}", "info")
+        return analysis_window, analysis_text
 
-    def _on_delay_changed(self):
-        """延迟设置改变事件"""
-        delay = self.api_call_delay_var.get()
-        self.config_manager.set_setting("api_call_delay", delay)
-        self.log_message(f"API调用延迟设置为: {delay}秒", "info")
+    def _on_concurrency_changed(self, event=None):
+        """并发设置改变事件（点击箭头或确认键盘输入时触发）"""
+        _ = event  # 标记参数已使用
+        try:
+            value = self.max_concurrent_tasks_var.get()
+        except tk.TclError:
+            return  # 输入的不是有效数字
+        self._schedule_config_write(max_concurrent_tasks=value)
+
+    def _on_delay_changed(self, event=None):
+        """延迟设置改变事件（点击箭头或确认键盘输入时触发）"""
+        _ = event  # 标记参数已使用
+        try:
+            value = self.api_call_delay_var.get()
+        except tk.TclError:
+            return  # 输入的不是有效数字
+        self._schedule_config_write(api_call_delay=value)
+
+    def _clear_translation_cache(self):
+        """清除持久化翻译缓存"""
+        if self.translation_in_progress:
+            messagebox.showwarning("警告", "翻译进行中，无法清除翻译缓存")
+            return
+        if messagebox.askyesno("确认清除", "确定要清除所有已缓存的翻译吗？"):
+            self.translation_cache.clear()
+            self.log_message("翻译缓存已清除", "info")
 
     def _on_review_settings_changed(self):
         """评审设置改变事件"""
-        auto_review = self.auto_review_mode_var.get()
-        delayed_review = self.delayed_review_var.get()
-        auto_apply_placeholders = self.auto_apply_when_placeholders_match_var.get()
+        self._schedule_config_write(
+            auto_review_mode=self.auto_review_mode_var.get(),
+            delayed_review=self.delayed_review_var.get(),
+            auto_apply_when_placeholders_match=self.auto_apply_when_placeholders_match_var.get()
+        )
+
+    def _schedule_config_write(self, **settings):
+        """
+        记录待写入的设置项，并在停止变动一段时间后统一写盘
+
+        拖动滑块或连续点击微调框时只保存最终值。
+
+        Args:
+            **settings: 配置键值对
+        """
+        self._pending_cfg_writes.update(settings)
+        if self._flush_cfg_job is not None:
+            self.root.after_cancel(self._flush_cfg_job)
+        self._flush_cfg_job = self.root.after(CONFIG_WRITE_DEBOUNCE_MS, self._flush_config_writes)
+
+    def _flush_config_writes(self):
+        """将待写入的设置项一次性保存到配置文件"""
+        self._flush_cfg_job = None
+        if not self._pending_cfg_writes:
+            return
+
+        pending = self._pending_cfg_writes
+        self._pending_cfg_writes = {}
+        self.config_manager.update_settings(pending)
 
-        self.config_manager.set_setting("auto_review_mode", auto_review)
-        self.config_manager.set_setting("delayed_review", delayed_review)
-        self.config_manager.set_setting("auto_apply_when_placeholders_match", auto_apply_placeholders)
+        if "max_concurrent_tasks" in pending and (pending["max_concurrent_tasks"] or 3) != self._executor_workers:
+            # 并发数确实改变时重建线程池；正在运行的任务会继续执行完毕
+            old_executor = self._executor
+            self._executor = self._create_executor()
+            old_executor.shutdown(wait=False)
 
-        self.log_message(f"评审设置已更新 - 自动评审: {auto_review}, 延迟评审: {delayed_review}, 占位符匹配自动应用: {auto_apply_placeholders}", "info")
+        summary = ", ".join(f"{key}={value}" for key, value in pending.items())
+        self.log_message(f"设置已更新: {summary}", "info")
 
     def run(self):
         """运行应用程序"""
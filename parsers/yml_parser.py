@@ -4,11 +4,16 @@ YML文件解析器
 负责解析和处理Paradox游戏的本地化YML文件
 """
 
+import functools
+import itertools
 import os
 import re
-from typing import List, Dict, Set, Tuple, Optional, Any
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Set, Tuple, Optional, Any, Iterator
 from config.config_manager import ConfigManager
-from config.constants import DEFAULT_PLACEHOLDER_PATTERNS
+from config.constants import DEFAULT_PLACEHOLDER_PATTERNS, YML_LOAD_MAX_WORKERS
 
 
 class YMLParser:
@@ -34,9 +39,49 @@ class YMLParser:
         re.UNICODE
     )
     LANGUAGE_HEADER_REGEX = re.compile(r"^\s*l_([a-zA-Z_]+)\s*:\s*$", re.UNICODE)
+    # 只检测语言时直接匹配文件开头的原始字节，无需解码整个文件
+    _LANGUAGE_HEADER_BYTES_RE = re.compile(rb"^\s*l_([a-zA-Z_]+)\s*:\s*$")
+    _HEADER_SNIFF_SIZE = 128
+    _UTF8_BOM = b'\xef\xbb\xbf'
+    # ENTRY_REGEX的多行版本：在整个文件文本上逐条匹配，空白不跨越换行
+    _ENTRY_MULTILINE_RE = re.compile(
+        r'^[^\S\n]*([a-zA-Z0-9_.-]+)[^\S\n]*:[^\S\n]*(?:\d+[^\S\n]*)?"((?:\\.|[^"\\\n])*)"[^\S\n]*$',
+        re.UNICODE | re.MULTILINE
+    )
+    # 值的转义/反转义：单次扫描完成
+    _UNESCAPE_RE = re.compile(r'\\(["n])')
+    _UNESCAPE_MAP = {'"': '"', 'n': '\n'}
+    _ESCAPE_TABLE = str.maketrans({'"': '\\"', '\n': '\\n'})
+    _FILENAME_LANG_RE = re.compile(r'_l_([a-zA-Z_]+)\.yml$')
+    # 与ENTRY_REGEX匹配相同的行，同时捕获键后的版本号（可能为空）
+    _ENTRY_PARTS_RE = re.compile(
+        r'^\s*([a-zA-Z0-9_.-]+)\s*:\s*(\d*)\s*"(?:\\.|[^"\\])*"\s*$',
+        re.UNICODE
+    )
     
     # 占位符正则表达式列表
     PLACEHOLDER_REGEXES = [re.compile(p) for p in DEFAULT_PLACEHOLDER_PATTERNS]
+    # 反向引用（\1 或 (?P=name)），合并为选择分支后组号会改变
+    _BACKREFERENCE_RE = re.compile(r'\\[1-9]|\(\?P=')
+
+    @staticmethod
+    @functools.lru_cache(maxsize=16)
+    def _compile_placeholder_union(patterns: Tuple[str, ...]) -> Optional[re.Pattern]:
+        """
+        将多个占位符正则合并为一个选择分支正则，用于判断文本中是否含有占位符
+
+        Args:
+            patterns: 正则表达式字符串元组
+
+        Returns:
+            合并后的正则表达式；模式含反向引用或无法合并（如非开头的全局标志）时返回None
+        """
+        if any(YMLParser._BACKREFERENCE_RE.search(p) for p in patterns):
+            return None
+        try:
+            return re.compile("|".join(f"(?:{p})" for p in patterns))
+        except re.error:
+            return None
 
     @staticmethod
     def extract_placeholders(
@@ -44,23 +89,43 @@ class YMLParser:
     ) -> Set[str]:
         """
         从文本中提取所有占位符
+
+        先用合并后的正则扫描一次，不含占位符的文本直接返回；否则逐个模式匹配，
+        模式含捕获组时取第一个捕获组，否则取整个匹配。
         
         Args:
             text: 要分析的文本
+            regexes: 占位符正则列表，默认使用PLACEHOLDER_REGEXES
             
         Returns:
             占位符集合
         """
+        regexes = regexes or YMLParser.PLACEHOLDER_REGEXES
+        union = YMLParser._compile_placeholder_union(tuple(r.pattern for r in regexes))
+        if union is not None and union.search(text) is None:
+            return set()
+
         placeholders = set()
-        patterns = regexes or YMLParser.PLACEHOLDER_REGEXES
-        for regex in patterns:
-            found = regex.findall(text)
-            for item in found:
-                # 处理元组和字符串
-                placeholder = item[0] if isinstance(item, tuple) else item
-                placeholders.add(placeholder)
+        for regex in regexes:
+            for match in regex.finditer(text):
+                placeholders.add(match.group(1) if regex.groups else match.group(0))
         return placeholders
 
+    @staticmethod
+    def _unescape_value(value: str) -> str:
+        """
+        反转义YML值中的 \\" 和 \\n
+
+        Args:
+            value: 原始值
+
+        Returns:
+            反转义后的值
+        """
+        if '\\' not in value:
+            return value
+        return YMLParser._UNESCAPE_RE.sub(lambda m: YMLParser._UNESCAPE_MAP[m.group(1)], value)
+
     @staticmethod
     def load_file(filepath: str) -> Tuple[Optional[str], List[Dict[str, str]]]:
         """
@@ -77,42 +142,42 @@ class YMLParser:
         
         try:
             with open(filepath, 'r', encoding='utf-8-sig') as f:
-                lines = f.readlines()
+                text = f.read()
                 
-            if not lines:
+            if not text:
                 return None, []
             
             # 尝试从第一行提取语言代码
-            header_match = YMLParser.LANGUAGE_HEADER_REGEX.match(lines[0])
+            first_line_end = text.find('\n')
+            if first_line_end == -1:
+                first_line_end = len(text)
+            header_match = YMLParser.LANGUAGE_HEADER_REGEX.match(text, 0, first_line_end)
             if header_match:
                 language_code = header_match.group(1)
             else:
                 # 从文件名提取语言代码
                 basename = os.path.basename(filepath)
-                match_filename_lang = re.search(r'_l_([a-zA-Z_]+)\.yml$', basename)
+                match_filename_lang = YMLParser._FILENAME_LANG_RE.search(basename)
                 if match_filename_lang:
                     language_code = match_filename_lang.group(1)
                 else:
                     return None, []
             
-            # 解析每一行
-            for i, line_content in enumerate(lines):
-                # 跳过头部行
-                if i == 0 and header_match:
-                    continue
-                    
-                match = YMLParser.ENTRY_REGEX.match(line_content)
-                if match:
-                    key, value = match.group(1), match.group(2)
+            # 在整个文本上一次扫描所有条目，跳过头部行；行号通过累计换行数计算
+            pos = first_line_end + 1 if header_match else 0
+            line_number = 2 if header_match else 1
+            for match in YMLParser._ENTRY_MULTILINE_RE.finditer(text, pos):
+                line_number += text.count('\n', pos, match.start())
+                pos = match.start()
+
+                key, value = match.group(1), match.group(2)
+                entries.append({
+                    'key': key,
                     # 处理转义字符
-                    processed_value = value.replace('\\"', '"').replace('\\n', '\n')
-                    
-                    entries.append({
-                        'key': key,
-                        'value': processed_value,
-                        'original_line_content': line_content.rstrip('\n\r'),
-                        'line_number': i + 1
-                    })
+                    'value': YMLParser._unescape_value(value),
+                    'original_line_content': match.group(0),
+                    'line_number': line_number
+                })
             
             return language_code, entries
             
@@ -120,6 +185,103 @@ class YMLParser:
             print(f"YMLParser: 加载文件 {filepath} 时发生错误: {e}")
             return None, []
 
+    @staticmethod
+    def detect_language(filepath: str) -> Optional[str]:
+        """
+        只读取文件开头检测语言代码，规则与load_file相同
+
+        Args:
+            filepath: YML文件路径
+
+        Returns:
+            语言代码，无法检测时返回None
+        """
+        try:
+            with open(filepath, 'rb') as f:
+                head = f.read(YMLParser._HEADER_SNIFF_SIZE)
+        except OSError:
+            return None
+
+        if not head:
+            return None
+        if head.startswith(YMLParser._UTF8_BOM):
+            head = head[len(YMLParser._UTF8_BOM):]
+
+        header_match = YMLParser._LANGUAGE_HEADER_BYTES_RE.match(head.split(b'\n', 1)[0])
+        if header_match:
+            return header_match.group(1).decode('ascii')
+
+        # 从文件名提取语言代码
+        match_filename_lang = YMLParser._FILENAME_LANG_RE.search(os.path.basename(filepath))
+        return match_filename_lang.group(1) if match_filename_lang else None
+
+    @staticmethod
+    def load_files(
+        filepaths: List[str], max_workers: int = YML_LOAD_MAX_WORKERS
+    ) -> List[Tuple[Optional[str], List[Dict[str, str]]]]:
+        """
+        并行加载多个YML文件
+
+        文件读取是I/O密集型操作，用线程池重叠多个文件的读取；
+        正则均为类级预编译，线程间不会重复编译。
+
+        Args:
+            filepaths: YML文件路径列表
+            max_workers: 最大线程数
+
+        Returns:
+            与输入顺序一致的 (语言代码, 条目列表) 元组列表
+        """
+        return list(YMLParser.iter_load_files(filepaths, max_workers))
+
+    @staticmethod
+    def iter_load_files(
+        filepaths: List[str],
+        max_workers: int = YML_LOAD_MAX_WORKERS,
+        stop_event: Optional[threading.Event] = None
+    ) -> Iterator[Tuple[Optional[str], List[Dict[str, str]]]]:
+        """
+        按输入顺序逐个产出文件加载结果
+
+        后台最多预读max_workers个文件，调用方处理当前文件时后续文件已在读取；
+        每产出一个文件前检查停止事件，被设置后取消尚未开始的读取并结束迭代。
+
+        Args:
+            filepaths: YML文件路径列表
+            max_workers: 最大线程数（即预读的文件数）
+            stop_event: 停止事件，可为None
+
+        Yields:
+            (语言代码, 条目列表) 元组
+        """
+        if len(filepaths) <= 1 or max_workers <= 1:
+            for path in filepaths:
+                if stop_event is not None and stop_event.is_set():
+                    return
+                yield YMLParser.load_file(path)
+            return
+
+        remaining_paths = iter(filepaths)
+        with ThreadPoolExecutor(
+            max_workers=min(max_workers, len(filepaths)), thread_name_prefix="yml-load"
+        ) as pool:
+            pending = deque(
+                pool.submit(YMLParser.load_file, path)
+                for path in itertools.islice(remaining_paths, max_workers)
+            )
+            try:
+                while pending:
+                    result = pending.popleft().result()
+                    if stop_event is not None and stop_event.is_set():
+                        return
+                    next_path = next(remaining_paths, None)
+                    if next_path is not None:
+                        pending.append(pool.submit(YMLParser.load_file, next_path))
+                    yield result
+            finally:
+                for future in pending:
+                    future.cancel()
+
     @staticmethod
     def save_file(
         filepath: str, 
@@ -160,23 +322,14 @@ class YMLParser:
                     translated_value = entry.get('translated_value', entry.get('value', ''))
                     
                     # 转义特殊字符
-                    value_to_write = translated_value.replace('"', '\\"').replace('\n', '\\n')
+                    value_to_write = translated_value.translate(YMLParser._ESCAPE_TABLE)
                     
-                    # 尝试保持原始格式
+                    # 尝试保持原始格式：一次匹配同时校验原始行并取出键和版本号
                     original_line = entry.get('original_line_content', '')
-                    if original_line:
-                        original_line_match = YMLParser.ENTRY_REGEX.match(original_line)
-                        if original_line_match:
-                            original_key_part = original_line.split('"')[0]
-                            key_part_match = re.match(r'\s*([a-zA-Z0-9_.-]+)\s*:\s*(\d*)\s*', original_key_part)
-                            
-                            if key_part_match and key_part_match.group(2):
-                                # 保持数字格式
-                                f.write(f" {key_part_match.group(1)}:{key_part_match.group(2)} \"{value_to_write}\"\n")
-                            else:
-                                f.write(f" {key}: \"{value_to_write}\"\n")
-                        else:
-                            f.write(f" {key}: \"{value_to_write}\"\n")
+                    parts_match = YMLParser._ENTRY_PARTS_RE.match(original_line) if original_line else None
+                    if parts_match and parts_match.group(2):
+                        # 保持数字格式
+                        f.write(f" {parts_match.group(1)}:{parts_match.group(2)} \"{value_to_write}\"\n")
                     else:
                         f.write(f" {key}: \"{value_to_write}\"\n")
             
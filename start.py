@@ -5,6 +5,7 @@ Paradox Mod Translator 启动脚本
 这个脚本提供了一个友好的启动界面，包括依赖检查和错误处理
 """
 
+import importlib.util
 import sys
 import os
 import subprocess
@@ -31,10 +32,15 @@ def check_dependencies():
     missing_packages = []
     
     for module_name, package_name in required_packages:
+        # 只查找模块而不导入，避免在启动器中加载耗时的库
         try:
-            __import__(module_name)
-            print(f"✅ {package_name}")
+            found = importlib.util.find_spec(module_name) is not None
         except ImportError:
+            found = False
+
+        if found:
+            print(f"✅ {package_name}")
+        else:
             print(f"❌ {package_name} (未安装)")
             missing_packages.append(package_name)
     
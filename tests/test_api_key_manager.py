@@ -0,0 +1,135 @@
+"""
+API密钥管理器测试
+
+测试密钥统计信息的维护
+"""
+
+import unittest
+from unittest.mock import Mock, patch
+
+from config.constants import DEFAULT_MODEL_RPM, DEFAULT_MODEL_TPM, MODEL_RPM, MODEL_TPM, rpm_for, tpm_for
+from core.api_key_manager import APIKeyManager, TOKEN_HISTORY_SIZE
+
+
+class TestAPIKeyManager(unittest.TestCase):
+    """API密钥管理器测试类"""
+
+    def setUp(self):
+        """测试前准备"""
+        config_manager = Mock()
+        config_manager.get_api_keys.return_value = ("key-a", "key-b")
+        config_manager.get_setting.side_effect = lambda key, default=None: (
+            "round_robin" if key == "key_rotation_strategy" else default
+        )
+        config_manager.get_api_call_delay.return_value = 0.0
+        self.manager = APIKeyManager(config_manager)
+
+    def test_token_average_uses_recent_history(self):
+        """测试平均token只统计最近的记录"""
+        counts = list(range(1, 26))
+        for count in counts:
+            self.manager.mark_key_success("key-a", count)
+
+        stats = self.manager.key_stats["key-a"]
+        recent = counts[-TOKEN_HISTORY_SIZE:]
+        self.assertEqual(list(stats["token_usage"]), recent)
+        self.assertAlmostEqual(stats["avg_tokens"], sum(recent) / len(recent))
+
+    def test_round_robin(self):
+        """测试轮询策略"""
+        keys = [self.manager.get_next_key() for _ in range(4)]
+        self.assertEqual(keys, ["key-a", "key-b", "key-a", "key-b"])
+
+    def test_failure_classification(self):
+        """测试只有密钥无效和速率限制错误才会禁用密钥"""
+        self.manager.mark_key_failure("key-a", "translation_failed_or_unchanged")
+        self.assertEqual(self.manager.get_available_keys_count(), 2)
+
+        self.manager.mark_key_failure("key-a", "429")
+        self.manager.mark_key_failure("key-b", "API_KEY_INVALID")
+        self.assertEqual(self.manager.get_available_keys_count(), 0)
+
+    def test_cool_down_skips_key(self):
+        """测试冷却中的密钥不会被选中，冷却结束后恢复"""
+        with patch("core.api_key_manager.time.monotonic", return_value=100.0):
+            self.manager.cool_down("key-a", 30)
+            keys = [self.manager.get_next_key() for _ in range(3)]
+        self.assertEqual(keys, ["key-b"] * 3)
+
+        with patch("core.api_key_manager.time.monotonic", return_value=131.0):
+            self.assertEqual(
+                {self.manager.get_next_key() for _ in range(2)}, {"key-a", "key-b"}
+            )
+
+    def test_wait_if_throttled_per_key(self):
+        """测试按密钥和模型的RPM限额在窗口用尽后等待"""
+        model = "models/gemini-2.0-flash"
+        rpm = MODEL_RPM[model]
+        with patch("utils.rate_limit.time.monotonic", return_value=100.0):
+            waits = [self.manager.wait_if_throttled("key-a", model)[0] for _ in range(rpm)]
+            self.assertEqual(self.manager.wait_if_throttled("key-b", model), (0.0, 0))
+
+        self.assertTrue(all(w == 0 for w in waits))
+        quota = self.manager.quota_windows[("key-a", model)]
+        with patch("utils.rate_limit.time.monotonic", return_value=130.0):
+            self.assertAlmostEqual(quota.try_reserve(), 30.0)
+
+    def test_model_limits_normalized(self):
+        """测试模型名称规范化及默认限额"""
+        self.assertEqual(rpm_for("gemini-2.0-flash"), MODEL_RPM["models/gemini-2.0-flash"])
+        self.assertEqual(rpm_for("Models/Gemini-2.0-Flash-Lite"), MODEL_RPM["models/gemini-2.0-flash-lite"])
+        self.assertEqual(tpm_for("gemini-1.5-flash-latest"), MODEL_TPM["models/gemini-1.5-flash-latest"])
+        self.assertEqual(rpm_for("unknown-model"), DEFAULT_MODEL_RPM)
+        self.assertEqual(tpm_for("unknown-model"), DEFAULT_MODEL_TPM)
+        self.assertEqual(rpm_for("gemini-2.0-flash", {"models/gemini-2.0-flash": 5}), 5)
+        self.assertEqual(tpm_for("custom-model", {"Custom-Model": 1000}), 1000)
+
+    def test_unknown_model_uses_default_quota(self):
+        """测试未列出的模型按最严格的默认限额节流，配置了限额后按配置节流"""
+        quota = self.manager._get_quota_window("key-a", "custom-model")
+        self.assertEqual((quota.max_requests, quota.max_tokens), (DEFAULT_MODEL_RPM, DEFAULT_MODEL_TPM))
+        self.assertEqual(DEFAULT_MODEL_RPM, min(MODEL_RPM.values()))
+
+        settings = {"model_rpm": {"custom-model": 5}}
+        self.manager.config_manager.get_setting.side_effect = lambda key, default=None: settings.get(key, default)
+        quota = self.manager._get_quota_window("key-b", "custom-model")
+        self.assertEqual(quota.max_requests, 5)
+
+    def test_wait_if_throttled_uses_average_tokens(self):
+        """测试按平均token用量预留TPM配额，并按实际用量修正"""
+        model = "models/gemini-2.0-flash"
+        self.manager.mark_key_success("key-a", 400)
+        _, reserved = self.manager.wait_if_throttled("key-a", model)
+        self.assertEqual(reserved, 400)
+
+        self.manager.record("key-a", model, reserved, 250)
+        self.assertEqual(self.manager.quota_windows[("key-a", model)].token_sum, 250)
+
+    def test_request_delay_scales_with_key_count(self):
+        """测试请求间隔按密钥分别计算，N个密钥的请求速率为单个密钥的N倍"""
+        model = "models/gemini-2.0-flash"
+        delay = 2.0
+
+        def elapsed_for(keys, requests):
+            config_manager = Mock(get_api_keys=Mock(return_value=keys))
+            config_manager.get_setting.side_effect = lambda key, default=None: default
+            manager = APIKeyManager(config_manager)
+            manager.set_request_delay(delay)
+            clock = [0.0]
+
+            def fake_sleep(seconds, stop_event):
+                clock[0] += seconds
+                return False
+
+            with patch("utils.rate_limit.time.monotonic", side_effect=lambda: clock[0]), \
+                    patch("utils.rate_limit._sleep", side_effect=fake_sleep):
+                for i in range(requests):
+                    manager.wait_if_throttled(keys[i % len(keys)], model)
+            return clock[0]
+
+        self.assertAlmostEqual(elapsed_for(("key-a",), 4), 3 * delay)
+        self.assertAlmostEqual(elapsed_for(("key-a", "key-b", "key-c"), 12), 3 * delay)
+
+
+if __name__ == '__main__':
+    unittest.main()
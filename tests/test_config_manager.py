@@ -8,8 +8,9 @@ import unittest
 import tempfile
 import os
 import json
+from unittest.mock import patch
 from config.config_manager import ConfigManager
-from config.constants import DEFAULT_API_KEY_PLACEHOLDER
+from config.constants import DEFAULT_API_DELAY, DEFAULT_API_KEY_PLACEHOLDER, DEFAULT_PLACEHOLDER_PATTERNS
 
 
 class TestConfigManager(unittest.TestCase):
@@ -40,13 +41,14 @@ class TestConfigManager(unittest.TestCase):
         """测试占位符正则默认配置"""
         patterns = self.config_manager.get_setting("placeholder_patterns")
         self.assertIsInstance(patterns, list)
-        self.assertIn(r'(\$.*?\$)', patterns)
+        self.assertIn(r'(\$[^$\n]*\$)', patterns)
     
     def test_save_and_load_config(self):
         """测试配置保存和加载"""
         # 修改配置
         self.config_manager.set_setting("source_language", "french")
         self.config_manager.set_setting("max_concurrent_tasks", 5)
+        self.config_manager.flush()
         
         # 创建新的配置管理器实例来测试加载
         new_config_manager = ConfigManager(self.temp_file.name)
@@ -88,7 +90,34 @@ class TestConfigManager(unittest.TestCase):
         api_keys = self.config_manager.get_api_keys()
         self.assertNotIn(old_key, api_keys)
         self.assertIn(new_key, api_keys)
+
+    def test_api_key_order_preserved(self):
+        """测试连续增删改后密钥顺序保持不变"""
+        keys = [f"AIzaSyOrder{i}2345678901234567890123456" for i in range(4)]
+        for key in keys:
+            self.config_manager.add_api_key(key)
+
+        self.assertTrue(self.config_manager.remove_api_key(keys[1]))
+        self.assertFalse(self.config_manager.remove_api_key(keys[1]))
+        self.assertTrue(self.config_manager.update_api_key(keys[2], "AIzaSyReplaced"))
+        self.assertTrue(self.config_manager.add_api_key(keys[1]))
+
+        self.assertEqual(
+            self.config_manager.get_api_keys(),
+            (keys[0], "AIzaSyReplaced", keys[3], keys[1])
+        )
     
+    def test_api_call_delay_cached(self):
+        """测试API调用延迟的解析缓存随设置更新"""
+        self.config_manager.set_setting("api_call_delay", "2.5")
+        self.assertEqual(self.config_manager.get_api_call_delay(), 2.5)
+
+        self.config_manager.update_settings({"api_call_delay": 4})
+        self.assertEqual(self.config_manager.get_api_call_delay(), 4.0)
+
+        self.config_manager.set_setting("api_call_delay", "invalid")
+        self.assertEqual(self.config_manager.get_api_call_delay(), DEFAULT_API_DELAY)
+
     def test_invalid_api_key_handling(self):
         """测试无效API密钥处理"""
         # 测试空密钥
@@ -119,6 +148,14 @@ class TestConfigManager(unittest.TestCase):
         # 验证旧版api_key字段已被移除
         self.assertNotIn("api_key", migrated_config_manager.config)
     
+    def test_legacy_placeholder_pattern_migration(self):
+        """测试旧版默认占位符模式在加载时被替换"""
+        with open(self.temp_file.name, "w", encoding="utf-8") as f:
+            json.dump({"placeholder_patterns": [r"(\$.*?\$)", r"(\[.*?\])", r"(%\w+%)"]}, f)
+
+        migrated = ConfigManager(self.temp_file.name).get_setting("placeholder_patterns")
+        self.assertEqual(migrated, DEFAULT_PLACEHOLDER_PATTERNS[:2] + [r"(%\w+%)"])
+
     def test_config_validation(self):
         """测试配置验证"""
         # 测试有效配置
@@ -176,6 +213,70 @@ class TestConfigManager(unittest.TestCase):
         self.assertEqual(self.config_manager.get_setting("source_language"), "english")
         self.assertEqual(self.config_manager.get_setting("max_concurrent_tasks"), 3)
 
+    def test_update_settings(self):
+        """测试批量设置配置项"""
+        self.assertTrue(self.config_manager.update_settings({
+            "max_concurrent_tasks": 6,
+            "api_call_delay": 1.5
+        }))
+
+        reloaded = ConfigManager(self.temp_file.name)
+        self.assertEqual(reloaded.get_setting("max_concurrent_tasks"), 6)
+        self.assertEqual(reloaded.get_setting("api_call_delay"), 1.5)
+
+    def test_api_keys_cache_invalidation(self):
+        """测试API密钥缓存在密钥变更后失效"""
+        first = self.config_manager.get_api_keys()
+        version = self.config_manager.keys_version
+        self.assertIs(self.config_manager.get_api_keys(), first)
+
+        self.config_manager.add_api_key("AIzaSyTest1234567890123456789012345678")
+        self.assertGreater(self.config_manager.keys_version, version)
+        self.assertIn("AIzaSyTest1234567890123456789012345678", self.config_manager.get_api_keys())
+
+    def test_settings_version_changes_on_write(self):
+        """测试配置版本号在设置变更时递增"""
+        version = self.config_manager.settings_version
+        self.config_manager.set_setting("batch_max_entries", 4)
+        self.assertGreater(self.config_manager.settings_version, version)
+
+        version = self.config_manager.settings_version
+        self.config_manager.update_settings({"key_rotation_strategy": "priority"})
+        self.assertGreater(self.config_manager.settings_version, version)
+
+    def test_set_setting_coalesces_writes(self):
+        """测试连续设置只在刷新时写盘一次"""
+        self.config_manager.save_config()
+        with open(self.temp_file.name, 'r', encoding='utf-8') as f:
+            before = json.load(f)
+
+        for tasks in range(1, 9):
+            self.config_manager.set_setting("max_concurrent_tasks", tasks)
+
+        self.assertTrue(self.config_manager.flush())
+        with open(self.temp_file.name, 'r', encoding='utf-8') as f:
+            after = json.load(f)
+
+        self.assertNotEqual(before.get("max_concurrent_tasks"), 8)
+        self.assertEqual(after["max_concurrent_tasks"], 8)
+        self.assertTrue(self.config_manager.flush())
+
+    def test_timer_flush_failure_is_reported(self):
+        """测试定时写盘失败时通过回调报告错误，更改保留待重试"""
+        errors = []
+        self.config_manager.flush_error_callback = errors.append
+        with patch.object(self.config_manager, "_schedule_flush", lambda: setattr(self.config_manager, "_dirty", True)):
+            self.config_manager.set_setting("max_concurrent_tasks", 5)
+
+        with patch("config.config_manager.os.replace", side_effect=OSError("disk full")):
+            self.config_manager._flush_from_timer()
+
+        self.assertEqual(len(errors), 1)
+        self.assertIn("disk full", errors[0])
+        self.assertTrue(self.config_manager._dirty)
+        self.assertTrue(self.config_manager.flush())
+        self.assertIsNone(self.config_manager.last_save_error)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,96 @@
+"""
+文件处理工具测试
+
+测试目录扫描等文件处理功能
+"""
+
+import os
+import tempfile
+import unittest
+
+from parsers.yml_parser import YMLParser
+from utils.file_utils import FileProcessor, iter_yml_files, make_relpath
+
+
+class TestIterYmlFiles(unittest.TestCase):
+    """目录扫描测试类"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        root = self.temp_dir.name
+
+        os.makedirs(os.path.join(root, "english", "sub"))
+        os.makedirs(os.path.join(root, ".git"))
+
+        self.expected = {
+            os.path.join(root, "english", "a_l_english.yml"),
+            os.path.join(root, "english", "sub", "b_l_english.YML"),
+            os.path.join(root, "c.yaml"),
+        }
+        for path in self.expected:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("l_english:\n")
+
+        for path in (os.path.join(root, "readme.txt"), os.path.join(root, ".git", "x.yml")):
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("")
+
+    def tearDown(self):
+        """测试后清理"""
+        self.temp_dir.cleanup()
+
+    def test_finds_nested_yml_files(self):
+        """测试递归查找YML文件并跳过版本控制目录"""
+        found = set(iter_yml_files(self.temp_dir.name))
+        self.assertEqual(found, self.expected)
+
+    def test_missing_directory(self):
+        """测试不存在的目录"""
+        missing = os.path.join(self.temp_dir.name, "missing")
+        self.assertEqual(list(iter_yml_files(missing)), [])
+
+    def test_scan_with_batches(self):
+        """测试分批回调扫描结果"""
+        processor = FileProcessor(YMLParser())
+        batches = []
+
+        result = processor.scan_yml_files(self.temp_dir.name, on_batch=batches.append, batch_size=2)
+
+        self.assertEqual([len(batch) for batch in batches], [2, 1])
+        self.assertEqual(set(result), self.expected)
+        self.assertEqual({p for batch in batches for p in batch}, self.expected)
+
+    def test_analyze_uses_given_language_info(self):
+        """测试分析目录结构时使用调用方提供的语言信息函数"""
+        processor = FileProcessor(YMLParser())
+        calls = []
+
+        def language_info(file_path):
+            calls.append(file_path)
+            return "english", 1
+
+        result = processor.analyze_directory_structure(self.temp_dir.name, language_info)
+
+        self.assertEqual(set(calls), self.expected)
+        self.assertEqual(set(result["english"]), self.expected)
+
+
+class TestMakeRelpath(unittest.TestCase):
+    """相对路径计算测试类"""
+
+    def test_matches_os_relpath(self):
+        """测试与os.path.relpath结果一致"""
+        root = os.path.abspath(os.path.join("mod", "localization"))
+        relpath = make_relpath(root)
+
+        for path in (
+            os.path.join(root, "english", "a_l_english.yml"),
+            os.path.join(os.path.dirname(root), "other.yml"),
+            os.path.join(root + "_extra", "b.yml"),
+        ):
+            self.assertEqual(relpath(path), os.path.relpath(path, root))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,161 @@
+"""
+Gemini翻译器测试
+
+测试译文提取和合并翻译的响应解析
+"""
+
+import unittest
+from unittest.mock import Mock, patch
+
+from config.constants import BATCH_ENTRY_MISSING, TRANSLATION_EXTRACTION_FAILED
+from core.gemini_translator import (
+    ApiResult, GeminiTranslator, _SerializedModel, _bind_key_client, _parse_retry_after, uses_chinese_prompt
+)
+from utils.genai_loader import GEMINI_AVAILABLE, load_genai
+
+
+class TestTranslateBatch(unittest.TestCase):
+    """合并翻译测试类"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.translator = GeminiTranslator(Mock(), translator_id="test")
+
+    def test_splits_numbered_response(self):
+        """测试按编号拆分响应"""
+        response = "<<<1>>>$$你好$$<<</1>>>\n<<<2>>>$$再见 [Root.GetName]$$<<</2>>>"
+        with patch.object(self.translator, "_call_actual_api", return_value=ApiResult(response, 120)):
+            translations, tokens, errors, rate_info = self.translator.translate_batch(
+                ["Hello", "Bye [Root.GetName]"], "english", "simp_chinese", "", "model", "key-1234"
+            )
+
+        self.assertEqual(translations, ["你好", "再见 [Root.GetName]"])
+        self.assertEqual(tokens, 120)
+        self.assertEqual(errors, [None, None])
+        self.assertIsNone(rate_info)
+
+    def test_missing_entries_returned_to_caller(self):
+        """测试响应缺失的条目不在翻译器内重试，而是标记后交还调用方"""
+        response = ApiResult("<<<1>>>$$Bonjour$$<<</1>>>", 100)
+        with patch.object(self.translator, "_call_actual_api", return_value=response) as mock_call:
+            translations, tokens, errors, rate_info = self.translator.translate_batch(
+                ["Hello", "Bye"], "english", "french", "", "model", "key-1234"
+            )
+
+        self.assertEqual(mock_call.call_count, 1)
+        self.assertEqual(translations, ["Bonjour", "Bye"])
+        self.assertEqual(tokens, 100)
+        self.assertEqual(errors, [None, BATCH_ENTRY_MISSING])
+        self.assertIsNone(rate_info)
+
+    def test_chinese_prompt_pair(self):
+        """测试英语与简体中文互译使用中文提示词"""
+        self.assertTrue(uses_chinese_prompt("english", "simp_chinese"))
+        self.assertTrue(uses_chinese_prompt("SIMP_CHINESE", "English"))
+        self.assertFalse(uses_chinese_prompt("english", "french"))
+
+
+class TestRetryAfter(unittest.TestCase):
+    """限流重试等待时间测试类"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.translator = GeminiTranslator(Mock(), translator_id="test")
+
+    def test_parse_retry_after(self):
+        """测试从响应头和错误信息中解析等待时间"""
+        error = Exception("429 Resource exhausted")
+        error.response = Mock(headers={"retry-after": "7"})
+        self.assertEqual(_parse_retry_after(error), 7.0)
+        self.assertEqual(_parse_retry_after(Exception("429 quota exceeded. Please retry in 27.5s.")), 27.5)
+        self.assertEqual(_parse_retry_after(Exception("429 retry_delay {\n  seconds: 43\n}")), 43.0)
+        self.assertIsNone(_parse_retry_after(Exception("429 Resource exhausted")))
+
+    def test_retry_after_skips_local_retries(self):
+        """测试服务端给出等待时间时不在当前密钥上重试"""
+        result = ApiResult(None, error="Rate limit exceeded", retry_after=12.0)
+        with patch.object(self.translator, "_call_actual_api", return_value=result) as mock_call:
+            text, tokens, error, rate_info = self.translator.translate(
+                "Hello", "english", "simp_chinese", "", "model", "key-1234"
+            )
+
+        self.assertEqual(mock_call.call_count, 1)
+        self.assertEqual((text, tokens, error), ("Hello", 0, "Rate limit exceeded"))
+        self.assertEqual(rate_info, {"retry_after": 12.0})
+
+
+class TestModelCache(unittest.TestCase):
+    """模型缓存测试类"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.translator = GeminiTranslator(Mock(), translator_id="test")
+
+    def test_model_reused_per_key_and_model(self):
+        """测试同一密钥和模型只创建一次GenerativeModel"""
+        genai = Mock(__version__="0.8.3")
+        genai.GenerativeModel.side_effect = lambda model_name: Mock()
+        clients = {"key-1234": Mock(), "key-5678": Mock()}
+        with patch.object(self.translator, "_configure_gemini", return_value=True) as mock_configure, \
+                patch.dict("core.gemini_translator._KEY_CLIENTS", clients), \
+                patch("core.gemini_translator.load_genai", return_value=(genai, Mock())):
+            first = self.translator._get_model("key-1234", "model-a")
+            second = self.translator._get_model("key-1234", "model-a")
+            self.translator._get_model("key-5678", "model-a")
+
+        self.assertIs(first, second)
+        self.assertIs(first._client, clients["key-1234"])
+        self.assertEqual(genai.GenerativeModel.call_count, 2)
+        self.assertEqual(mock_configure.call_count, 2)
+
+    def test_falls_back_when_client_cannot_be_bound(self):
+        """测试SDK版本未经验证或模型没有_client属性时改用串行替代模型"""
+        genai = Mock(__version__="1.0.0")
+        with patch.object(self.translator, "_configure_gemini", return_value=True), \
+                patch.dict("core.gemini_translator._KEY_CLIENTS", {"key-1234": Mock()}), \
+                patch("core.gemini_translator.load_genai", return_value=(genai, Mock())):
+            model = self.translator._get_model("key-1234", "model-a")
+
+        self.assertIsInstance(model, _SerializedModel)
+        self.assertFalse(_bind_key_client(Mock(__version__="0.8.3"), object(), Mock()))
+
+    @unittest.skipUnless(GEMINI_AVAILABLE, "google-generativeai未安装")
+    def test_installed_sdk_supports_client_binding(self):
+        """测试已安装的SDK仍支持按密钥绑定客户端，SDK升级后私有属性消失时失败"""
+        genai, _ = load_genai()
+        client = Mock()
+        model = genai.GenerativeModel("gemini-2.0-flash")
+
+        self.assertTrue(_bind_key_client(genai, model, client))
+        self.assertIs(model._client, client)
+
+
+class TestExtractFinalTranslation(unittest.TestCase):
+    """最终译文提取测试类"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.translator = GeminiTranslator(Mock(), translator_id="test")
+
+    def test_extracts_wrapped_text(self):
+        """测试提取$$包裹的译文"""
+        response = "第一步...\n$$\n  最终译文 $VALUE$  \n$$"
+        self.assertEqual(self.translator.extract_final_translation(response), "最终译文 $VALUE$")
+
+    def test_missing_delimiters(self):
+        """测试不含$$的响应"""
+        self.assertIsNone(self.translator.extract_final_translation("no delimiters $here"))
+        self.assertIsNone(self.translator.extract_final_translation(None))
+
+    def test_translate_reports_extraction_failure(self):
+        """测试无法提取译文时返回原文并报告错误，而不是当作成功"""
+        with patch.object(self.translator, "_call_actual_api", return_value=ApiResult("no delimiters", 30)):
+            text, tokens, error, rate_info = self.translator.translate(
+                "Hello", "english", "french", "", "model", "key-1234"
+            )
+
+        self.assertEqual((text, tokens, error, rate_info), ("Hello", 30, TRANSLATION_EXTRACTION_FAILED, None))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+"""
+日志工具测试
+
+测试应用程序日志记录器的后台写入
+"""
+
+import os
+import tempfile
+import unittest
+
+from utils.logging_utils import ApplicationLogger
+
+
+class TestApplicationLogger(unittest.TestCase):
+    """应用程序日志记录器测试类"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.log_file = os.path.join(self.temp_dir.name, "logs", "test.log")
+
+    def tearDown(self):
+        """测试后清理"""
+        self.temp_dir.cleanup()
+
+    def test_close_flushes_pending_messages(self):
+        """测试关闭时写出所有待处理日志"""
+        logger = ApplicationLogger("TestApplicationLogger", log_file=self.log_file)
+        for i in range(100):
+            logger.log_message(f"message {i}", "info")
+        logger.log_message("warning message", "warn")
+        logger.close()
+
+        with open(self.log_file, 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+
+        self.assertEqual(len(lines), 101)
+        self.assertTrue(lines[0].endswith("INFO - message 0"))
+        self.assertTrue(lines[-1].endswith("WARNING - warning message"))
+
+    def test_callbacks_run_inline(self):
+        """测试回调函数在调用线程中同步执行"""
+        received = []
+        logger = ApplicationLogger("TestApplicationLogger")
+        logger.add_log_callback(lambda message, level: received.append((message, level)))
+        logger.log_message("hello", "debug")
+        self.assertEqual(received, [("hello", "debug")])
+        logger.close()
+
+    def test_level_gate_skips_formatting(self):
+        """测试低于最低级别的消息被丢弃且不进行格式化"""
+        received = []
+        logger = ApplicationLogger("TestApplicationLogger", level="info")
+        logger.add_log_callback(lambda message, level: received.append((message, level)))
+
+        # 参数数量不匹配，若进行格式化会抛出异常
+        logger.log_message("skipped %s %s", "debug", "only-one")
+        logger.log_message("value: %d", "info", 42)
+
+        self.assertFalse(logger.is_enabled_for("debug"))
+        self.assertEqual(received, [("value: 42", "info")])
+        logger.close()
+
+    def test_file_level_separate_from_callback_level(self):
+        """测试日志文件默认只记录INFO及以上级别，与回调级别无关"""
+        received = []
+        logger = ApplicationLogger("TestApplicationLogger", log_file=self.log_file, level="debug")
+        logger.add_log_callback(lambda message, level: received.append(message))
+        logger.log_message("debug message", "debug")
+        logger.log_message("info message", "info")
+        logger.close()
+
+        with open(self.log_file, 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+
+        self.assertEqual(received, ["debug message", "info message"])
+        self.assertEqual(len(lines), 1)
+        self.assertTrue(lines[0].endswith("INFO - info message"))
+
+    def test_messages_after_close_are_dropped(self):
+        """测试关闭后记录的日志被丢弃，重复关闭无副作用"""
+        received = []
+        logger = ApplicationLogger("TestApplicationLogger", log_file=self.log_file)
+        logger.add_log_callback(lambda message, level: received.append(message))
+        logger.close()
+        logger.log_message("late message", "error")
+        logger.close()
+
+        self.assertFalse(logger.is_enabled_for("error"))
+        self.assertEqual(received, [])
+        self.assertTrue(logger._queue.empty())
+
+
+if __name__ == '__main__':
+    unittest.main()
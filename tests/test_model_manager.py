@@ -0,0 +1,79 @@
+"""
+模型管理器测试
+
+测试模型列表的磁盘缓存
+"""
+
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from config.config_manager import ConfigManager
+from core.model_manager import ModelManager
+
+
+class TestModelDiskCache(unittest.TestCase):
+    """模型列表磁盘缓存测试类"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.config_manager = ConfigManager(os.path.join(self.temp_dir.name, "config.json"))
+        self.config_manager.add_api_key("test-key-1234")
+        self.cache_file = os.path.join(self.temp_dir.name, "models.json")
+        self.manager = ModelManager(self.config_manager, cache_file=self.cache_file)
+
+    def tearDown(self):
+        """测试后清理"""
+        # 先写出配置并取消延迟写盘的定时器，避免其在删除目录时写入文件
+        self.config_manager.flush()
+        self.temp_dir.cleanup()
+
+    def test_cache_round_trip(self):
+        """测试签名匹配时从磁盘加载模型列表"""
+        models = ["models/gemini-2.0-flash"]
+        self.manager._save_disk_cache(models)
+
+        fresh = ModelManager(self.config_manager, cache_file=self.cache_file)
+        self.assertEqual(fresh.get_available_models(), models)
+
+    def test_cache_invalidated_by_key_change(self):
+        """测试更换API密钥后缓存失效"""
+        self.manager._save_disk_cache(["models/gemini-2.0-flash"])
+
+        self.config_manager.remove_api_key("test-key-1234")
+        self.config_manager.add_api_key("other-key-5678")
+        self.assertIsNone(self.manager._load_disk_cache())
+
+    def test_stale_cache_used_while_refreshing(self):
+        """测试磁盘缓存过期时先返回旧列表并在后台刷新"""
+        models = ["models/gemini-2.0-flash"]
+        self.manager._save_disk_cache(models)
+        with open(self.cache_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        data["fetched_at"] = 0
+        with open(self.cache_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+
+        fresh = ModelManager(self.config_manager, cache_file=self.cache_file)
+        with patch.object(fresh, "refresh_models_async") as refresh:
+            self.assertEqual(fresh.get_available_models(), models)
+        refresh.assert_called_once_with()
+
+    def test_cached_models_never_fetch(self):
+        """测试只读缓存时不请求API，没有缓存则返回默认列表"""
+        with patch.object(self.manager, "_fetch_models_from_api") as fetch:
+            self.assertEqual(self.manager.get_cached_models(), self.manager.default_models)
+        fetch.assert_not_called()
+
+    def test_clear_cache_removes_file(self):
+        """测试清除缓存时删除磁盘文件"""
+        self.manager._save_disk_cache(["models/gemini-2.0-flash"])
+        self.manager.clear_cache()
+        self.assertFalse(os.path.exists(self.cache_file))
+
+
+if __name__ == '__main__':
+    unittest.main()
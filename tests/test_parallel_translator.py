@@ -0,0 +1,350 @@
+"""
+并行翻译器测试
+
+测试任务合并等不依赖网络的逻辑
+"""
+
+import unittest
+from concurrent.futures import Future
+from unittest.mock import Mock, patch
+
+from config.constants import BATCH_ENTRY_MISSING, BATCH_MAX_ENTRIES, TASK_MAX_RETRIES
+from core.parallel_translator import _STOP_SENTINEL, ParallelTranslator, _LazyTraceback
+from utils.rate_limit import AIMDLimiter
+
+
+def make_task(entry_id, text, target_lang="french"):
+    """构造翻译任务"""
+    return {
+        "entry_id": entry_id,
+        "text": text,
+        "source_lang": "english",
+        "target_lang": target_lang,
+        "game_mod_style": "",
+        "model_name": "gemini-2.0-flash",
+        "original_line_content": None,
+    }
+
+
+def make_translator():
+    """构造使用单个密钥和默认设置的并行翻译器"""
+    config_manager = Mock()
+    config_manager.get_api_keys.return_value = ("key-a",)
+    config_manager.get_setting.side_effect = lambda key, default=None: default
+    return ParallelTranslator(Mock(), config_manager)
+
+
+def next_task(translator):
+    """取出队首任务"""
+    return translator.translation_queue.get_nowait()[2]
+
+
+class TestCollectBatch(unittest.TestCase):
+    """合并短条目测试类"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.translator = make_translator()
+
+    def test_merges_same_group(self):
+        """测试合并语言、模型和风格相同的短条目"""
+        for i in range(1, 4):
+            self.translator._enqueue(make_task(f"e{i}", f"Text {i}"))
+
+        batch = self.translator._collect_batch(make_task("e0", "Text 0"), None, 0, BATCH_MAX_ENTRIES)
+
+        self.assertEqual([task["entry_id"] for task, _ in batch], ["e0", "e1", "e2", "e3"])
+        self.assertTrue(self.translator.translation_queue.empty())
+
+    def test_stops_at_first_mismatch(self):
+        """测试遇到不可合并的任务时停止，不继续扫描队列"""
+        self.translator._enqueue(make_task("e1", "Text 1"))
+        self.translator._enqueue(make_task("e2", "Text 2", target_lang="japanese"))
+        self.translator._enqueue(make_task("e3", "Text 3"))
+
+        batch = self.translator._collect_batch(make_task("e0", "Text 0"), None, 0, BATCH_MAX_ENTRIES)
+
+        self.assertEqual([task["entry_id"] for task, _ in batch], ["e0", "e1"])
+        remaining = [next_task(self.translator)["entry_id"] for _ in range(2)]
+        self.assertEqual(remaining, ["e2", "e3"])
+
+    def test_skips_tasks_waiting_for_retry(self):
+        """测试不合并尚未到重试时间的任务"""
+        self.translator._enqueue(make_task("e1", "Text 1"), delay=60)
+
+        batch = self.translator._collect_batch(make_task("e0", "Text 0"), None, 0, BATCH_MAX_ENTRIES)
+
+        self.assertEqual([task["entry_id"] for task, _ in batch], ["e0"])
+        self.assertEqual(self.translator.get_queue_size(), 1)
+
+    def test_skips_unbatchable_tasks(self):
+        """测试多行文本、中文提示词语言对和曾在合并响应中缺失的条目不参与合并"""
+        multi_line = make_task("e1", "Line 1\nLine 2")
+        chinese = make_task("e2", "Text 2", target_lang="simp_chinese")
+        missing = make_task("e3", "Text 3")
+        missing["no_batch"] = True
+
+        for task in (multi_line, chinese, missing):
+            self.translator._enqueue(make_task("e9", "Text 9", target_lang=task["target_lang"]))
+            batch = self.translator._collect_batch(task, None, 0, BATCH_MAX_ENTRIES)
+            self.assertEqual([t["entry_id"] for t, _ in batch], [task["entry_id"]])
+            self.assertEqual(next_task(self.translator)["entry_id"], "e9")
+
+    def test_missing_batch_entries_are_requeued(self):
+        """测试合并响应中缺失的条目重新入队单独翻译，不直接产出结果"""
+        self.translator.concurrency = AIMDLimiter(1, initial_limit=1)
+        translator = Mock()
+        translator.translate_batch.return_value = (["Un", "Two"], 100, [None, BATCH_ENTRY_MISSING], None)
+        batch = [(make_task("e1", "One"), None), (make_task("e2", "Two"), None)]
+
+        self.translator._translate_batch(translator, batch, "key-a", 0)
+
+        self.assertEqual(self.translator.get_translation_result(timeout=0)["entry_id"], "e1")
+        self.assertIsNone(self.translator.get_translation_result(timeout=0))
+        requeued = next_task(self.translator)
+        self.assertEqual(requeued["entry_id"], "e2")
+        self.assertTrue(requeued["no_batch"])
+
+    def test_batch_caches_only_extracted_translations(self):
+        """测试合并翻译只把真实提取出的译文写入缓存，与原文相同的结果不缓存"""
+        self.translator.concurrency = AIMDLimiter(1, initial_limit=1)
+        self.translator.translation_cache = Mock()
+        translator = Mock()
+        translator.translate_batch.return_value = (["Un", "Two"], 100, [None, None], None)
+        batch = [(make_task("e1", "One"), "key-1"), (make_task("e2", "Two"), "key-2")]
+
+        self.translator._translate_batch(translator, batch, "key-a", 0)
+
+        self.translator.translation_cache.set.assert_called_once_with("key-1", "Un")
+
+    def test_single_task_emits_and_caches(self):
+        """测试单独翻译的任务产出结果并把译文写入缓存"""
+        self.translator.concurrency = AIMDLimiter(1, initial_limit=1)
+        self.translator.translation_cache = Mock()
+        translator = Mock()
+        translator.translate.return_value = ("Un", 10, None, None)
+
+        self.translator._translate_single(translator, make_task("e1", "One"), "key-1", "key-a", 0)
+
+        self.assertEqual(self.translator.get_translation_result(timeout=0)["translated_text"], "Un")
+        self.translator.translation_cache.set.assert_called_once_with("key-1", "Un")
+
+
+class TestRetryBackoff(unittest.TestCase):
+    """任务重试退避测试类"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.translator = make_translator()
+
+    def test_retry_is_delayed_behind_new_tasks(self):
+        """测试重试的任务按退避时间推迟，新任务先出队"""
+        failed = make_task("e1", "Text 1")
+        self.translator._retry_later([failed], "boom")
+        self.translator._enqueue(make_task("e2", "Text 2"))
+
+        self.assertEqual(next_task(self.translator)["entry_id"], "e2")
+        self.assertEqual(failed["retry_count"], 1)
+
+    def test_gives_up_after_max_retries(self):
+        """测试超过最大重试次数后作为失败结果返回"""
+        task = make_task("e1", "Text 1")
+        task["retry_count"] = TASK_MAX_RETRIES
+
+        self.translator._retry_later([task], "boom")
+
+        self.assertTrue(self.translator.is_queue_empty())
+        result = self.translator.get_translation_result(timeout=0)
+        self.assertEqual((result["entry_id"], result["api_error_type"]), ("e1", "boom"))
+
+
+class TestTaskBuffer(unittest.TestCase):
+    """任务缓冲区测试类"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.translator = make_translator()
+        self.translator._reset_task_slots(2)
+
+    def test_results_release_slots(self):
+        """测试缓冲区满时生产者受压，产出结果后释放名额"""
+        self.assertTrue(self.translator.add_translation_task("e1", "A", "english", "simp_chinese", "", "m"))
+        self.assertTrue(self.translator.add_translation_task("e2", "B", "english", "simp_chinese", "", "m"))
+        self.assertTrue(self.translator.is_producer_pressured())
+        self.assertFalse(self.translator._task_slots.acquire(blocking=False))
+
+        task = next_task(self.translator)
+        self.translator._emit_result(task, "甲", 1, None)
+
+        self.assertFalse(self.translator.is_producer_pressured())
+        self.assertEqual(self.translator.get_translation_result(timeout=0)["entry_id"], "e1")
+        self.assertTrue(self.translator.add_translation_task("e3", "C", "english", "simp_chinese", "", "m"))
+
+    def test_stale_tasks_dropped_after_stop(self):
+        """测试停止后仍在调用API的旧任务不会向新一轮的队列放回任务、产出结果或释放名额"""
+        self.translator.add_translation_task("e1", "A", "english", "simp_chinese", "", "m")
+        task = next_task(self.translator)
+        finished = Future()
+        finished.set_result(None)
+        self.translator.executor = Mock()
+        self.translator.workers = [finished]
+
+        self.translator.stop_workers()
+        self.translator._retry_later([task], "boom")
+        self.translator._emit_result(task, "甲", 1, None)
+
+        self.assertTrue(self.translator.is_queue_empty())
+        self.assertIsNone(self.translator.get_translation_result(timeout=0))
+        self.assertEqual(self.translator._resident_tasks, 0)
+        self.assertTrue(self.translator._task_slots.acquire(blocking=False))
+        self.assertTrue(self.translator._task_slots.acquire(blocking=False))
+        self.assertFalse(self.translator._task_slots.acquire(blocking=False))
+
+
+class TestDeduplication(unittest.TestCase):
+    """重复原文去重测试类"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.translator = make_translator()
+
+    def _add(self, entry_id, text):
+        """添加一个任务"""
+        return self.translator.add_translation_task(entry_id, text, "english", "simp_chinese", "", "m")
+
+    def _drain_results(self):
+        """取出结果队列中的全部结果"""
+        results = []
+        while True:
+            result = self.translator.get_translation_result(timeout=0)
+            if result is None:
+                return results
+            results.append(result)
+
+    def test_inflight_duplicates_share_result(self):
+        """测试正在翻译的原文只入队一次，重复任务共享其结果"""
+        self._add("e1", "Yes")
+        self._add("e2", "Yes")
+        self._add("e3", "No")
+        self.assertEqual(self.translator.get_queue_size(), 2)
+
+        task = next_task(self.translator)
+        self.translator._emit_result(task, "是", 5, None)
+
+        results = self._drain_results()
+        self.assertEqual([(r["entry_id"], r["translated_text"]) for r in results], [("e1", "是"), ("e2", "是")])
+        self.assertEqual(results[1]["token_count"], 0)
+
+    def test_batch_add_deduplicates_and_takes_slots(self):
+        """测试批量添加时在批内去重，只为入队的任务占用缓冲区名额"""
+        self.translator._reset_task_slots(2)
+        tasks = [make_task("e1", "Yes"), make_task("e2", "Yes"), make_task("e3", "No")]
+
+        self.assertEqual(self.translator.add_translation_tasks(tasks), 3)
+        self.assertEqual(self.translator.get_queue_size(), 2)
+        self.assertEqual(self.translator._resident_tasks, 2)
+
+        self.translator._emit_result(next_task(self.translator), "是", 5, None)
+        self.assertEqual([r["entry_id"] for r in self._drain_results()], ["e1", "e2"])
+
+    def test_recent_translation_skips_queue(self):
+        """测试最近翻译过的原文直接产出结果"""
+        self._add("e1", "Yes")
+        self.translator._emit_result(next_task(self.translator), "是", 5, None)
+        self._drain_results()
+
+        self._add("e2", "Yes")
+        self.assertTrue(self.translator.is_queue_empty())
+        self.assertEqual(self._drain_results()[0]["translated_text"], "是")
+
+    def test_untranslated_fallback_not_reused(self):
+        """测试返回原文的结果不记入去重缓存，之后相同原文仍需翻译"""
+        self._add("e1", "Yes")
+        self.translator._emit_result(next_task(self.translator), "Yes", 5, None)
+        self._drain_results()
+
+        self._add("e2", "Yes")
+        self.assertEqual(self.translator.get_queue_size(), 1)
+
+
+class TestWorkerScaling(unittest.TestCase):
+    """工作线程数自适应测试类"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.translator = make_translator()
+        self.translator.executor = Mock()
+        self.translator.max_workers = 4
+        self.translator.concurrency = AIMDLimiter(4, initial_limit=2)
+        self.translator.workers = [Mock(**{"done.return_value": False}) for _ in range(2)]
+
+    def test_grows_when_queue_is_deep_and_latency_healthy(self):
+        """测试队列积压且延迟正常时增加一个工作线程"""
+        for i in range(10):
+            self.translator._enqueue(make_task(f"e{i}", "Text"))
+
+        self.translator._record_outcome(1.0, None)
+
+        self.translator.executor.submit.assert_called_once()
+        self.assertEqual(len(self.translator.workers), 3)
+
+    def test_overload_retires_one_worker(self):
+        """测试出现过载错误时让一个工作线程退出"""
+        for i in range(10):
+            self.translator._enqueue(make_task(f"e{i}", "Text"))
+
+        self.translator._record_outcome(1.0, "Rate limit exceeded")
+
+        self.translator.executor.submit.assert_not_called()
+        self.assertIs(next_task(self.translator), _STOP_SENTINEL)
+
+    def test_no_growth_while_throttled(self):
+        """测试有工作线程在请求间隔或配额上等待时不扩容"""
+        for i in range(10):
+            self.translator._enqueue(make_task(f"e{i}", "Text"))
+
+        self.translator._throttled = True
+        self.translator._record_outcome(1.0, None)
+
+        self.translator.executor.submit.assert_not_called()
+        self.assertFalse(self.translator._throttled)
+
+    def test_no_growth_at_concurrency_limit(self):
+        """测试并发已达上限时不扩容"""
+        for i in range(10):
+            self.translator._enqueue(make_task(f"e{i}", "Text"))
+
+        self.translator.concurrency = AIMDLimiter(2, initial_limit=2)
+        self.translator.concurrency.acquire()
+        self.translator.concurrency.acquire()
+        self.translator._record_outcome(1.0, None)
+
+        self.translator.executor.submit.assert_not_called()
+
+    def test_checks_at_most_once_per_interval(self):
+        """测试检查间隔内不重复扩容"""
+        for i in range(10):
+            self.translator._enqueue(make_task(f"e{i}", "Text"))
+
+        self.translator._record_outcome(1.0, None)
+        self.translator._record_outcome(1.0, None)
+
+        self.assertEqual(self.translator.executor.submit.call_count, 1)
+
+
+class TestLazyTraceback(unittest.TestCase):
+    """延迟格式化异常堆栈测试类"""
+
+    def test_formats_only_when_stringified(self):
+        """测试只有转为字符串时才格式化堆栈"""
+        try:
+            raise ValueError("boom")
+        except ValueError as e:
+            with patch("core.parallel_translator.traceback.format_exception") as format_exception:
+                lazy = _LazyTraceback(e)
+                format_exception.assert_not_called()
+            self.assertIn("ValueError: boom", str(lazy))
+
+
+if __name__ == '__main__':
+    unittest.main()
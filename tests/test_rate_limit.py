@@ -0,0 +1,137 @@
+"""
+速率限制工具测试
+
+测试令牌桶限速器、滑动窗口配额和AIMD并发限制器
+"""
+
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from utils.rate_limit import AIMDLimiter, SlidingWindowQuota, TokenBucket
+
+
+class TestTokenBucket(unittest.TestCase):
+    """令牌桶测试类"""
+
+    def test_burst_then_throttle(self):
+        """测试突发容量用尽后需要等待"""
+        bucket = TokenBucket(rate_per_sec=1.0, burst=2)
+        self.assertTrue(bucket.try_acquire())
+        self.assertTrue(bucket.try_acquire())
+        self.assertFalse(bucket.try_acquire())
+
+    def test_acquire_sleeps_minimal_time(self):
+        """测试acquire只等待获取令牌所需的时间"""
+        bucket = TokenBucket(rate_per_sec=2.0, burst=1)
+        bucket.acquire()
+
+        with patch("utils.rate_limit.time.sleep") as mock_sleep, \
+                patch("utils.rate_limit.time.monotonic", return_value=bucket._last_refill):
+            mock_sleep.side_effect = lambda seconds: setattr(
+                bucket, "_tokens", bucket._tokens + seconds * bucket.rate_per_sec
+            )
+            waited = bucket.acquire()
+
+        self.assertAlmostEqual(waited, 0.5, places=3)
+
+    def test_from_delay(self):
+        """测试由请求间隔换算速率"""
+        bucket = TokenBucket.from_delay(4.0, burst=3)
+        self.assertAlmostEqual(bucket.rate_per_sec, 0.25)
+        self.assertEqual(bucket.capacity, 3)
+
+    def test_invalid_rate(self):
+        """测试非法速率"""
+        with self.assertRaises(ValueError):
+            TokenBucket(0)
+
+
+class TestSlidingWindowQuota(unittest.TestCase):
+    """滑动窗口配额测试类"""
+
+    def test_request_limit_waits_for_oldest_entry(self):
+        """测试请求数达到上限时只等待到最早一条记录移出窗口"""
+        quota = SlidingWindowQuota(max_requests=2, max_tokens=1000, window=60.0)
+        with patch("utils.rate_limit.time.monotonic", return_value=0.0):
+            self.assertEqual(quota.try_reserve(), 0.0)
+        with patch("utils.rate_limit.time.monotonic", return_value=10.0):
+            self.assertEqual(quota.try_reserve(), 0.0)
+            self.assertAlmostEqual(quota.try_reserve(), 50.0)
+        with patch("utils.rate_limit.time.monotonic", return_value=60.0):
+            self.assertEqual(quota.try_reserve(), 0.0)
+            self.assertEqual(quota.request_count, 2)
+
+    def test_token_limit_and_adjust(self):
+        """测试token数限额以及按实际用量修正"""
+        quota = SlidingWindowQuota(max_requests=100, max_tokens=1000, window=60.0)
+        with patch("utils.rate_limit.time.monotonic", return_value=0.0):
+            self.assertEqual(quota.try_reserve(800), 0.0)
+            self.assertGreater(quota.try_reserve(300), 0)
+            quota.adjust(-200)
+            self.assertEqual(quota.try_reserve(300), 0.0)
+            self.assertEqual(quota.token_sum, 900)
+
+    def test_acquire_interrupted_by_stop_event(self):
+        """测试设置停止事件后等待立即返回且不记录请求"""
+        quota = SlidingWindowQuota(max_requests=1, max_tokens=1000, window=60.0)
+        quota.try_reserve()
+        stop_event = threading.Event()
+        stop_event.set()
+
+        started = time.monotonic()
+        self.assertEqual(quota.acquire(stop_event=stop_event), 0.0)
+        self.assertLess(time.monotonic() - started, 1.0)
+        self.assertEqual(quota.request_count, 1)
+
+    def test_oversized_request_allowed_when_empty(self):
+        """测试窗口为空时超过限额的单次请求也能发出"""
+        quota = SlidingWindowQuota(max_requests=1, max_tokens=10)
+        self.assertEqual(quota.try_reserve(50), 0.0)
+
+
+class TestAIMDLimiter(unittest.TestCase):
+    """AIMD并发限制器测试类"""
+
+    def test_error_halves_and_success_recovers(self):
+        """测试过载时减半、延迟达标时逐步恢复"""
+        limiter = AIMDLimiter(8, latency_target=1.0, window=4)
+        limiter.on_error()
+        self.assertEqual(limiter.limit, 4)
+        limiter.on_error()
+        limiter.on_error()
+        limiter.on_error()
+        self.assertEqual(limiter.limit, 1)
+
+        limiter.on_success(0.5)
+        limiter.on_success(0.5)
+        self.assertEqual(limiter.limit, 3)
+
+    def test_slow_responses_do_not_grow(self):
+        """测试平均延迟超过目标时不增大并发"""
+        limiter = AIMDLimiter(4, latency_target=1.0, window=4)
+        limiter.on_error()
+        limiter.on_success(5.0)
+        self.assertEqual(limiter.limit, 2)
+
+    def test_initial_limit_grows_to_max(self):
+        """测试从初始上限开始，延迟达标时增长到最大值为止"""
+        limiter = AIMDLimiter(3, latency_target=1.0, initial_limit=1)
+        self.assertEqual(limiter.limit, 1)
+        for _ in range(5):
+            limiter.on_success(0.5)
+        self.assertEqual(limiter.limit, 3)
+
+    def test_acquire_respects_limit(self):
+        """测试在途请求数达到上限时acquire超时"""
+        limiter = AIMDLimiter(2)
+        limiter.on_error()
+        self.assertTrue(limiter.acquire(timeout=0))
+        self.assertFalse(limiter.acquire(timeout=0))
+        limiter.release()
+        self.assertTrue(limiter.acquire(timeout=0))
+
+
+if __name__ == '__main__':
+    unittest.main()
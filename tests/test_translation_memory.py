@@ -2,6 +2,7 @@ import unittest
 import tempfile
 import os
 from utils.translation_memory import TranslationMemory
+from utils.translation_cache import TranslationCache
 
 
 class TestTranslationMemory(unittest.TestCase):
@@ -22,5 +23,46 @@ class TestTranslationMemory(unittest.TestCase):
         self.assertEqual(result, '你好')
 
 
+class TestTranslationCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, 'tm.sqlite')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_set_and_get_persists(self):
+        cache = TranslationCache(self.db_path)
+        key = TranslationCache.make_key('english', 'simp_chinese', 'model-a', '', 'Hello')
+        cache.set(key, '你好')
+        cache.close()
+
+        cache2 = TranslationCache(self.db_path)
+        self.assertEqual(cache2.get(key), '你好')
+        cache2.close()
+
+    def test_key_includes_model(self):
+        cache = TranslationCache(self.db_path)
+        key_a = TranslationCache.make_key('english', 'simp_chinese', 'model-a', '', 'Hello')
+        key_b = TranslationCache.make_key('english', 'simp_chinese', 'model-b', '', 'Hello')
+        cache.set(key_a, '你好')
+        self.assertNotEqual(key_a, key_b)
+        self.assertIsNone(cache.get(key_b))
+        cache.close()
+
+    def test_key_includes_style(self):
+        key_a = TranslationCache.make_key('english', 'simp_chinese', 'model-a', 'HOI4', 'Hello')
+        key_b = TranslationCache.make_key('english', 'simp_chinese', 'model-a', 'Stellaris', 'Hello')
+        self.assertNotEqual(key_a, key_b)
+
+    def test_clear(self):
+        cache = TranslationCache(self.db_path)
+        key = TranslationCache.make_key('english', 'simp_chinese', 'model-a', '', 'Hello')
+        cache.set(key, '你好')
+        cache.clear()
+        self.assertIsNone(cache.get(key))
+        cache.close()
+
+
 if __name__ == '__main__':
     unittest.main()
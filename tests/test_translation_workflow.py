@@ -0,0 +1,53 @@
+"""
+翻译工作流程测试
+
+测试任务提交计数等不依赖网络的逻辑
+"""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import Mock
+
+from core.translation_workflow import TranslationWorkflow
+
+
+class TestQueueFileEntries(unittest.TestCase):
+    """条目入队计数测试类"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        config_manager = Mock()
+        config_manager.config_file_path = os.path.join(self.temp_dir.name, "config.json")
+        config_manager.get_api_keys.return_value = ("key-a",)
+        config_manager.get_setting.side_effect = lambda key, default=None: default
+        self.workflow = TranslationWorkflow(Mock(), config_manager)
+        self.workflow.use_translation_memory = True
+        self.workflow.translation_memory.add("Hello", "你好", "english", "simp_chinese")
+        self.workflow.cached_results = {}
+        self.task_fields = {
+            "source_lang": "english",
+            "target_lang": "simp_chinese",
+            "game_mod_style": "",
+            "model_name": "m",
+        }
+
+    def tearDown(self):
+        """测试后清理"""
+        self.temp_dir.cleanup()
+
+    def test_memory_hits_count_towards_total(self):
+        """测试命中翻译记忆的条目计入总数，使结果收集等待全部条目"""
+        entries = [{"key": "k1", "value": "Hello"}, {"key": "k2", "value": "World"}]
+        pending_tasks = []
+
+        accepted, stopped = self.workflow._queue_file_entries("a.yml", entries, self.task_fields, pending_tasks)
+
+        self.assertEqual((accepted, stopped), (1, False))
+        self.assertEqual(list(self.workflow.cached_results), ["a.yml:k1"])
+        self.assertEqual([task["entry_id"] for task in pending_tasks], ["a.yml:k2"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,6 +6,7 @@ YML解析器测试
 
 import unittest
 import tempfile
+import threading
 import os
 from parsers.yml_parser import YMLParser
 
@@ -64,6 +65,19 @@ class TestYMLParser(unittest.TestCase):
         placeholders3 = YMLParser.extract_placeholders(text3)
         self.assertIn("#bold#formatting#!", placeholders3)
         self.assertIn("$variables$", placeholders3)
+
+        text4 = "#H [Root.GetName]#! owns $AMOUNT$"
+        self.assertEqual(
+            YMLParser.extract_placeholders(text4),
+            {"#H [Root.GetName]#!", "[Root.GetName]", "$AMOUNT$"}
+        )
+        self.assertEqual(YMLParser.extract_placeholders("Plain text"), set())
+
+    def test_extract_placeholders_with_backreference(self):
+        """测试含反向引用的自定义模式不参与合并，仍按各自的捕获组提取"""
+        parser = YMLParser(placeholder_patterns=[r'(\[.*?\])', r"(['\"])(\w+)\1"])
+        placeholders = parser.extract_placeholders("Say 'hi' now", regexes=parser.placeholder_regexes)
+        self.assertEqual(placeholders, {"'"})
     
     def test_save_file(self):
         """测试文件保存"""
@@ -206,6 +220,56 @@ class TestYMLParser(unittest.TestCase):
         finally:
             os.unlink(empty_file.name)
 
+    def test_detect_language(self):
+        """测试只读取文件头检测语言，结果与load_file一致"""
+        self.assertEqual(YMLParser.detect_language(self.temp_file.name), "english")
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "events_l_french.yml")
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(' key: "Value"\r\n')
+            self.assertEqual(YMLParser.detect_language(path), YMLParser.load_file(path)[0])
+            self.assertEqual(YMLParser.detect_language(path), "french")
+            self.assertIsNone(YMLParser.detect_language(os.path.join(temp_dir, "missing.yml")))
+
+    def test_load_files_preserves_order(self):
+        """测试并行加载多个文件时结果顺序与输入一致"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            paths = []
+            for i in range(5):
+                path = os.path.join(temp_dir, f"file{i}_l_english.yml")
+                with open(path, 'w', encoding='utf-8-sig') as f:
+                    f.write(f'l_english:\n key_{i}: "Value {i}"\n')
+                paths.append(path)
+            paths.append(os.path.join(temp_dir, "missing_l_english.yml"))
+
+            results = YMLParser.load_files(paths, max_workers=3)
+
+            self.assertEqual(len(results), 6)
+            for i, (language_code, entries) in enumerate(results[:5]):
+                self.assertEqual(language_code, "english")
+                self.assertEqual(entries[0]['key'], f"key_{i}")
+            self.assertEqual(results[5], (None, []))
+
+    def test_iter_load_files_stops_on_event(self):
+        """测试逐个加载文件时停止事件被设置后不再产出后续文件"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            paths = []
+            for i in range(6):
+                path = os.path.join(temp_dir, f"file{i}_l_english.yml")
+                with open(path, 'w', encoding='utf-8-sig') as f:
+                    f.write(f'l_english:\n key_{i}: "Value {i}"\n')
+                paths.append(path)
+
+            stop_event = threading.Event()
+            loaded = []
+            for language_code, entries in YMLParser.iter_load_files(paths, max_workers=2, stop_event=stop_event):
+                loaded.append(entries[0]['key'])
+                if len(loaded) == 2:
+                    stop_event.set()
+
+            self.assertEqual(loaded, ["key_0", "key_1"])
+
 
 if __name__ == '__main__':
     unittest.main()
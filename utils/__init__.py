@@ -8,5 +8,7 @@ from .logging_utils import setup_logging, LogLevel
 from .validation import validate_api_key, validate_file_path, validate_language_code
 from .file_utils import FileProcessor
 from .translation_memory import TranslationMemory
+from .rate_limit import AIMDLimiter, SlidingWindowQuota, TokenBucket
+from .translation_cache import TranslationCache
 
-__all__ = ['setup_logging', 'LogLevel', 'validate_api_key', 'validate_file_path', 'validate_language_code', 'FileProcessor', 'TranslationMemory']
+__all__ = ['setup_logging', 'LogLevel', 'validate_api_key', 'validate_file_path', 'validate_language_code', 'FileProcessor', 'TranslationMemory', 'TokenBucket', 'SlidingWindowQuota', 'AIMDLimiter', 'TranslationCache']
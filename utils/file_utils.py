@@ -6,9 +6,74 @@
 
 import os
 import re
-from typing import List, Dict, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from config.constants import (
+    SCAN_BATCH_SIZE, SCAN_MAX_WORKERS, SCAN_SKIP_DIRS, SUPPORTED_FILE_EXTENSIONS, SUPPORTED_LANGUAGES
+)
 from parsers.yml_parser import YMLParser
 
+# 可识别为语言目录的目录名（小写）
+_LANGUAGE_FOLDERS = frozenset(SUPPORTED_LANGUAGES)
+
+
+def iter_yml_files(root: str) -> Iterator[str]:
+    """
+    基于os.scandir逐个产出目录中的YML文件路径
+
+    使用显式栈代替递归；scandir返回的目录项自带类型信息，
+    比os.walk少一次stat调用。无法访问的目录会被跳过。
+
+    Args:
+        root: 要扫描的根目录
+
+    Yields:
+        YML文件路径
+    """
+    extensions = tuple(SUPPORTED_FILE_EXTENSIONS)
+    stack = [root]
+
+    while stack:
+        current_dir = stack.pop()
+        try:
+            with os.scandir(current_dir) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in SCAN_SKIP_DIRS:
+                                stack.append(entry.path)
+                        elif entry.name.lower().endswith(extensions):
+                            yield entry.path
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+
+
+def make_relpath(root: str) -> Callable[[str], str]:
+    """
+    创建相对路径计算函数
+
+    根目录的绝对路径只计算一次；位于根目录下的绝对路径直接按前缀切片，
+    其余情况才回退到os.path.relpath。
+
+    Args:
+        root: 根目录
+
+    Returns:
+        将路径转换为相对于root的路径的函数
+    """
+    root_abs = os.path.abspath(root)
+    prefix = root_abs if root_abs.endswith(os.sep) else root_abs + os.sep
+    prefix_len = len(prefix)
+
+    def _relpath(path: str) -> str:
+        if path.startswith(prefix):
+            return path[prefix_len:]
+        return os.path.relpath(path, root_abs)
+
+    return _relpath
+
 
 class FileProcessor:
     """文件处理器，负责文件相关的操作"""
@@ -35,14 +100,12 @@ class FileProcessor:
         """
         source_files = []
         
-        for file_path in file_paths:
-            try:
-                detected_lang, entries = self.yml_parser.load_file(file_path)
-                if detected_lang == source_lang and entries:
-                    source_files.append(file_path)
-            except Exception:
-                # 忽略无法解析的文件
-                continue
+        # load_file对无法解析的文件返回 (None, [])，这里自然被过滤掉
+        for file_path, (detected_lang, entries) in zip(
+            file_paths, self.yml_parser.load_files(file_paths)
+        ):
+            if detected_lang == source_lang and entries:
+                source_files.append(file_path)
         
         return source_files
     
@@ -81,11 +144,8 @@ class FileProcessor:
         Returns:
             目标语言目录路径
         """
-        # 检测源语言
-        try:
-            detected_lang, _ = self.yml_parser.load_file(source_file_path)
-        except Exception:
-            detected_lang = None
+        # 检测源语言（只需读取文件头）
+        detected_lang = self.yml_parser.detect_language(source_file_path)
 
         # 如果无法检测源语言，尝试从路径中推断
         if not detected_lang:
@@ -126,23 +186,10 @@ class FileProcessor:
         Returns:
             检测到的语言代码，如果无法检测则返回None
         """
-        # 常见的语言目录名
-        language_mappings = {
-            'english': 'english',
-            'simp_chinese': 'simp_chinese',
-            'trad_chinese': 'trad_chinese',
-            'japanese': 'japanese',
-            'korean': 'korean',
-            'french': 'french',
-            'german': 'german',
-            'spanish': 'spanish',
-            'russian': 'russian'
-        }
-
         path_parts = file_path.lower().split(os.sep)
         for part in path_parts:
-            if part in language_mappings:
-                return language_mappings[part]
+            if part in _LANGUAGE_FOLDERS:
+                return part
 
         return None
 
@@ -273,27 +320,43 @@ class FileProcessor:
         
         return True, f"验证通过：找到 {len(source_files)} 个源语言文件"
     
-    def scan_yml_files(self, directory: str) -> List[str]:
+    def scan_yml_files(
+        self,
+        directory: str,
+        on_batch: Optional[Callable[[List[str]], Optional[bool]]] = None,
+        batch_size: int = SCAN_BATCH_SIZE
+    ) -> List[str]:
         """
         扫描目录中的YML文件
-        
+
+        提供on_batch时，每发现batch_size个文件即回调一次，
+        调用方无需等待整个目录遍历完成。
+
         Args:
             directory: 要扫描的目录
-            
+            on_batch: 分批回调，参数为本批文件路径列表；返回False时停止扫描
+            batch_size: 每批文件数
+
         Returns:
             YML文件路径列表
         """
-        yml_files = []
-        
-        try:
-            for root, _, files in os.walk(directory):
-                for file in files:
-                    if file.lower().endswith(('.yml', '.yaml')):
-                        yml_files.append(os.path.join(root, file))
-        except Exception:
-            pass
-        
-        return yml_files
+        if on_batch is None:
+            return list(iter_yml_files(directory))
+
+        all_files = []
+        chunk = []
+        for file_path in iter_yml_files(directory):
+            chunk.append(file_path)
+            if len(chunk) >= batch_size:
+                all_files.extend(chunk)
+                if on_batch(chunk) is False:
+                    return all_files
+                chunk = []
+
+        if chunk:
+            all_files.extend(chunk)
+            on_batch(chunk)
+        return all_files
     
     def get_file_language_info(self, file_path: str) -> Tuple[Optional[str], int]:
         """
@@ -311,28 +374,36 @@ class FileProcessor:
         except Exception:
             return None, 0
 
-    def analyze_directory_structure(self, root_path: str) -> Dict[str, List[str]]:
+    def analyze_directory_structure(
+        self,
+        root_path: str,
+        language_info: Optional[Callable[[str], Tuple[Optional[str], int]]] = None
+    ) -> Dict[str, List[str]]:
         """
         分析目录结构，按语言分组文件
 
         Args:
             root_path: 根目录路径
+            language_info: 获取文件(语言代码, 条目数量)的函数，调用方可传入带缓存的实现；
+                为None时使用get_file_language_info
 
         Returns:
             按语言分组的文件字典
         """
         language_files = {}
-
-        for root, _, files in os.walk(root_path):
-            for file in files:
-                if file.lower().endswith(('.yml', '.yaml')):
-                    file_path = os.path.join(root, file)
-                    lang_code, _ = self.get_file_language_info(file_path)
-
-                    if lang_code:
-                        if lang_code not in language_files:
-                            language_files[lang_code] = []
-                        language_files[lang_code].append(file_path)
+        file_paths = list(iter_yml_files(root_path))
+        if language_info is None:
+            language_info = self.get_file_language_info
+
+        # 文件头解析是I/O密集型操作，并行读取
+        with ThreadPoolExecutor(max_workers=SCAN_MAX_WORKERS) as pool:
+            for file_path, (lang_code, _) in zip(
+                file_paths, pool.map(language_info, file_paths)
+            ):
+                if lang_code:
+                    if lang_code not in language_files:
+                        language_files[lang_code] = []
+                    language_files[lang_code].append(file_path)
 
         return language_files
 
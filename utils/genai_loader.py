@@ -0,0 +1,42 @@
+"""
+Gemini库延迟加载
+
+google.generativeai 导入耗时较长（约半秒），
+推迟到首次调用API时才加载，以缩短程序启动时间
+"""
+
+import importlib.util
+import threading
+from typing import Any, Optional, Tuple
+
+try:
+    GEMINI_AVAILABLE = importlib.util.find_spec("google.generativeai") is not None
+except (ImportError, ValueError):
+    GEMINI_AVAILABLE = False
+
+_load_lock = threading.Lock()
+_modules: Optional[Tuple[Any, Any]] = None
+
+
+def load_genai() -> Tuple[Any, Any]:
+    """
+    加载Gemini库（仅首次调用时真正导入）
+
+    Returns:
+        (google.generativeai模块, google.generativeai.client模块) 的元组，
+        库不可用时均为None
+    """
+    global _modules
+
+    if _modules is not None:
+        return _modules
+
+    with _load_lock:
+        if _modules is None:
+            try:
+                import google.generativeai as genai
+                from google.generativeai import client as genai_client
+                _modules = (genai, genai_client)
+            except ImportError:
+                _modules = (None, None)
+        return _modules
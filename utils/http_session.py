@@ -0,0 +1,75 @@
+"""
+HTTP连接池工具
+
+为Gemini REST客户端提供共享的HTTP连接池，
+避免并发请求在建立连接和TLS握手上排队
+"""
+
+import threading
+from typing import Any, Optional
+
+from config.constants import HTTP_POOL_SIZE, HTTP_RETRY_STATUS_CODES
+
+# 尝试导入requests库
+try:
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    REQUESTS_AVAILABLE = True
+except ImportError:
+    REQUESTS_AVAILABLE = False
+    HTTPAdapter = None
+    Retry = None
+
+_adapter_lock = threading.Lock()
+_shared_adapter: Optional[Any] = None
+
+
+def get_pooled_adapter() -> Optional[Any]:
+    """
+    获取全局共享的HTTP适配器
+
+    所有会话挂载同一个适配器，因此在切换API密钥重新配置客户端后
+    仍可复用已建立的连接。
+
+    Returns:
+        HTTPAdapter实例，如果requests库不可用则返回None
+    """
+    global _shared_adapter
+
+    if not REQUESTS_AVAILABLE:
+        return None
+
+    with _adapter_lock:
+        if _shared_adapter is None:
+            _shared_adapter = HTTPAdapter(
+                pool_connections=HTTP_POOL_SIZE,
+                pool_maxsize=HTTP_POOL_SIZE,
+                max_retries=Retry(
+                    total=3,
+                    backoff_factor=0.2,
+                    status_forcelist=HTTP_RETRY_STATUS_CODES
+                )
+            )
+        return _shared_adapter
+
+
+def attach_pooled_adapter(client: Any) -> bool:
+    """
+    将共享连接池挂载到Gemini REST客户端的会话上
+
+    Args:
+        client: google.ai.generativelanguage 服务客户端
+
+    Returns:
+        是否挂载成功（gRPC传输或requests不可用时返回False）
+    """
+    adapter = get_pooled_adapter()
+    if adapter is None:
+        return False
+
+    session = getattr(getattr(client, "_transport", None), "_session", None)
+    if session is None or not hasattr(session, "mount"):
+        return False
+
+    session.mount("https://", adapter)
+    return True
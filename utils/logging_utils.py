@@ -6,9 +6,12 @@
 
 import logging
 import os
+import queue
+import threading
+import time
 from datetime import datetime
 from enum import Enum
-from typing import Optional
+from typing import List, Optional, Tuple
 
 
 class LogLevel(Enum):
@@ -19,6 +22,22 @@ class LogLevel(Enum):
     ERROR = "error"
 
 
+# 日志级别字符串 -> logging级别
+_LEVEL_MAP = {
+    "debug": logging.DEBUG,
+    "info": logging.INFO,
+    "warn": logging.WARNING,
+    "warning": logging.WARNING,
+    "error": logging.ERROR,
+    "critical": logging.CRITICAL,
+}
+
+# 后台写入线程参数
+LOG_BATCH_SIZE = 64  # 每批最多处理的日志条数
+LOG_FLUSH_INTERVAL = 0.1  # 批量写入间隔（秒）
+LOG_FILE_BUFFER_SIZE = 32768  # 日志文件写缓冲区大小（字节）
+
+
 class ColoredFormatter(logging.Formatter):
     """带颜色的日志格式化器"""
     
@@ -102,17 +121,40 @@ def setup_logging(
 
 
 class ApplicationLogger:
-    """应用程序日志记录器包装类"""
-    
-    def __init__(self, logger_name: str = "ParadoxModTranslator"):
+    """应用程序日志记录器包装类
+
+    日志回调（如GUI显示）在调用线程中同步执行；标准日志记录和文件写入
+    交由后台线程批量完成，避免磁盘I/O阻塞翻译工作线程。
+    回调和文件各有独立的最低级别，关闭后的日志直接丢弃。
+    """
+
+    _STOP = object()  # 停止后台写入线程的哨兵
+
+    def __init__(
+        self,
+        logger_name: str = "ParadoxModTranslator",
+        log_file: Optional[str] = None,
+        level: str = "debug",
+        file_level: str = "info"
+    ):
         """
         初始化应用程序日志记录器
         
         Args:
             logger_name: 日志记录器名称
+            log_file: 日志文件路径，如果为None则不写入文件
+            level: 日志回调（GUI显示）的最低级别
+            file_level: 写入标准日志和日志文件的最低级别
         """
         self.logger = logging.getLogger(logger_name)
+        self.log_file = log_file
+        self._min_level = _LEVEL_MAP.get(level.lower(), logging.DEBUG)
+        self._file_level = _LEVEL_MAP.get(file_level.lower(), logging.INFO)
+        self._closed = False
         self._log_callbacks = []
+        self._queue: "queue.Queue" = queue.Queue()
+        self._writer = threading.Thread(target=self._writer_loop, daemon=True)
+        self._writer.start()
     
     def add_log_callback(self, callback):
         """
@@ -133,40 +175,170 @@ class ApplicationLogger:
         if callback in self._log_callbacks:
             self._log_callbacks.remove(callback)
     
-    def log_message(self, message: str, level: str = "info"):
+    def set_level(self, level: str) -> None:
+        """
+        设置日志回调的最低级别
+
+        Args:
+            level: 日志级别
+        """
+        self._min_level = _LEVEL_MAP.get(level.lower(), logging.DEBUG)
+
+    def set_file_level(self, level: str) -> None:
+        """
+        设置写入日志文件的最低级别
+
+        Args:
+            level: 日志级别
+        """
+        self._file_level = _LEVEL_MAP.get(level.lower(), logging.INFO)
+
+    def is_enabled_for(self, level: str) -> bool:
+        """
+        检查指定级别的日志是否会被记录（回调或文件任一接收即为记录）
+
+        Args:
+            level: 日志级别
+
+        Returns:
+            是否会被记录
+        """
+        if self._closed:
+            return False
+        return _LEVEL_MAP.get(level.lower(), logging.INFO) >= min(self._min_level, self._file_level)
+
+    def log_message(self, message: str, level: str = "info", *args):
         """
         记录日志消息
         
         Args:
-            message: 日志消息
+            message: 日志消息，提供args时作为%格式化模板
             level: 日志级别
+            *args: 格式化参数，仅在该级别启用时才进行格式化
         """
-        # 标准日志记录
-        log_method = getattr(self.logger, level.lower(), self.logger.info)
-        log_method(message)
-        
+        if not self.is_enabled_for(level):
+            return
+        if args:
+            message = message % args
+
+        log_level = _LEVEL_MAP.get(level.lower(), logging.INFO)
+        if log_level >= self._file_level:
+            # 交给后台线程记录，不在调用线程中等待I/O
+            self._queue.put((message, level, time.time()))
+        if log_level < self._min_level:
+            return
+
         # 调用回调函数
         for callback in self._log_callbacks:
             try:
                 callback(message, level)
             except Exception as e:
                 self.logger.error(f"日志回调函数执行失败: {e}")
+
+    def close(self, timeout: float = 1.0) -> None:
+        """
+        停止后台写入线程并写出剩余日志，之后记录的日志直接丢弃
+
+        Args:
+            timeout: 等待写入线程结束的最长时间（秒）
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(self._STOP)
+        self._writer.join(timeout)
+
+    def _open_log_file(self):
+        """
+        打开日志文件（追加模式）
+
+        Returns:
+            日志文件对象，未设置日志文件或打开失败时返回None
+        """
+        if not self.log_file:
+            return None
+        try:
+            log_dir = os.path.dirname(self.log_file)
+            if log_dir:
+                os.makedirs(log_dir, exist_ok=True)
+            return open(self.log_file, 'a', encoding='utf-8', buffering=LOG_FILE_BUFFER_SIZE)
+        except Exception as e:
+            self.logger.warning(f"无法创建日志文件 {self.log_file}: {e}")
+            return None
+
+    def _drain_batch(self) -> Tuple[List[tuple], bool]:
+        """
+        阻塞取出一批日志：最多LOG_BATCH_SIZE条，或自第一条起等待LOG_FLUSH_INTERVAL
+
+        Returns:
+            (日志列表, 是否收到停止哨兵) 的元组
+        """
+        batch = []
+        try:
+            item = self._queue.get()
+            deadline = time.monotonic() + LOG_FLUSH_INTERVAL
+            while item is not self._STOP:
+                batch.append(item)
+                remaining = deadline - time.monotonic()
+                if len(batch) >= LOG_BATCH_SIZE or remaining <= 0:
+                    return batch, False
+                item = self._queue.get(timeout=remaining)
+        except queue.Empty:
+            return batch, False
+        return batch, True
+
+    def _writer_loop(self) -> None:
+        """后台写入线程：按批次取出日志并统一写入"""
+        log_file_handle = self._open_log_file()
+        try:
+            stopped = False
+            while not stopped:
+                batch, stopped = self._drain_batch()
+                if batch:
+                    self._write_batch(batch, log_file_handle)
+        finally:
+            if log_file_handle is not None:
+                log_file_handle.close()
+
+    def _write_batch(self, batch, log_file_handle) -> None:
+        """
+        写出一批日志
+
+        Args:
+            batch: (消息, 级别, 时间戳) 元组列表
+            log_file_handle: 日志文件对象，可为None
+        """
+        lines = []
+        for message, level, timestamp in batch:
+            log_level = _LEVEL_MAP.get(level.lower(), logging.INFO)
+            self.logger.log(log_level, message)
+            if log_file_handle is not None:
+                time_str = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(timestamp))
+                level_name = logging.getLevelName(log_level)
+                lines.append(f"{time_str} - {self.logger.name} - {level_name} - {message}\n")
+
+        if lines:
+            try:
+                log_file_handle.write(''.join(lines))
+                log_file_handle.flush()
+            except Exception:
+                pass
     
-    def debug(self, message: str):
+    def debug(self, message: str, *args):
         """记录调试信息"""
-        self.log_message(message, "debug")
+        self.log_message(message, "debug", *args)
     
-    def info(self, message: str):
+    def info(self, message: str, *args):
         """记录信息"""
-        self.log_message(message, "info")
+        self.log_message(message, "info", *args)
     
-    def warning(self, message: str):
+    def warning(self, message: str, *args):
         """记录警告"""
-        self.log_message(message, "warn")
+        self.log_message(message, "warn", *args)
     
-    def error(self, message: str):
+    def error(self, message: str, *args):
         """记录错误"""
-        self.log_message(message, "error")
+        self.log_message(message, "error", *args)
 
 
 def create_session_log_file() -> str:
@@ -243,14 +415,15 @@ def cleanup_old_logs(log_dir: str = "logs", max_age_days: int = 30) -> int:
     max_age_seconds = max_age_days * 24 * 3600
     
     try:
-        for filename in os.listdir(log_dir):
-            if filename.endswith(('.log', '.bak')):
-                file_path = os.path.join(log_dir, filename)
-                file_age = current_time - os.path.getmtime(file_path)
-                
-                if file_age > max_age_seconds:
-                    os.remove(file_path)
-                    deleted_count += 1
+        # scandir的目录项自带路径，Windows上还缓存了stat结果，省去逐个getmtime
+        with os.scandir(log_dir) as it:
+            for entry in it:
+                if entry.name.endswith(('.log', '.bak')):
+                    file_age = current_time - entry.stat().st_mtime
+
+                    if file_age > max_age_seconds:
+                        os.remove(entry.path)
+                        deleted_count += 1
     except Exception:
         pass
     
@@ -0,0 +1,307 @@
+"""
+速率限制工具
+
+提供线程安全的令牌桶限速器和滑动窗口配额，用于在发起API请求前主动节流；
+以及按请求结果自适应调整并发数的AIMD限流器
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+
+def _sleep(seconds: float, stop_event: Optional[threading.Event]) -> bool:
+    """
+    休眠指定时间，提供停止事件时可被提前唤醒
+
+    Args:
+        seconds: 休眠秒数
+        stop_event: 停止事件，为None时普通休眠
+
+    Returns:
+        是否因停止事件被唤醒
+    """
+    if stop_event is None:
+        time.sleep(seconds)
+        return False
+    return stop_event.wait(seconds)
+
+
+class TokenBucket:
+    """线程安全的令牌桶限速器"""
+
+    def __init__(self, rate_per_sec: float, burst: int = 1):
+        """
+        初始化令牌桶
+
+        Args:
+            rate_per_sec: 每秒补充的令牌数
+            burst: 桶容量，即允许的最大突发请求数
+        """
+        if rate_per_sec <= 0:
+            raise ValueError("rate_per_sec必须为正数")
+
+        self.rate_per_sec = float(rate_per_sec)
+        self.capacity = float(max(1, int(burst)))
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_delay(cls, delay: float, burst: int = 1) -> "TokenBucket":
+        """
+        根据请求间隔创建令牌桶
+
+        Args:
+            delay: 两次请求之间的平均间隔（秒）
+            burst: 桶容量
+
+        Returns:
+            令牌桶实例
+        """
+        return cls(1.0 / max(float(delay), 0.01), burst=burst)
+
+    def _refill(self) -> None:
+        """按经过的时间补充令牌（调用方需持有锁）"""
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate_per_sec)
+            self._last_refill = now
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """
+        尝试立即获取令牌
+
+        Args:
+            tokens: 需要的令牌数
+
+        Returns:
+            是否获取成功
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def acquire(self, tokens: float = 1.0, stop_event: Optional[threading.Event] = None) -> float:
+        """
+        获取令牌，必要时仅休眠所需的最短时间
+
+        Args:
+            tokens: 需要的令牌数
+            stop_event: 停止事件，被设置时立即返回且不获取令牌
+
+        Returns:
+            实际等待的秒数
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                wait_time = (tokens - self._tokens) / self.rate_per_sec
+
+            if _sleep(wait_time, stop_event):
+                return waited
+            waited += wait_time
+
+
+class SlidingWindowQuota:
+    """线程安全的滑动窗口请求数/token数配额"""
+
+    def __init__(self, max_requests: int, max_tokens: int, window: float = 60.0):
+        """
+        初始化滑动窗口配额
+
+        Args:
+            max_requests: 窗口内允许的最大请求数
+            max_tokens: 窗口内允许的最大token数
+            window: 窗口长度（秒）
+        """
+        self.max_requests = max(1, int(max_requests))
+        self.max_tokens = max(1, int(max_tokens))
+        self.window = float(window)
+        # (时间戳, 请求数, token数)，token数可为负，表示对预留量的修正
+        self._entries = deque()
+        self._request_count = 0
+        self._token_sum = 0
+        self._lock = threading.Lock()
+
+    def _prune(self, now: float) -> None:
+        """移除窗口外的记录（调用方需持有锁）"""
+        cutoff = now - self.window
+        entries = self._entries
+        while entries and entries[0][0] <= cutoff:
+            _, requests, tokens = entries.popleft()
+            self._request_count -= requests
+            self._token_sum -= tokens
+
+    def try_reserve(self, tokens: int = 0) -> float:
+        """
+        配额充足时记录一次请求，否则返回需要等待的时间
+
+        窗口为空时总是允许，避免单次请求的token数超过限额时永远无法发出。
+
+        Args:
+            tokens: 本次请求预计消耗的token数
+
+        Returns:
+            0表示已预留；正数表示最早一条记录移出窗口前需等待的秒数
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._prune(now)
+            if self._entries and (
+                self._request_count + 1 > self.max_requests
+                or (tokens > 0 and self._token_sum + tokens > self.max_tokens)
+            ):
+                return max(self._entries[0][0] + self.window - now, 0.001)
+            self._entries.append((now, 1, tokens))
+            self._request_count += 1
+            self._token_sum += tokens
+            return 0.0
+
+    def acquire(self, tokens: int = 0, stop_event: Optional[threading.Event] = None) -> float:
+        """
+        等待直到配额充足并记录一次请求，只休眠到最早一条记录移出窗口
+
+        Args:
+            tokens: 本次请求预计消耗的token数
+            stop_event: 停止事件，被设置时立即返回且不记录请求
+
+        Returns:
+            实际等待的秒数
+        """
+        waited = 0.0
+        while True:
+            wait_time = self.try_reserve(tokens)
+            if wait_time <= 0:
+                return waited
+            if _sleep(wait_time, stop_event):
+                return waited
+            waited += wait_time
+
+    def adjust(self, tokens: int) -> None:
+        """
+        按实际用量修正窗口内的token数（负数表示退还）
+
+        Args:
+            tokens: 相对预留量多消耗的token数
+        """
+        if not tokens:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self._prune(now)
+            self._entries.append((now, 0, tokens))
+            self._token_sum += tokens
+
+    @property
+    def request_count(self) -> int:
+        """窗口内的请求数（不主动清理过期记录）"""
+        return self._request_count
+
+    @property
+    def token_sum(self) -> int:
+        """窗口内的token数（不主动清理过期记录）"""
+        return self._token_sum
+
+
+class AIMDLimiter:
+    """
+    加性增、乘性减(AIMD)的自适应并发限制器
+
+    请求成功且近期平均延迟不超过目标值时并发上限加1；
+    遇到限流、服务端错误或超时时并发上限减半。
+    """
+
+    def __init__(
+        self,
+        max_limit: int,
+        min_limit: int = 1,
+        latency_target: float = 20.0,
+        window: int = 20,
+        initial_limit: Optional[int] = None
+    ):
+        """
+        初始化并发限制器
+
+        Args:
+            max_limit: 并发上限的最大值
+            min_limit: 并发上限的最小值
+            latency_target: 允许增大并发时的平均延迟上限（秒）
+            window: 计算平均延迟的样本数
+            initial_limit: 初始并发上限，为None时从最大值开始
+        """
+        self.max_limit = max(1, int(max_limit))
+        self.min_limit = max(1, min(int(min_limit), self.max_limit))
+        self.latency_target = float(latency_target)
+        if initial_limit is None:
+            self._limit = self.max_limit
+        else:
+            self._limit = max(self.min_limit, min(int(initial_limit), self.max_limit))
+        self._in_flight = 0
+        self._latencies = deque(maxlen=max(1, int(window)))
+        self._latency_sum = 0.0
+        self._cond = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        """当前并发上限"""
+        return self._limit
+
+    @property
+    def in_flight(self) -> int:
+        """正在进行的请求数"""
+        return self._in_flight
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        等待并占用一个并发名额
+
+        Args:
+            timeout: 最长等待时间，为None时一直等待
+
+        Returns:
+            是否获取成功
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._in_flight < self._limit, timeout):
+                return False
+            self._in_flight += 1
+            return True
+
+    def release(self) -> None:
+        """归还一个并发名额"""
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify()
+
+    def on_success(self, latency: float) -> None:
+        """
+        记录一次成功请求的延迟，平均延迟达标时加性增大并发上限
+
+        Args:
+            latency: 请求耗时（秒）
+        """
+        with self._cond:
+            if len(self._latencies) == self._latencies.maxlen:
+                self._latency_sum -= self._latencies[0]
+            self._latencies.append(latency)
+            self._latency_sum += latency
+
+            mean_latency = self._latency_sum / len(self._latencies)
+            if mean_latency <= self.latency_target and self._limit < self.max_limit:
+                self._limit += 1
+                self._cond.notify()
+
+    def on_error(self) -> None:
+        """遇到限流或过载错误时乘性减小并发上限"""
+        with self._cond:
+            self._limit = max(self.min_limit, self._limit // 2)
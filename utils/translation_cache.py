@@ -0,0 +1,110 @@
+"""
+翻译缓存
+
+基于SQLite的持久化翻译缓存，按(源语言, 目标语言, 模型, 风格提示, 原文)索引，
+在发起API请求前查询以避免重复翻译
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+
+class TranslationCache:
+    """基于SQLite的线程安全翻译缓存"""
+
+    def __init__(self, db_path: str):
+        """
+        初始化翻译缓存
+
+        Args:
+            db_path: SQLite数据库文件路径
+        """
+        self.db_path = db_path
+        self._lock = threading.Lock()
+
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS translations "
+                "(k TEXT PRIMARY KEY, v TEXT, ts INTEGER)"
+            )
+            self._conn.commit()
+
+    @staticmethod
+    def make_key(source_lang: str, target_lang: str, model_name: str, game_mod_style: str, text: str) -> str:
+        """
+        生成缓存键
+
+        Args:
+            source_lang: 源语言
+            target_lang: 目标语言
+            model_name: 模型名称
+            game_mod_style: 游戏/Mod风格提示
+            text: 原文
+
+        Returns:
+            缓存键（128位十六进制摘要）
+        """
+        raw = f"{source_lang}|{target_lang}|{model_name}|{game_mod_style}|{text}"
+        return hashlib.blake2b(raw.encode('utf-8'), digest_size=16).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        查询缓存
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            缓存的译文，未命中时返回None
+        """
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT v FROM translations WHERE k = ?", (key,)
+                ).fetchone()
+        except sqlite3.Error:
+            return None
+        return row[0] if row else None
+
+    def set(self, key: str, value: str) -> None:
+        """
+        写入缓存
+
+        Args:
+            key: 缓存键
+            value: 译文
+        """
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO translations (k, v, ts) VALUES (?, ?, ?)",
+                    (key, value, int(time.time()))
+                )
+                self._conn.commit()
+        except sqlite3.Error:
+            pass
+
+    def clear(self) -> None:
+        """清空缓存"""
+        try:
+            with self._lock:
+                self._conn.execute("DELETE FROM translations")
+                self._conn.commit()
+        except sqlite3.Error:
+            pass
+
+    def close(self) -> None:
+        """关闭数据库连接"""
+        with self._lock:
+            self._conn.close()
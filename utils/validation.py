@@ -297,8 +297,6 @@ def extract_placeholders(text: str) -> set:
     Returns:
         占位符集合
     """
-    import re
-
     placeholders = set()
 
     # 匹配各种占位符格式